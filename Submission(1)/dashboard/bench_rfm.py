@@ -0,0 +1,104 @@
+"""
+Benchmark skor RFM: cara lama dashboard (kolom baru di DataFrame + tiga pd.qcut) dibandingkan
+dengan RFMEngine (skor dari array NumPy, cache per filter, append hari baru).
+
+Data sintetis: --rows baris harian (default 10 juta) dengan beberapa baris per tanggal,
+seperti feed produksi per stasiun. Jalankan dari folder dashboard:
+    python bench_rfm.py
+    python bench_rfm.py --rows 1000000 --repeat 5
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from rfm import RFMEngine
+
+def make_days(rows, n_dates=3650, seed=0, start="2015-01-01"):
+    """DataFrame harian sintetis dengan kolom yang dipakai RFM, terurut menurut tanggal."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=n_dates, freq="D")
+    date_index = np.sort(rng.integers(0, n_dates, rows))
+    casual = rng.integers(0, 3500, rows, dtype=np.int32)
+    registered = rng.integers(0, 7000, rows, dtype=np.int32)
+    return pd.DataFrame({
+        "dteday": dates[date_index],
+        "season": ((dates.month[date_index] % 12) // 3 + 1).astype(np.int8),
+        "casual": casual,
+        "registered": registered,
+        "cnt": casual + registered,
+    })
+
+def score_with_qcut(day_df):
+    """Kode RFM versi lama dashboard, pada salinan agar input tidak berubah."""
+    day_df = day_df.copy()
+    max_date = day_df["dteday"].max()
+    day_df["Recency"] = (max_date - day_df["dteday"]).dt.days
+    day_df["Frequency"] = day_df["casual"] + day_df["registered"]
+    day_df["Monetary"] = day_df["cnt"]
+    day_df["R_Score"] = pd.qcut(day_df["Recency"], 5, labels=[5, 4, 3, 2, 1])
+    day_df["F_Score"] = pd.qcut(day_df["Frequency"], 5, labels=[1, 2, 3, 4, 5])
+    day_df["M_Score"] = pd.qcut(day_df["Monetary"], 5, labels=[1, 2, 3, 4, 5])
+    day_df["RFM_Score"] = day_df["R_Score"].astype(int) + day_df["F_Score"].astype(int) + day_df["M_Score"].astype(int)
+    return day_df
+
+def best_time(func, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--append-rows", type=int, default=10_000, help="jumlah baris hari baru untuk append")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    days = make_days(args.rows)
+    history = days[days["dteday"] < days["dteday"].max()]
+    new_days = days[days["dteday"] == days["dteday"].max()].iloc[:args.append_rows]
+    first, last = days["dteday"].min().date(), days["dteday"].max().date()
+    mid = days["dteday"].iloc[len(days) // 2].date()
+    print(f"{len(days):,} baris, {days['dteday'].nunique():,} tanggal")
+
+    _, old_seconds = best_time(lambda: score_with_qcut(days), args.repeat)
+    engine, build_seconds = best_time(lambda: RFMEngine.from_days(history), 1)
+    engine.append(new_days)
+
+    def score_uncached():
+        engine._cache.clear()
+        return engine.score(first, last)
+
+    _, new_seconds = best_time(score_uncached, args.repeat)
+    _, cached_seconds = best_time(lambda: engine.score(first, last), args.repeat)
+    _, season_seconds = best_time(lambda: engine.score(first, mid, 3), 1)
+
+    # Append hari baru: filter yang berakhir sebelum hari baru tetap diambil dari cache
+    fresh = RFMEngine.from_days(history)
+    fresh.score(first, mid)
+    _, append_seconds = best_time(lambda: fresh.append(new_days), 1)
+    _, after_append_seconds = best_time(lambda: fresh.score(first, mid), 1)
+    _, rebuild_seconds = best_time(lambda: RFMEngine.from_days(pd.concat([history, new_days])), 1)
+
+    print(f"{'langkah':<44}{'waktu (ms)':>12}")
+    rows = [
+        ("pd.qcut (dashboard lama)", old_seconds),
+        ("RFMEngine.from_days (sekali)", build_seconds),
+        ("RFMEngine.score, tanpa cache", new_seconds),
+        ("RFMEngine.score, dari cache", cached_seconds),
+        ("RFMEngine.score, separuh rentang + musim", season_seconds),
+        (f"append {len(new_days):,} baris", append_seconds),
+        ("score filter lama setelah append (cache)", after_append_seconds),
+        ("bangun ulang engine dengan hari baru", rebuild_seconds),
+    ]
+    for name, seconds in rows:
+        print(f"{name:<44}{seconds * 1000:>12.2f}")
+    print(f"Percepatan score tanpa cache: {old_seconds / new_seconds:.1f}x")
+
+if __name__ == '__main__':
+    main()
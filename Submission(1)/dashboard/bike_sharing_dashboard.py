@@ -1,51 +1,56 @@
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
+import plotly.graph_objects as go
 from datetime import datetime
+from data_access import load_dashboard_data
+from downsample import downsample_line, limit_points, point_budget
+from rfm import RFMEngine
+from rollups import DashboardRollups
 
 # Judul Dashboard
 st.title("📊 Bike Sharing Data Analysis")
 
 # Load Dataset
-@st.cache_data
+# Parquet bertipe ringkas dan hanya kolom yang dipakai chart (lihat data_access.py).
+# Tidak memakai st.cache_data: data mentah cukup dipegang sekali oleh rollup
+# (st.cache_resource dibagi ke semua sesi), bukan disalin per sesi.
 def load_data():
-    day_df = pd.read_csv("C:\\Users\\Leviathans\\Downloads\\Bike-sharing-dataset\\dashboard\\day.csv")
-    hour_df = pd.read_csv("C:\\Users\\Leviathans\\Downloads\\Bike-sharing-dataset\\dashboard\\hour.csv")
-    
-    day_df["dteday"] = pd.to_datetime(day_df["dteday"])
-    hour_df["dteday"] = pd.to_datetime(hour_df["dteday"])
-    return day_df, hour_df
+    return load_dashboard_data()
 
-# Load data
-day_df, hour_df = load_data()
+# Rollup dibangun sekali per data; setiap interaksi filter hanya membaca rollup
+@st.cache_resource
+def load_rollups():
+    day_df, hour_df = load_data()
+    return DashboardRollups(day_df, hour_df)
 
-# Sidebar - Filter Data
-st.sidebar.header("📆 Filter Data")
-start_date = st.sidebar.date_input("Mulai Tanggal", day_df["dteday"].min().date())
-end_date = st.sidebar.date_input("Sampai Tanggal", day_df["dteday"].max().date())
+@st.cache_resource
+def load_rfm():
+    return RFMEngine.from_days(load_rollups().days)
 
-# Filter berdasarkan rentang tanggal
-mask = (day_df["dteday"].dt.date >= start_date) & (day_df["dteday"].dt.date <= end_date)
-day_df = day_df[mask]
+rollups = load_rollups()
 
-# Filter untuk hour_df
-hour_df = hour_df[(hour_df["dteday"].dt.date >= start_date) & (hour_df["dteday"].dt.date <= end_date)]
+# Sidebar - Filter Data
+st.sidebar.header("📆 Filter Data")
+min_date, max_date = rollups.date_range()
+start_date = st.sidebar.date_input("Mulai Tanggal", min_date)
+end_date = st.sidebar.date_input("Sampai Tanggal", max_date)
 
 selected_season = st.sidebar.selectbox("Pilih Musim", ["Semua", "Spring", "Summer", "Fall", "Winter"])
 season_mapping = {"Spring": 1, "Summer": 2, "Fall": 3, "Winter": 4}
 
-if selected_season != "Semua":
-    day_df = day_df[day_df["season"] == season_mapping[selected_season]]
-    hour_df = hour_df[hour_df["season"] == season_mapping[selected_season]]
+# Hasil per kombinasi filter di-cache di dalam rollups
+view = rollups.query(start_date, end_date, season_mapping.get(selected_season))
 
 #ren Peminjaman Sepeda (Harian, Bulanan, Musiman)
 st.subheader("📈 Tren Peminjaman Sepeda")
 
+# Data chart diringkas di server (downsample.py) agar jumlah titik yang dikirim ke browser
+# dibatasi per chart, berapa pun panjang rentang tanggal yang dipilih
+
 #Bulanan
-day_df["month"] = day_df["dteday"].dt.month
-monthly_counts = day_df.groupby("month")["cnt"].sum()
+monthly_counts = view.monthly_counts
 
 fig_monthly = px.bar(
     x=monthly_counts.index, y=monthly_counts.values,
@@ -57,17 +62,30 @@ fig_monthly = px.bar(
 )
 st.plotly_chart(fig_monthly)
 
-#Musiman
-season_labels = {1: "Spring", 2: "Summer", 3: "Fall", 4: "Winter"}
-day_df["season_label"] = day_df["season"].map(season_labels)
-fig_season = px.box(day_df, x="season_label", y="cnt", color="season_label", title="Distribusi Peminjaman Sepeda Berdasarkan Musim")
+#Musiman (kuartil dihitung di server, outlier dibatasi point_budget("season_outliers") per musim)
+fig_season = go.Figure()
+for color, (label, stats) in zip(px.colors.qualitative.Plotly, view.season_box.items()):
+    fig_season.add_trace(go.Box(
+        x=[label], q1=[stats["q1"]], median=[stats["median"]], q3=[stats["q3"]],
+        lowerfence=[stats["lowerfence"]], upperfence=[stats["upperfence"]],
+        name=label, marker_color=color, boxpoints=False
+    ))
+    outliers = limit_points(stats["outliers"], point_budget("season_outliers"))
+    fig_season.add_trace(go.Scatter(
+        x=[label] * len(outliers), y=outliers, mode="markers",
+        marker_color=color, showlegend=False, name=label
+    ))
+fig_season.update_layout(title="Distribusi Peminjaman Sepeda Berdasarkan Musim",
+                         xaxis_title="season_label", yaxis_title="cnt", legend_title="season_label")
 st.plotly_chart(fig_season)
 
 #Analisis Peminjaman Berdasarkan Jam
 st.subheader("⏰ Analisis Peminjaman Sepeda Berdasarkan Jam")
-hourly_counts = hour_df.groupby("hr")["cnt"].mean()
+# Paling banyak 24 titik (rata-rata per jam), LTTB hanya berlaku jika melebihi point_budget("hourly")
+hourly_counts = view.hourly_mean
+hourly_x, hourly_y = downsample_line(hourly_counts.index.to_numpy(), hourly_counts.to_numpy(), point_budget("hourly"))
 fig_hourly = px.line(
-    x=hourly_counts.index, y=hourly_counts.values,
+    x=hourly_x, y=hourly_y,
     labels={'x': 'Jam', 'y': 'Rata-rata Peminjaman'},
     title="Rata-rata Peminjaman Sepeda per Jam",
     markers=True
@@ -76,24 +94,17 @@ st.plotly_chart(fig_hourly)
 
 #Hubungan Cuaca dengan Peminjaman Sepeda
 st.subheader("🌤️ Pengaruh Cuaca terhadap Peminjaman Sepeda")
-weather_corr = day_df[["temp", "hum", "windspeed", "cnt"]].corr()
+weather_corr = view.weather_corr
 fig_corr = px.imshow(weather_corr, text_auto=True, title="Korelasi Cuaca vs. Peminjaman Sepeda")
 st.plotly_chart(fig_corr)
 
 #RFM Analysis
 st.subheader("📊 Analisis RFM (Recency, Frequency, Monetary)")
-max_date = day_df["dteday"].max()
-day_df["Recency"] = (max_date - day_df["dteday"]).dt.days
-day_df["Frequency"] = day_df["casual"] + day_df["registered"]
-day_df["Monetary"] = day_df["cnt"]
-
-day_df["R_Score"] = pd.qcut(day_df["Recency"], 5, labels=[5, 4, 3, 2, 1])
-day_df["F_Score"] = pd.qcut(day_df["Frequency"], 5, labels=[1, 2, 3, 4, 5])
-day_df["M_Score"] = pd.qcut(day_df["Monetary"], 5, labels=[1, 2, 3, 4, 5])
-day_df["RFM_Score"] = day_df["R_Score"].astype(int) + day_df["F_Score"].astype(int) + day_df["M_Score"].astype(int)
-
-st.dataframe(day_df[["dteday", "Recency", "Frequency", "Monetary", "RFM_Score"]].head())
-fig_rfm = px.histogram(day_df, x="RFM_Score", nbins=10, title="Distribusi RFM Score")
+# Skor dihitung dari array NumPy dan di-cache per filter di dalam engine (lihat rfm.py)
+rfm_df = load_rfm().score(start_date, end_date, season_mapping.get(selected_season))
+
+st.dataframe(rfm_df[["dteday", "Recency", "Frequency", "Monetary", "RFM_Score"]].head())
+fig_rfm = px.histogram(rfm_df, x="RFM_Score", nbins=10, title="Distribusi RFM Score")
 st.plotly_chart(fig_rfm)
 
 #Kesimpulan
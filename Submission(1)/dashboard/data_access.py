@@ -0,0 +1,135 @@
+"""
+Akses data untuk dashboard bike sharing.
+
+CSV hanya dibaca sekali: saat pertama dipakai (atau saat CSV lebih baru dari hasil konversi)
+isinya dikonversi ke Parquet dengan dtype ringkas yang eksplisit, lalu setiap pemuatan
+berikutnya membaca Parquet tersebut dan hanya kolom yang dibutuhkan chart. Lokasi data
+diatur lewat environment variable atau argumen, tidak lagi path Windows yang ditulis mati.
+
+Konversi bisa juga dijalankan lebih dulu saat deploy:
+    python data_access.py --data-dir ./dashboard
+"""
+import argparse
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Folder day.csv / hour.csv dan folder hasil konversi Parquet (default: folder yang sama)
+DATA_DIR = os.environ.get("BIKE_SHARING_DATA_DIR", os.path.dirname(os.path.abspath(__file__)))
+PARQUET_DIR = os.environ.get("BIKE_SHARING_PARQUET_DIR") or None
+PARQUET_COMPRESSION = "zstd"
+DATE_COLUMN = "dteday"
+
+# Dtype eksplisit (sesuai Readme dataset): kode kategori kecil int8, fitur cuaca float32
+_COMMON_DTYPES = {
+    "instant": "int32",
+    "season": "int8",
+    "yr": "int8",
+    "mnth": "int8",
+    "holiday": "int8",
+    "weekday": "int8",
+    "workingday": "int8",
+    "weathersit": "int8",
+    "temp": "float32",
+    "atemp": "float32",
+    "hum": "float32",
+    "windspeed": "float32",
+    "casual": "int32",
+    "registered": "int32",
+    "cnt": "int32",
+}
+TABLE_DTYPES = {
+    "day": dict(_COMMON_DTYPES),
+    "hour": dict(_COMMON_DTYPES, hr="int8"),
+}
+
+# Kolom yang dibutuhkan setiap chart dashboard
+CHART_COLUMNS = {
+    "monthly": {"day": ["dteday", "season", "cnt"]},
+    "season": {"day": ["dteday", "season", "cnt"]},
+    "hourly": {"day": ["dteday", "season"], "hour": ["dteday", "hr", "cnt"]},
+    "weather": {"day": ["dteday", "season", "temp", "hum", "windspeed", "cnt"]},
+    "rfm": {"day": ["dteday", "season", "casual", "registered", "cnt"]},
+}
+
+def columns_for(table, charts=None):
+    """Gabungan kolom table yang dibutuhkan charts (default semua chart), urutan tetap."""
+    columns = []
+    for chart in charts or CHART_COLUMNS:
+        for column in CHART_COLUMNS[chart].get(table, []):
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+def csv_path(table, data_dir=None):
+    return os.path.join(data_dir or DATA_DIR, f"{table}.csv")
+
+def parquet_path(table, data_dir=None, parquet_dir=None):
+    return os.path.join(parquet_dir or PARQUET_DIR or data_dir or DATA_DIR, f"{table}.parquet")
+
+def read_csv_typed(table, data_dir=None, columns=None):
+    """Membaca CSV dengan dtype eksplisit dan dteday langsung di-parse sebagai tanggal."""
+    dtypes = TABLE_DTYPES[table]
+    if columns is not None:
+        dtypes = {column: dtype for column, dtype in dtypes.items() if column in columns}
+    return pd.read_csv(csv_path(table, data_dir), usecols=columns, dtype=dtypes,
+                       parse_dates=[DATE_COLUMN], date_format="%Y-%m-%d")
+
+def _is_stale(source, target):
+    return not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(source)
+
+def convert_to_parquet(table, data_dir=None, parquet_dir=None, force=False):
+    """
+    Mengonversi CSV table ke Parquet jika belum ada atau CSV-nya lebih baru.
+    Mengembalikan path Parquet, atau None jika gagal (pyarrow tidak ada, CSV tidak ada, dsb).
+    """
+    if pyarrow is None:
+        print("pyarrow tidak terpasang, data dibaca langsung dari CSV.")
+        return None
+    source = csv_path(table, data_dir)
+    target = parquet_path(table, data_dir, parquet_dir)
+    try:
+        if force or _is_stale(source, target):
+            df = read_csv_typed(table, data_dir)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            df.to_parquet(f"{target}.tmp", index=False, compression=PARQUET_COMPRESSION)
+            os.replace(f"{target}.tmp", target)
+            print(f"{source} dikonversi ke {target} ({len(df)} baris).")
+        return target
+    except Exception as e:
+        print(f"Gagal mengonversi {source} ke Parquet: {e}")
+        return None
+
+def load_table(table, columns=None, data_dir=None, parquet_dir=None):
+    """
+    Memuat table ("day" atau "hour") hanya dengan columns (default semua kolom).
+    Membaca Parquet hasil konversi; jika konversi gagal, membaca CSV dengan dtype yang sama.
+    """
+    path = convert_to_parquet(table, data_dir, parquet_dir)
+    if path is None:
+        return read_csv_typed(table, data_dir, columns)
+    return pd.read_parquet(path, columns=columns)
+
+def load_dashboard_data(charts=None, data_dir=None, parquet_dir=None):
+    """(day_df, hour_df) dengan kolom yang dibutuhkan charts; hour_df None jika tidak dibutuhkan."""
+    day_df = load_table("day", columns_for("day", charts), data_dir, parquet_dir)
+    hour_columns = columns_for("hour", charts)
+    hour_df = load_table("hour", hour_columns, data_dir, parquet_dir) if hour_columns else None
+    return day_df, hour_df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=None, help="folder day.csv dan hour.csv")
+    parser.add_argument("--parquet-dir", default=None, help="folder hasil konversi (default: --data-dir)")
+    parser.add_argument("--force", action="store_true", help="konversi ulang walaupun Parquet sudah terbaru")
+    args = parser.parse_args()
+    for table in TABLE_DTYPES:
+        convert_to_parquet(table, args.data_dir, args.parquet_dir, force=args.force)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Agregasi dan downsampling data chart di server sebelum dikirim ke Plotly.
+
+- Garis: LTTB (Largest-Triangle-Three-Buckets) memilih paling banyak N titik yang
+  mempertahankan bentuk garis (puncak dan lembah tetap ada), bukan sampling tiap ke-k.
+- Box plot: kuartil dan whisker dihitung di server; dari outlier hanya dikirim
+  paling banyak N titik.
+
+Batas jumlah titik per chart ada di POINT_BUDGETS dan bisa diubah lewat environment
+variable BIKE_SHARING_POINTS_<CHART>, misalnya BIKE_SHARING_POINTS_HOURLY=2000.
+"""
+import os
+
+import numpy as np
+
+POINT_BUDGETS = {
+    "hourly": 1000,
+    "season_outliers": 200,
+}
+# Jarak whisker dari kuartil, dalam kelipatan IQR (sama dengan default Plotly)
+WHISKER_IQR = 1.5
+
+def point_budget(chart):
+    """Batas titik untuk chart, dari environment variable jika ada."""
+    value = os.environ.get(f"BIKE_SHARING_POINTS_{chart.upper()}")
+    if value is None:
+        return POINT_BUDGETS[chart]
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        print(f"Nilai BIKE_SHARING_POINTS_{chart.upper()} tidak valid ({value}), dipakai {POINT_BUDGETS[chart]}.")
+        return POINT_BUDGETS[chart]
+
+def lttb_indices(x, y, n_out):
+    """
+    Posisi titik terpilih LTTB (terurut naik) dari garis x, y (x terurut naik, numerik
+    atau datetime). Semua posisi dikembalikan jika jumlah titik <= n_out.
+    """
+    n = len(y)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+    x = np.asarray(x)
+    if x.dtype.kind == 'M':
+        x = x.astype('datetime64[ns]').astype(np.int64)
+    x = x.astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Titik pertama dan terakhir selalu dipilih; sisanya dibagi ke n_out - 2 bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Titik acuan di bucket berikutnya: rata-rata bucket tersebut (titik terakhir untuk bucket akhir)
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        # Pilih titik dengan luas segitiga (titik terpilih sebelumnya, kandidat, acuan) terbesar
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+def downsample_line(x, y, n_out):
+    """(x, y) hasil LTTB dengan paling banyak n_out titik."""
+    index = lttb_indices(x, y, n_out)
+    return np.asarray(x)[index], np.asarray(y)[index]
+
+def box_stats(values):
+    """
+    Statistik box plot values seperti yang dihitung Plotly (kuartil quartilemethod "linear",
+    whisker sampai titik terjauh dalam WHISKER_IQR x IQR) dan outlier terurut.
+    None jika values kosong.
+    """
+    values = np.sort(np.asarray(values, dtype=np.float64))
+    if len(values) == 0:
+        return None
+    # Metode hazen (posisi p*n - 0.5) = quartilemethod "linear" bawaan Plotly, bukan default NumPy
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75], method="hazen")
+    iqr = q3 - q1
+    low = np.searchsorted(values, q1 - WHISKER_IQR * iqr, side='left')
+    high = np.searchsorted(values, q3 + WHISKER_IQR * iqr, side='right')
+    return {
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lowerfence": values[low],
+        "upperfence": values[high - 1],
+        "outliers": np.concatenate([values[:low], values[high:]]),
+    }
+
+def limit_points(values, n_out):
+    """Paling banyak n_out nilai dari values terurut, tersebar rata dan selalu termasuk kedua ujungnya."""
+    if len(values) <= n_out:
+        return values
+    if n_out <= 0:
+        return values[:0]
+    return values[np.unique(np.linspace(0, len(values) - 1, n_out).round().astype(np.intp))]
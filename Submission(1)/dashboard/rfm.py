@@ -0,0 +1,212 @@
+"""
+Skor RFM (Recency, Frequency, Monetary) untuk dashboard bike sharing.
+
+Setiap baris harian diberi skor 1-5 per metrik berdasarkan kuantil 20% dari baris yang
+lolos filter, setara dengan pd.qcut(..., 5) pada versi lama dashboard:
+- Recency: selisih hari ke tanggal terakhir dalam filter (makin baru makin tinggi skornya)
+- Frequency: casual + registered
+- Monetary: cnt
+
+Metrik disimpan sebagai array NumPy terurut menurut tanggal. Batas kuantil dihitung dengan
+np.quantile dan bin dengan searchsorted, tanpa Categorical dari qcut. Hasil per filter
+(tanggal mulai, tanggal akhir, musim) di-cache. Hari baru bisa ditambahkan dengan append():
+metrik baris lama tidak dihitung ulang dan hanya cache filter yang mencakup hari baru yang
+dibuang.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+N_BINS = 5
+# Jumlah kombinasi filter yang hasil skornya disimpan
+SCORE_CACHE_SIZE = 256
+REQUIRED_COLUMNS = ["dteday", "season", "casual", "registered", "cnt"]
+_EPOCH_DAY = np.datetime64(0, 'D')
+
+# Rentang nilai integer maksimum agar kuantil dihitung dengan bincount, bukan np.quantile
+BINCOUNT_MAX_RANGE = 1 << 20
+
+def _lerp_order_statistics(lower, upper, gamma):
+    """Interpolasi linear antar dua order statistic dengan rumus np.quantile sendiri (hasil identik)."""
+    return np.array([np.quantile(np.array([lo, hi]), g) for lo, hi, g in zip(lower, upper, gamma)])
+
+def quantile_edges(values, probs, presorted=False):
+    """
+    Sama dengan np.quantile(values, probs) (metode linear) untuk values tidak kosong.
+    Array yang sudah terurut naik dan integer dengan rentang kecil tidak perlu partition:
+    order statistic diambil langsung atau dari jumlah kumulatif bincount.
+    """
+    n = len(values)
+    position = (n - 1) * probs
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    if presorted:
+        return _lerp_order_statistics(values[lower], values[upper], position - lower)
+    if values.dtype.kind in 'iu':
+        low, high = int(values.min()), int(values.max())
+        if high - low <= BINCOUNT_MAX_RANGE:
+            cumulative = np.cumsum(np.bincount(values - low, minlength=high - low + 1))
+            def order_statistic(k):
+                return np.searchsorted(cumulative, k, side='right') + low
+            return _lerp_order_statistics(order_statistic(lower), order_statistic(upper), position - lower)
+    return np.quantile(values, probs)
+
+def quantile_bins(values, n_bins=N_BINS, presorted=False):
+    """
+    Nomor bin 0..n_bins-1 per nilai dari kuantil linear values, bin tertutup di kanan dan
+    bin pertama mencakup nilai minimum, sama dengan pd.qcut(values, n_bins, labels=False).
+    Jika ada batas kuantil yang kembar (qcut akan error), nilai masuk ke bin terendah yang cocok.
+    presorted=True jika values sudah terurut naik.
+    """
+    values = np.asarray(values)
+    bins = np.zeros(len(values), dtype=np.int8)
+    if len(values) == 0:
+        return bins
+    edges = quantile_edges(values, np.linspace(0, 1, n_bins + 1)[1:-1], presorted)
+    # bin = jumlah batas yang lebih kecil dari nilai (= searchsorted(edges, values, 'left')).
+    # Batasnya hanya n_bins - 1, jadi satu perbandingan vektor per batas lebih cepat daripada
+    # binary search per nilai; pada array terurut cukup mencari posisi setiap batas.
+    if presorted:
+        for position in np.searchsorted(values, edges, side='right'):
+            bins[position:] += 1
+        return bins
+    if values.dtype.kind in 'iu':
+        # Untuk integer, x > batas sama dengan x > floor(batas); tanpa konversi ke float
+        edges = np.floor(edges).astype(values.dtype)
+    for edge in edges:
+        bins += values > edge
+    return bins
+
+def rfm_scores(recency, frequency, monetary, n_bins=N_BINS):
+    """
+    (R_Score, F_Score, M_Score) bernilai 1..n_bins; recency kecil mendapat skor tinggi.
+    recency harus terurut turun (baris terurut menurut tanggal).
+    """
+    # Recency dari tanggal terurut naik selalu terurut turun; dibalik (view) menjadi terurut naik
+    r_score = (n_bins - quantile_bins(recency[::-1], n_bins, presorted=True)[::-1]).astype(np.int8)
+    f_score = quantile_bins(frequency, n_bins) + np.int8(1)
+    m_score = quantile_bins(monetary, n_bins) + np.int8(1)
+    return r_score, f_score, m_score
+
+def _day_numbers(dates):
+    """Tanggal (Series/array datetime) menjadi jumlah hari sejak 1970-01-01 (int64)."""
+    return (np.asarray(dates, dtype='datetime64[D]') - _EPOCH_DAY).astype(np.int64)
+
+class _GrowableArray:
+    """Array 1 dimensi dengan kapasitas berlipat dua, agar append tidak menyalin semua isi setiap kali."""
+
+    def __init__(self, values):
+        self._data = np.array(values)
+        self._size = len(self._data)
+
+    def append(self, values):
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+
+    @property
+    def values(self):
+        return self._data[:self._size]
+
+class RFMEngine:
+    """Skor RFM per filter dari baris harian terurut (dteday, season, casual, registered, cnt)."""
+
+    def __init__(self, day, season, frequency, monetary, n_bins=N_BINS, cache_size=SCORE_CACHE_SIZE):
+        self.n_bins = n_bins
+        self.cache_size = cache_size
+        self._day = _GrowableArray(np.asarray(day, dtype=np.int64))
+        self._season = _GrowableArray(np.asarray(season, dtype=np.int8))
+        self._frequency = _GrowableArray(np.asarray(frequency, dtype=np.int64))
+        self._monetary = _GrowableArray(np.asarray(monetary, dtype=np.int64))
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _metrics(days_df):
+        """(hari, season, frequency, monetary) dari DataFrame harian, diurutkan menurut tanggal."""
+        days_df = days_df.sort_values("dteday", kind="stable")
+        frequency = days_df["casual"].to_numpy(dtype=np.int64) + days_df["registered"].to_numpy(dtype=np.int64)
+        return (_day_numbers(days_df["dteday"]), days_df["season"].to_numpy(), frequency,
+                days_df["cnt"].to_numpy(dtype=np.int64))
+
+    @classmethod
+    def from_days(cls, days_df, **kwargs):
+        missing = [column for column in REQUIRED_COLUMNS if column not in days_df.columns]
+        if missing:
+            raise ValueError(f"Kolom untuk RFM tidak ada: {missing}")
+        return cls(*cls._metrics(days_df), **kwargs)
+
+    def __len__(self):
+        return self._day._size
+
+    def append(self, new_days):
+        """
+        Menambahkan hari baru (tanggal tidak boleh lebih awal dari tanggal terakhir yang ada).
+        Mengembalikan True jika berhasil, False jika urutan tanggal tidak valid.
+        """
+        if new_days is None or new_days.empty:
+            return True
+        day, season, frequency, monetary = self._metrics(new_days)
+        with self._lock:
+            if len(self) and day[0] < self._day.values[-1]:
+                print("Hari baru untuk RFM harus setelah tanggal terakhir yang sudah ada, append dibatalkan.")
+                return False
+            self._day.append(day)
+            self._season.append(season)
+            self._frequency.append(frequency)
+            self._monetary.append(monetary)
+            # Hasil filter yang berakhir sebelum hari baru tidak berubah
+            first_new = day[0]
+            for key in [key for key in self._cache if key[1] >= first_new]:
+                del self._cache[key]
+        return True
+
+    def score(self, start_date, end_date, season=None):
+        """
+        DataFrame (dteday, Recency, Frequency, Monetary, R_Score, F_Score, M_Score, RFM_Score)
+        untuk baris dengan start_date <= tanggal <= end_date dan musim season (None = semua).
+        Hasil dipakai bersama antar pemanggil dengan filter sama, jangan diubah.
+        """
+        start = _day_numbers([pd.Timestamp(start_date)])[0]
+        end = _day_numbers([pd.Timestamp(end_date)])[0]
+        key = (int(start), int(end), season)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            result = self._score(start, end, season)
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _score(self, start, end, season):
+        day = self._day.values
+        lo = np.searchsorted(day, start, side='left')
+        hi = max(lo, np.searchsorted(day, end, side='right'))
+        day = day[lo:hi]
+        frequency = self._frequency.values[lo:hi]
+        monetary = self._monetary.values[lo:hi]
+        if season is not None:
+            keep = self._season.values[lo:hi] == season
+            day, frequency, monetary = day[keep], frequency[keep], monetary[keep]
+
+        recency = day[-1] - day if len(day) else day
+        r_score, f_score, m_score = rfm_scores(recency, frequency, monetary, self.n_bins)
+        # copy=False: kolom berupa potongan buffer yang hanya ditambah di belakang, aman dipakai langsung
+        return pd.DataFrame({
+            "dteday": day.astype('datetime64[D]').astype('datetime64[s]'),
+            "Recency": recency,
+            "Frequency": frequency,
+            "Monetary": monetary,
+            "R_Score": r_score,
+            "F_Score": f_score,
+            "M_Score": m_score,
+            "RFM_Score": r_score.astype(np.int16) + f_score + m_score,
+        }, copy=False)
@@ -0,0 +1,186 @@
+"""
+Rollup agregat untuk dashboard bike sharing.
+
+Data mentah diringkas sekali menjadi sumbu tanggal terurut dan prefix sum (jumlah kumulatif)
+per tanggal: total peminjaman per bulan, jumlah dan banyaknya record per jam, serta statistik
+cukup (n, sum x, sum xy) untuk korelasi cuaca. Setiap pilihan rentang tanggal dijawab dengan
+dua pencarian biner pada sumbu tanggal dan selisih dua baris prefix sum, sehingga waktunya
+tidak bergantung pada jumlah data mentah. Filter musim memakai prefix sum terpisah per musim.
+
+Baris harian (untuk box plot dan RFM) disimpan terurut dengan DatetimeIndex, dan opsional
+juga dengan MultiIndex (season, date). Potongan sesuai filter diambil dengan searchsorted
+lalu iloc, tanpa membuat objek date per baris dan tanpa scan ulang untuk filter musim.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from downsample import box_stats
+
+SEASON_LABELS = {1: "Spring", 2: "Summer", 3: "Fall", 4: "Winter"}
+WEATHER_COLUMNS = ["temp", "hum", "windspeed", "cnt"]
+MONTHS = np.arange(1, 13)
+HOURS = np.arange(24)
+# Jumlah kombinasi filter (tanggal mulai, tanggal akhir, musim) yang hasilnya disimpan
+QUERY_CACHE_SIZE = 256
+
+# Hasil satu kombinasi filter:
+# - monthly_counts: total cnt per bulan (index 1-12, hanya bulan yang punya data)
+# - hourly_mean: rata-rata cnt per jam (index 0-23, hanya jam yang punya data)
+# - weather_corr: matriks korelasi WEATHER_COLUMNS
+# - days: potongan rollup harian sesuai filter (jangan diubah, dipakai bersama antar rerun)
+# - season_box: {label musim: statistik box plot cnt harian} (lihat downsample.box_stats)
+RollupView = namedtuple('RollupView', ['monthly_counts', 'hourly_mean', 'weather_corr', 'days', 'season_box'])
+
+def _prefix_sum(values):
+    """Jumlah kumulatif sepanjang sumbu 0 dengan baris nol di depan: sum(values[a:b]) = p[b] - p[a]."""
+    prefix = np.zeros((len(values) + 1,) + values.shape[1:], dtype=values.dtype)
+    np.cumsum(values, axis=0, out=prefix[1:])
+    return prefix
+
+def _one_hot_sum(positions, values, width):
+    """Matriks (n, width) berisi values pada kolom positions[i] dan nol di kolom lain."""
+    out = np.zeros((len(values), width), dtype=values.dtype)
+    out[np.arange(len(values)), positions] = values
+    return out
+
+class DashboardRollups:
+    """
+    Rollup harian/per jam yang dibangun sekali dari day_df dan hour_df.
+    index_by_season=False melewatkan MultiIndex (season, date); filter musim pada baris
+    harian lalu memakai mask atas potongan tanggal saja.
+    """
+
+    def __init__(self, day_df, hour_df, index_by_season=True):
+        days = day_df.sort_values("dteday", kind="stable")
+        days.index = pd.DatetimeIndex(days["dteday"], name="date")
+        days["month"] = days["dteday"].dt.month
+        days["season_label"] = days["season"].map(SEASON_LABELS)
+        self.days = days
+        self.dates = days.index
+
+        self.days_by_season = None
+        if index_by_season:
+            by_season = days.sort_values(["season", "dteday"], kind="stable")
+            by_season.index = pd.MultiIndex.from_arrays(
+                [by_season["season"].to_numpy(), by_season.index], names=["season", "date"])
+            self.days_by_season = by_season
+            self._season_dates = by_season.index.get_level_values("date")
+            season_codes = by_season.index.get_level_values("season")
+            self._season_bounds = {
+                season: (season_codes.searchsorted(season, side='left'), season_codes.searchsorted(season, side='right'))
+                for season in SEASON_LABELS
+            }
+
+        # Rollup per (tanggal, jam): jumlah cnt dan banyaknya record mentah
+        hourly = hour_df.groupby(["dteday", "hr"])["cnt"].agg(["sum", "count"])
+        hour_dates = hourly.index.get_level_values("dteday")
+        day_position = self.dates.searchsorted(hour_dates)
+        # Tanggal per jam yang tidak ada di day_df tidak punya baris rollup, jadi dilewati
+        known = day_position < len(days)
+        known[known] = self.dates[day_position[known]] == hour_dates[known]
+        if not known.all():
+            print(f"{int((~known).sum())} rollup per jam dilewati karena tanggalnya tidak ada di data harian.")
+            hourly = hourly[known]
+            day_position = day_position[known]
+        hour = hourly.index.get_level_values("hr").to_numpy()
+        hourly_sum = np.zeros((len(days), len(HOURS)), dtype=np.int64)
+        hourly_count = np.zeros((len(days), len(HOURS)), dtype=np.int64)
+        np.add.at(hourly_sum, (day_position, hour), hourly["sum"].to_numpy())
+        np.add.at(hourly_count, (day_position, hour), hourly["count"].to_numpy())
+
+        cnt = days["cnt"].to_numpy(dtype=np.int64)
+        month_position = days["month"].to_numpy() - 1
+        monthly_sum = _one_hot_sum(month_position, cnt, len(MONTHS))
+        monthly_days = _one_hot_sum(month_position, np.ones(len(days), dtype=np.int64), len(MONTHS))
+        weather = days[WEATHER_COLUMNS].to_numpy(dtype=np.float64)
+        weather_stats = np.concatenate(
+            [np.ones((len(days), 1)), weather, (weather[:, :, None] * weather[:, None, :]).reshape(len(days), -1)],
+            axis=1,
+        )
+
+        # Prefix sum untuk semua musim (None) dan per musim (baris musim lain dinolkan)
+        season = days["season"].to_numpy()
+        self._prefix = {}
+        for season_key in [None] + sorted(SEASON_LABELS):
+            keep = np.ones(len(days), dtype=bool) if season_key is None else season == season_key
+            self._prefix[season_key] = {
+                "monthly_sum": _prefix_sum(monthly_sum * keep[:, None]),
+                "monthly_days": _prefix_sum(monthly_days * keep[:, None]),
+                "hourly_sum": _prefix_sum(hourly_sum * keep[:, None]),
+                "hourly_count": _prefix_sum(hourly_count * keep[:, None]),
+                "weather_stats": _prefix_sum(weather_stats * keep[:, None]),
+            }
+        self.query = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._query)
+
+    def date_range(self):
+        """(tanggal pertama, tanggal terakhir) sebagai datetime.date."""
+        return self.dates[0].date(), self.dates[-1].date()
+
+    @staticmethod
+    def _slice(dates, start_date, end_date):
+        """Posisi [start, end) pada DatetimeIndex terurut untuk tanggal start_date s.d. end_date (inklusif)."""
+        start = dates.searchsorted(pd.Timestamp(start_date), side='left')
+        end = dates.searchsorted(pd.Timestamp(end_date) + pd.Timedelta(days=1), side='left')
+        return start, max(start, end)
+
+    def days_in_range(self, start_date, end_date, season=None):
+        """Baris harian sesuai filter, terurut menurut tanggal; O(log n) untuk mencari batasnya."""
+        if season is None:
+            start, end = self._slice(self.dates, start_date, end_date)
+            return self.days.iloc[start:end]
+        if self.days_by_season is None:
+            start, end = self._slice(self.dates, start_date, end_date)
+            days = self.days.iloc[start:end]
+            return days[days["season"].to_numpy() == season]
+        block_start, block_end = self._season_bounds[season]
+        start, end = self._slice(self._season_dates[block_start:block_end], start_date, end_date)
+        return self.days_by_season.iloc[block_start + start:block_start + end]
+
+    def _query(self, start_date, end_date, season=None):
+        start, end = self._slice(self.dates, start_date, end_date)
+        prefix = self._prefix[season]
+
+        def window(name):
+            return prefix[name][end] - prefix[name][start]
+
+        monthly_days = window("monthly_days")
+        monthly_counts = pd.Series(window("monthly_sum"), index=pd.Index(MONTHS, name="month"), name="cnt")
+        monthly_counts = monthly_counts[monthly_days > 0]
+
+        hourly_count = window("hourly_count")
+        has_hour = hourly_count > 0
+        hourly_mean = pd.Series(window("hourly_sum")[has_hour] / hourly_count[has_hour],
+                                index=pd.Index(HOURS[has_hour], name="hr"), name="cnt")
+
+        days = self.days_in_range(start_date, end_date, season)
+        return RollupView(monthly_counts, hourly_mean, self._correlation(window("weather_stats")), days,
+                          self._season_box(days))
+
+    @staticmethod
+    def _season_box(days):
+        cnt = days["cnt"].to_numpy()
+        season = days["season"].to_numpy()
+        season_box = {}
+        for code, label in SEASON_LABELS.items():
+            stats = box_stats(cnt[season == code])
+            if stats is not None:
+                season_box[label] = stats
+        return season_box
+
+    @staticmethod
+    def _correlation(stats):
+        """Korelasi Pearson dari statistik cukup [n, sum x, sum x x^T]."""
+        k = len(WEATHER_COLUMNS)
+        n = stats[0]
+        sums = stats[1:1 + k]
+        products = stats[1 + k:].reshape(k, k)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = products - np.outer(sums, sums) / n
+            std = np.sqrt(np.diag(covariance))
+            corr = covariance / np.outer(std, std)
+        if n < 2:
+            corr = np.full((k, k), np.nan)
+        return pd.DataFrame(corr, index=WEATHER_COLUMNS, columns=WEATHER_COLUMNS)
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from downsample import POINT_BUDGETS, WHISKER_IQR, box_stats, downsample_line, limit_points, lttb_indices, point_budget
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def noisy_line():
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(size=5000))
+    return np.arange(len(y)), y
+
+@pytest.mark.parametrize("n_out", [5000, 5001, 100000])
+def test_lttb_keeps_all_points_within_budget(noisy_line, n_out):
+    x, y = noisy_line
+    assert lttb_indices(x, y, n_out).tolist() == list(range(len(x)))
+
+@pytest.mark.parametrize("n_out", [3, 4, 10, 999, 4999])
+def test_lttb_respects_budget_and_keeps_endpoints(noisy_line, n_out):
+    x, y = noisy_line
+    index = lttb_indices(x, y, n_out)
+    assert len(index) == n_out
+    assert index[0] == 0 and index[-1] == len(x) - 1
+    assert (np.diff(index) > 0).all()
+
+@pytest.mark.parametrize("n_out, expected", [(0, []), (1, [0]), (2, [0, 4999])])
+def test_lttb_budget_below_three(noisy_line, n_out, expected):
+    x, y = noisy_line
+    assert lttb_indices(x, y, n_out).tolist() == expected
+
+def test_lttb_short_lines_are_returned_unchanged():
+    assert lttb_indices([0, 1], [5, 6], 1).tolist() == [0, 1]
+    assert lttb_indices([], [], 10).tolist() == []
+
+def test_lttb_keeps_spike():
+    y = np.zeros(1000)
+    y[437] = 50.0
+    assert 437 in lttb_indices(np.arange(1000), y, 20)
+
+def test_downsample_line_with_datetime_x():
+    x = pd.date_range("2011-01-01", periods=2000, freq="h").to_numpy()
+    y = np.sin(np.arange(2000) / 50)
+    dx, dy = downsample_line(x, y, 100)
+    assert len(dx) == len(dy) == 100
+    assert dx[0] == x[0] and dx[-1] == x[-1]
+    assert dx.dtype == x.dtype
+
+def plotly_linear_quantile(values, p):
+    """Kuartil quartilemethod "linear" Plotly: interp(L, p) di plotly.js, posisi p * n - 0.5."""
+    values = np.sort(values)
+    position = p * len(values) - 0.5
+    if position < 0:
+        return values[0]
+    if position > len(values) - 1:
+        return values[-1]
+    fraction = position % 1
+    return fraction * values[int(np.ceil(position))] + (1 - fraction) * values[int(np.floor(position))]
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4, 5, 10, 503])
+def test_box_stats_match_plotly_quartiles_and_whiskers(n):
+    rng = np.random.default_rng(n)
+    values = np.concatenate([rng.normal(4500, 900, max(n - 3, 0)).round(), [-5000, 15000, 16000]])[:n]
+    stats = box_stats(values)
+
+    q1, median, q3 = (plotly_linear_quantile(values, p) for p in (0.25, 0.5, 0.75))
+    assert (stats["q1"], stats["median"], stats["q3"]) == pytest.approx((q1, median, q3))
+    # Whisker Plotly: titik data terjauh yang masih dalam 1.5 x IQR dari kuartil
+    iqr = q3 - q1
+    inside = values[(values >= q1 - WHISKER_IQR * iqr) & (values <= q3 + WHISKER_IQR * iqr)]
+    assert stats["lowerfence"] == inside.min() and stats["upperfence"] == inside.max()
+    assert sorted(stats["outliers"]) == sorted(values[(values < inside.min()) | (values > inside.max())])
+
+def test_box_stats_on_bundled_data_match_plotly():
+    day_df = pd.read_csv(os.path.join(DATA_DIR, "day.csv"))
+    # Nilai dari px.box lama: q3 Fall 6941.5 dan q1 Summer 3996 (default NumPy: 6929.25 dan 4003)
+    assert box_stats(day_df.loc[day_df["season"] == 3, "cnt"])["q3"] == 6941.5
+    assert box_stats(day_df.loc[day_df["season"] == 2, "cnt"])["q1"] == 3996
+
+def test_box_stats_small_inputs():
+    assert box_stats([]) is None
+    stats = box_stats([7])
+    assert stats["q1"] == stats["median"] == stats["q3"] == stats["lowerfence"] == stats["upperfence"] == 7
+    assert len(stats["outliers"]) == 0
+
+@pytest.mark.parametrize("n_out", [0, 1, 2, 50, 1000, 2000])
+def test_limit_points(n_out):
+    values = np.arange(1000.0)
+    limited = limit_points(values, n_out)
+    assert len(limited) == min(n_out, len(values))
+    if n_out >= 2:
+        assert limited[0] == 0 and limited[-1] == 999
+
+def test_point_budget_from_environment(monkeypatch):
+    assert point_budget("hourly") == POINT_BUDGETS["hourly"]
+    monkeypatch.setenv("BIKE_SHARING_POINTS_HOURLY", "250")
+    assert point_budget("hourly") == 250
+    monkeypatch.setenv("BIKE_SHARING_POINTS_HOURLY", "banyak")
+    assert point_budget("hourly") == POINT_BUDGETS["hourly"]
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rfm import RFMEngine, quantile_bins, quantile_edges, rfm_scores
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCORE_COLUMNS = ["Recency", "Frequency", "Monetary", "R_Score", "F_Score", "M_Score", "RFM_Score"]
+PROBS = np.linspace(0, 1, 6)[1:-1]
+
+@pytest.fixture(scope="module")
+def day_df():
+    return pd.read_csv(os.path.join(DATA_DIR, "day.csv"), parse_dates=["dteday"])
+
+def score_with_qcut(day_df):
+    """Kode RFM versi lama dashboard."""
+    day_df = day_df.copy()
+    max_date = day_df["dteday"].max()
+    day_df["Recency"] = (max_date - day_df["dteday"]).dt.days
+    day_df["Frequency"] = day_df["casual"] + day_df["registered"]
+    day_df["Monetary"] = day_df["cnt"]
+    day_df["R_Score"] = pd.qcut(day_df["Recency"], 5, labels=[5, 4, 3, 2, 1])
+    day_df["F_Score"] = pd.qcut(day_df["Frequency"], 5, labels=[1, 2, 3, 4, 5])
+    day_df["M_Score"] = pd.qcut(day_df["Monetary"], 5, labels=[1, 2, 3, 4, 5])
+    day_df["RFM_Score"] = day_df["R_Score"].astype(int) + day_df["F_Score"].astype(int) + day_df["M_Score"].astype(int)
+    return day_df
+
+def expected_bins(values):
+    """Definisi bin: jumlah batas np.quantile yang lebih kecil dari nilai."""
+    return np.searchsorted(np.quantile(values, PROBS), values, side='left')
+
+def test_scores_match_qcut_on_random_filters(day_df):
+    engine = RFMEngine.from_days(day_df)
+    dates = sorted(day_df["dteday"].dt.date)
+    rng = np.random.default_rng(0)
+    compared = 0
+    for _ in range(80):
+        start, end = sorted(rng.integers(0, len(dates), 2))
+        season = [None, 1, 2, 3, 4][rng.integers(0, 5)]
+        filtered = day_df[(day_df["dteday"].dt.date >= dates[start]) & (day_df["dteday"].dt.date <= dates[end])]
+        if season is not None:
+            filtered = filtered[filtered["season"] == season]
+        try:
+            old = score_with_qcut(filtered)
+        except ValueError:
+            continue # qcut gagal jika batas kuantil kembar, lihat test di bawah
+        new = engine.score(dates[start], dates[end], season)
+        assert new["dteday"].tolist() == old["dteday"].tolist()
+        for column in SCORE_COLUMNS:
+            assert new[column].astype(int).tolist() == old[column].astype(int).tolist(), column
+        compared += 1
+    assert compared > 40
+
+@pytest.mark.parametrize("values", [
+    [1, 1, 1, 2, 2, 2, 3, 3, 3, 4],             # banyak nilai kembar
+    [5, 5, 5, 5, 5, 5, 5],                      # semua sama
+    [7],                                        # satu baris
+    [3, 9],                                     # lebih sedikit dari jumlah bin
+    [4, 1, 3],
+    [0, 0, 0, 0, 10],
+])
+def test_quantile_bins_with_ties_and_few_rows(values):
+    values = np.array(values, dtype=np.int64)
+    bins = quantile_bins(values)
+    assert bins.tolist() == expected_bins(values).tolist()
+    assert bins.min() >= 0 and bins.max() <= 4
+    assert quantile_bins(np.sort(values), presorted=True).tolist() == expected_bins(np.sort(values)).tolist()
+    assert quantile_bins(values.astype(float)).tolist() == expected_bins(values).tolist()
+
+def test_quantile_bins_match_qcut_when_edges_unique():
+    rng = np.random.default_rng(1)
+    for n in [5, 6, 17, 250]:
+        values = rng.integers(0, 1000, n)
+        assert quantile_bins(values).tolist() == pd.qcut(values, 5, labels=False).tolist()
+
+def test_quantile_edges_equal_np_quantile():
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        values = rng.integers(-50, int(rng.integers(1, 5000)), int(rng.integers(1, 300)))
+        assert np.array_equal(quantile_edges(values, PROBS), np.quantile(values, PROBS))
+        assert np.array_equal(quantile_edges(np.sort(values), PROBS, presorted=True), np.quantile(values, PROBS))
+
+def test_all_equal_columns_get_lowest_bin():
+    r_score, f_score, m_score = rfm_scores(np.zeros(4, dtype=np.int64), np.full(4, 9), np.full(4, 9))
+    assert r_score.tolist() == [5] * 4
+    assert f_score.tolist() == [1] * 4 and m_score.tolist() == [1] * 4
+
+def test_empty_filter_returns_empty_frame(day_df):
+    result = RFMEngine.from_days(day_df).score("2030-01-01", "2030-12-31")
+    assert result.empty and list(result.columns) == ["dteday"] + SCORE_COLUMNS
+
+def test_score_is_cached_per_filter_key(day_df):
+    engine = RFMEngine.from_days(day_df, cache_size=2)
+    first = engine.score("2011-01-01", "2011-06-30")
+    assert engine.score("2011-01-01", "2011-06-30") is first
+    assert engine.score("2011-01-01", "2011-06-30", 1) is not first
+    engine.score("2012-01-01", "2012-06-30")
+    # cache_size=2: filter pertama sudah dibuang
+    assert engine.score("2011-01-01", "2011-06-30") is not first
+
+def test_append_matches_full_rescore(day_df):
+    full = RFMEngine.from_days(day_df)
+    engine = RFMEngine.from_days(day_df.iloc[:500])
+    before_new_days = engine.score("2011-01-01", "2011-12-31")
+    reaching_new_days = engine.score("2011-01-01", "2012-12-31")
+
+    assert engine.append(day_df.iloc[500:600])
+    assert engine.append(day_df.iloc[600:])
+    assert len(engine) == len(day_df)
+    # Filter yang berakhir sebelum hari baru tetap dari cache, yang mencakupnya dihitung ulang
+    assert engine.score("2011-01-01", "2011-12-31") is before_new_days
+    assert engine.score("2011-01-01", "2012-12-31") is not reaching_new_days
+    for start, end, season in [("2011-01-01", "2012-12-31", None), ("2012-03-01", "2012-12-31", 3),
+                                ("2011-06-01", "2012-08-15", 2)]:
+        pd.testing.assert_frame_equal(engine.score(start, end, season), full.score(start, end, season))
+
+def test_append_rejects_earlier_dates(day_df):
+    engine = RFMEngine.from_days(day_df.iloc[100:])
+    assert not engine.append(day_df.iloc[:3])
+    assert len(engine) == len(day_df) - 100
+
+def test_missing_columns_raise(day_df):
+    with pytest.raises(ValueError):
+        RFMEngine.from_days(day_df.drop(columns=["casual"]))
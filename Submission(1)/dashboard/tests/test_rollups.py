@@ -0,0 +1,92 @@
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rollups import WEATHER_COLUMNS, DashboardRollups
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEASON_MAPPING = {"Spring": 1, "Summer": 2, "Fall": 3, "Winter": 4}
+
+@pytest.fixture(scope="module")
+def bike_data():
+    day_df = pd.read_csv(os.path.join(DATA_DIR, "day.csv"), parse_dates=["dteday"])
+    hour_df = pd.read_csv(os.path.join(DATA_DIR, "hour.csv"), parse_dates=["dteday"])
+    return day_df, hour_df
+
+@pytest.fixture(scope="module", params=[True, False], ids=["season_index", "season_mask"])
+def rollups(bike_data, request):
+    return DashboardRollups(*bike_data, index_by_season=request.param)
+
+def baseline(day_df, hour_df, start_date, end_date, season):
+    """Filter dan groupby versi lama dashboard."""
+    day_df = day_df[(day_df["dteday"].dt.date >= start_date) & (day_df["dteday"].dt.date <= end_date)]
+    hour_df = hour_df[(hour_df["dteday"].dt.date >= start_date) & (hour_df["dteday"].dt.date <= end_date)]
+    if season is not None:
+        day_df = day_df[day_df["season"] == season]
+        hour_df = hour_df[hour_df["season"] == season]
+    monthly_counts = day_df.groupby(day_df["dteday"].dt.month)["cnt"].sum()
+    hourly_mean = hour_df.groupby("hr")["cnt"].mean()
+    return day_df, monthly_counts, hourly_mean, day_df[WEATHER_COLUMNS].corr()
+
+def assert_matches_baseline(rollups, bike_data, start_date, end_date, season):
+    days, monthly_counts, hourly_mean, weather_corr = baseline(*bike_data, start_date, end_date, season)
+    view = rollups.query(start_date, end_date, season)
+
+    assert view.monthly_counts.index.tolist() == monthly_counts.index.tolist()
+    assert view.monthly_counts.tolist() == monthly_counts.tolist()
+    assert view.hourly_mean.index.tolist() == hourly_mean.index.tolist()
+    np.testing.assert_allclose(view.hourly_mean.to_numpy(), hourly_mean.to_numpy())
+    np.testing.assert_allclose(view.weather_corr.to_numpy(), weather_corr.to_numpy(), atol=1e-9, equal_nan=True)
+    assert view.days["dteday"].tolist() == days["dteday"].tolist()
+    assert rollups.days_in_range(start_date, end_date, season)["dteday"].tolist() == days["dteday"].tolist()
+
+def test_random_filters_match_baseline(rollups, bike_data):
+    dates = sorted(bike_data[0]["dteday"].dt.date)
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        start, end = sorted(rng.integers(0, len(dates), 2))
+        season = [None, *SEASON_MAPPING.values()][rng.integers(0, 5)]
+        assert_matches_baseline(rollups, bike_data, dates[start], dates[end], season)
+
+@pytest.mark.parametrize("season", [None, 1, 3])
+@pytest.mark.parametrize("offsets", [
+    (0, 0),          # satu hari pertama
+    (400, 400),      # satu hari di tengah
+    (730, 730),      # satu hari terakhir
+    (10, 5),         # mulai setelah akhir: kosong
+    (-30, -1),       # seluruhnya sebelum data
+    (731, 800),      # seluruhnya setelah data
+    (-30, 20),       # sebagian sebelum data
+    (700, 900),      # sebagian setelah data
+])
+def test_edge_ranges_match_baseline(rollups, bike_data, offsets, season):
+    first = bike_data[0]["dteday"].min().date()
+    start_date, end_date = (first + timedelta(days=offset) for offset in offsets)
+    assert_matches_baseline(rollups, bike_data, start_date, end_date, season)
+
+def test_empty_range_returns_empty_view(rollups):
+    view = rollups.query(date(2030, 1, 1), date(2030, 12, 31))
+    assert view.monthly_counts.empty and view.hourly_mean.empty and view.days.empty
+    assert view.weather_corr.isna().all().all()
+    assert view.season_box == {}
+
+def test_query_is_cached_per_filter(rollups):
+    first, last = rollups.date_range()
+    assert rollups.query(first, last, 2) is rollups.query(first, last, 2)
+    assert rollups.query(first, last, 2) is not rollups.query(first, last, 3)
+
+def test_hour_dates_missing_from_day_df_are_skipped():
+    day_df = pd.DataFrame({
+        'dteday': pd.to_datetime(["2020-01-01", "2020-01-03"]), 'season': [1, 1], 'cnt': [5, 7],
+        'temp': [0.1, 0.2], 'hum': [0.3, 0.4], 'windspeed': [0.1, 0.2],
+    })
+    # 01-02 ada di antara dua hari, 01-05 setelah hari terakhir
+    hour_df = pd.DataFrame({
+        'dteday': pd.to_datetime(["2020-01-01", "2020-01-02", "2020-01-03", "2020-01-05"]),
+        'hr': [1, 1, 1, 2], 'cnt': [5, 100, 7, 9],
+    })
+    view = DashboardRollups(day_df, hour_df).query(date(2020, 1, 1), date(2020, 1, 5))
+    assert view.hourly_mean.to_dict() == {1: 6.0}
@@ -0,0 +1,59 @@
+"""
+Benchmark ekstraksi end-to-end terhadap server lokal (benchmarks.server): parsing di
+thread fetcher dibandingkan parsing di process pool dengan jumlah proses berbeda.
+Throughput parsing multi-proses naik sesuai jumlah core yang tersedia.
+
+Jalankan dari folder Submission-pemda:
+    python -m benchmarks.bench_extract --pages 200 --cards 100 --processes 0 1 2 4
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+from benchmarks.server import serve_catalogue
+from utils.extract import extract_data_from_website
+
+def _timed_extract(max_workers, backend, parse_processes):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        df = extract_data_from_website(max_workers=max_workers, requests_per_second=0,
+                                       parser_backend=backend, parse_processes=parse_processes)
+        elapsed = time.perf_counter() - start
+    return df, elapsed
+
+def run(pages, cards, process_counts, max_workers=4, backend="bs4"):
+    results = []
+    with serve_catalogue(total_pages=pages, n_cards=cards) as base_url, \
+            patch('utils.extract.BASE_URL', base_url), patch('utils.extract.MAX_PAGES', pages):
+        reference = None
+        for parse_processes in process_counts:
+            df, elapsed = _timed_extract(max_workers, backend, parse_processes)
+            df = df.drop(columns='timestamp')
+            if reference is None:
+                reference = df
+            pd.testing.assert_frame_equal(df, reference)
+            results.append((parse_processes, len(df), elapsed))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--cards", type=int, default=100, help="jumlah kartu per halaman")
+    parser.add_argument("--processes", type=int, nargs="+", default=[0, 1, 2, 4],
+                        help="jumlah proses parser (0 = parse di thread fetcher)")
+    parser.add_argument("--workers", type=int, default=4, help="jumlah thread fetcher")
+    parser.add_argument("--backend", default="bs4")
+    args = parser.parse_args()
+
+    print(f"core tersedia: {os.cpu_count()}")
+    print(f"{'proses':>8}{'produk':>10}{'waktu (s)':>12}{'halaman/detik':>16}")
+    for parse_processes, n_products, elapsed in run(args.pages, args.cards, args.processes, args.workers, args.backend):
+        print(f"{parse_processes:>8}{n_products:>10,}{elapsed:>12.2f}{args.pages / elapsed:>16.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark sink load: ukuran file, waktu tulis dan waktu baca kembali (dengan skema
+bertipe) untuk CSV biasa, CSV terkompresi, Parquet dan Feather/Arrow IPC.
+--compact memakai skema hemat memori dari transform_data(compact=True).
+
+Jalankan dari folder Submission-pemda:
+    python -m benchmarks.bench_load --rows 100000 1000000
+    python -m benchmarks.bench_load --rows 1000000 --compact
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_raw_products
+from utils.load import available_formats, detect_format, load_data, read_output
+from utils.transform import memory_report, transform_data
+
+# (nama file, kwargs loader)
+SINK_CASES = [
+    ("products.csv", {}),
+    ("products.csv.gz", {}),
+    ("products.csv.zst", {}),
+    ("products.parquet", {"compression": "snappy"}),
+    ("products.parquet", {"compression": "zstd"}),
+    ("products.feather", {"compression": "zstd"}),
+    ("products.arrow", {"compression": "uncompressed"}),
+]
+
+def _case_label(filename, kwargs):
+    compression = kwargs.get("compression")
+    return f"{filename} ({compression})" if compression else filename
+
+def _clean_products(n_rows, compact=False):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return transform_data(make_raw_products(n_rows), compact=compact)
+
+def run(row_counts, repeat=3, compact=False):
+    formats = available_formats()
+    results = []
+    for n_rows in row_counts:
+        df = _clean_products(n_rows, compact)
+        print(f"{n_rows:>10,}  memori DataFrame: {memory_report(df)['bytes_per_row']:.1f} byte/baris")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for filename, kwargs in SINK_CASES:
+                if detect_format(filename) not in formats:
+                    continue
+                path = os.path.join(tmp_dir, filename)
+                write_times, read_times = [], []
+                for _ in range(repeat):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        start = time.perf_counter()
+                        ok = load_data(df, path, **kwargs)
+                        write_times.append(time.perf_counter() - start)
+                        start = time.perf_counter()
+                        df_read = read_output(path, compact=compact)
+                        read_times.append(time.perf_counter() - start)
+                    if not ok or df_read is None:
+                        break
+                else:
+                    pd.testing.assert_frame_equal(df_read, df)
+                    results.append((len(df), _case_label(filename, kwargs), os.path.getsize(path),
+                                    min(write_times), min(read_times)))
+                if os.path.exists(path):
+                    os.remove(path)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compact", action="store_true", help="pakai skema compact hasil transform")
+    args = parser.parse_args()
+
+    print(f"{'baris':>10}  {'sink':<32}{'ukuran (KB)':>13}{'tulis (s)':>11}{'baca (s)':>10}")
+    baseline = {}
+    for n_rows, label, size, write_time, read_time in run(args.rows, args.repeat, args.compact):
+        baseline.setdefault(n_rows, (size, read_time))
+        csv_size, csv_read = baseline[n_rows]
+        print(f"{n_rows:>10,}  {label:<32}{size / 1024:13,.0f}{write_time:11.3f}{read_time:10.3f}"
+              f"   ({size / csv_size:.2f}x ukuran, {csv_read / read_time:.1f}x baca vs CSV)")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
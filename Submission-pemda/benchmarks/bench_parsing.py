@@ -0,0 +1,55 @@
+"""
+Benchmark backend parsing: jumlah kartu produk yang di-parse per detik.
+
+Jalankan dari folder Submission-pemda:
+    python -m benchmarks.bench_parsing --cards 200 --repeat 5
+"""
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.synthetic import make_page_html
+from utils.extract import extract_product_details
+from utils.parsing import parse_page, available_backends
+
+def _parse_reference(content):
+    # Jalur lama: BeautifulSoup html.parser + extract_product_details per kartu
+    soup = BeautifulSoup(content, 'html.parser')
+    cards = soup.find_all('div', class_='collection-card')
+    products = [extract_product_details(card) for card in cards]
+    return [p for p in products if p and p.get('title')], len(cards)
+
+def run(n_cards=200, repeat=5):
+    content = make_page_html(1, n_cards=n_cards).encode('utf-8')
+    reference_products, _ = _parse_reference(content)
+
+    candidates = [("extract_product_details", lambda c: _parse_reference(c)[0])]
+    for backend in available_backends():
+        candidates.append((backend, lambda c, b=backend: parse_page(c, b)[0]))
+
+    results = {}
+    for name, parse in candidates:
+        products = parse(content)
+        assert products == reference_products, f"Record dari backend {name} berbeda dengan extract_product_details"
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parse(content)
+        elapsed = time.perf_counter() - start
+        results[name] = n_cards * repeat / elapsed
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=200, help="jumlah kartu per halaman")
+    parser.add_argument("--repeat", type=int, default=5, help="jumlah pengulangan parsing")
+    args = parser.parse_args()
+
+    results = run(args.cards, args.repeat)
+    baseline = results["extract_product_details"]
+    print(f"{'backend':<25}{'kartu/detik':>15}{'speedup':>10}")
+    for name, cards_per_second in results.items():
+        print(f"{name:<25}{cards_per_second:>15,.0f}{cards_per_second / baseline:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
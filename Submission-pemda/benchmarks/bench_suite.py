@@ -0,0 +1,220 @@
+"""
+Benchmark suite pipeline per tahap: extract (terhadap server lokal benchmarks.server
+dengan N halaman x M kartu, termasuk baris kotor), transform_data dan load ke setiap sink.
+Per tahap dicatat waktu terbaik dari --repeat run, baris per detik dan peak memori Python
+(tracemalloc, diukur pada run terpisah agar tidak memperlambat pengukuran waktu; alokasi
+di dalam pyarrow tidak ikut terhitung).
+
+Hasil ditambahkan ke file riwayat JSON lines beserta commit git saat ini, lalu dibandingkan
+dengan hasil terakhir dari commit lain dengan parameter yang sama. Tahap yang throughput-nya
+turun atau memorinya naik melebihi toleransi dilaporkan sebagai regresi.
+
+Jalankan dari folder Submission-pemda:
+    python -m benchmarks.bench_suite --pages 50 --cards 200
+    python -m benchmarks.bench_suite --pages 50 --cards 200 --sinks products.csv products.parquet
+    python -m benchmarks.bench_suite --pages 50 --cards 200 --fail-on-regression
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+
+from benchmarks.server import serve_catalogue
+from benchmarks.synthetic import make_raw_products
+from utils.extract import extract_data_from_website
+from utils.load import load_data
+from utils.transform import transform_data
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "history.jsonl")
+# Penurunan throughput / kenaikan memori relatif terhadap baseline yang masih ditoleransi
+THROUGHPUT_TOLERANCE = 0.15
+MEMORY_TOLERANCE = 0.20
+
+def git_commit():
+    """(hash pendek commit HEAD, ada perubahan belum di-commit); ("unknown", False) di luar repo git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(status)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+def _measure(func, repeat):
+    """Menjalankan func repeat kali (waktu terbaik) lalu sekali lagi dengan tracemalloc untuk peak memori."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, min(times), peak
+
+def _stage_record(name, rows, seconds, peak_bytes):
+    return {
+        "stage": name,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else None,
+        "peak_bytes": peak_bytes,
+    }
+
+def run(pages, cards, dirty_ratio=0.1, sinks=("products.csv",), repeat=3, rows=None, latency=0.0,
+        max_workers=4, backend="lxml"):
+    """Menjalankan semua tahap dan mengembalikan list record per tahap."""
+    records = []
+    with serve_catalogue(total_pages=pages, n_cards=cards, dirty_ratio=dirty_ratio, latency=latency) as base_url, \
+            patch('utils.extract.BASE_URL', base_url), patch('utils.extract.MAX_PAGES', pages):
+        raw, seconds, peak = _measure(
+            lambda: extract_data_from_website(max_workers=max_workers, requests_per_second=0, parser_backend=backend),
+            repeat)
+    records.append(_stage_record("extract", len(raw), seconds, peak))
+
+    # --rows: transform/load diukur pada data mentah sintetis yang lebih besar dari hasil scraping
+    if rows:
+        raw = make_raw_products(rows, dirty_ratio=dirty_ratio)
+    clean, seconds, peak = _measure(lambda: transform_data(raw), repeat)
+    records.append(_stage_record("transform", len(raw), seconds, peak))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for sink in sinks:
+            path = os.path.join(tmp_dir, sink)
+
+            def load():
+                # Sink SQLite melakukan upsert; mulai dari file kosong agar setiap run sebanding
+                if os.path.exists(path):
+                    os.remove(path)
+                return load_data(clean, path)
+
+            ok, seconds, peak = _measure(load, repeat)
+            if not ok:
+                print(f"Sink {sink} gagal, dilewati.")
+                continue
+            records.append(_stage_record(f"load:{sink}", len(clean), seconds, peak))
+    return records
+
+def read_history(path=HISTORY_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def append_history(entry, path=HISTORY_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + "\n")
+
+def find_baseline(history, params, commit, baseline_commit=None):
+    """Entri terakhir dengan parameter sama dari commit lain (atau dari baseline_commit jika diberikan)."""
+    for entry in reversed(history):
+        if entry["params"] != params:
+            continue
+        if baseline_commit is not None:
+            if entry["commit"].startswith(baseline_commit):
+                return entry
+        elif entry["commit"] != commit:
+            return entry
+    return None
+
+def compare(records, baseline_records, throughput_tolerance=THROUGHPUT_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """
+    Membandingkan record per tahap dengan baseline. Mengembalikan list
+    (tahap, metrik, nilai baseline, nilai sekarang) untuk setiap regresi.
+    """
+    baseline_by_stage = {record["stage"]: record for record in baseline_records}
+    regressions = []
+    for record in records:
+        baseline = baseline_by_stage.get(record["stage"])
+        if baseline is None:
+            continue
+        if record["rows_per_second"] and baseline["rows_per_second"] and \
+                record["rows_per_second"] < baseline["rows_per_second"] * (1 - throughput_tolerance):
+            regressions.append((record["stage"], "rows_per_second", baseline["rows_per_second"], record["rows_per_second"]))
+        if record["peak_bytes"] and baseline["peak_bytes"] and \
+                record["peak_bytes"] > baseline["peak_bytes"] * (1 + memory_tolerance):
+            regressions.append((record["stage"], "peak_bytes", baseline["peak_bytes"], record["peak_bytes"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--cards", type=int, default=200, help="jumlah kartu per halaman")
+    parser.add_argument("--dirty-ratio", type=float, default=0.1, help="proporsi kartu kotor")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="jumlah baris mentah sintetis untuk transform/load (default: hasil extract)")
+    parser.add_argument("--sinks", nargs="+", default=["products.csv"],
+                        help="file output untuk tahap load, format dari ekstensi")
+    parser.add_argument("--latency", type=float, default=0.0, help="jeda respons server per halaman (detik)")
+    parser.add_argument("--backend", default="lxml", help="backend parsing HTML untuk tahap extract")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", default=HISTORY_FILE, help="file riwayat hasil benchmark (JSON lines)")
+    parser.add_argument("--baseline", default=None, metavar="COMMIT", help="bandingkan dengan commit tertentu")
+    parser.add_argument("--no-save", action="store_true", help="jangan tambahkan hasil ke riwayat")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit code 1 jika ada regresi")
+    args = parser.parse_args()
+
+    params = {"pages": args.pages, "cards": args.cards, "dirty_ratio": args.dirty_ratio, "rows": args.rows,
+              "sinks": args.sinks, "latency": args.latency, "backend": args.backend}
+    commit, dirty = git_commit()
+    records = run(args.pages, args.cards, args.dirty_ratio, args.sinks, args.repeat, args.rows, args.latency,
+                  backend=args.backend)
+
+    print(f"commit {commit}{' (belum di-commit)' if dirty else ''}, {os.cpu_count()} core")
+    print(f"{'tahap':<28}{'baris':>12}{'waktu (s)':>12}{'baris/detik':>14}{'peak memori (MB)':>19}")
+    for record in records:
+        print(f"{record['stage']:<28}{record['rows']:>12,}{record['seconds']:>12.3f}"
+              f"{record['rows_per_second']:>14,.0f}{record['peak_bytes'] / 1024 ** 2:>19.1f}")
+
+    history = read_history(args.history)
+    baseline = find_baseline(history, params, commit, args.baseline)
+    regressions = []
+    if baseline is None:
+        print("\nBelum ada hasil pembanding dengan parameter yang sama.")
+    else:
+        regressions = compare(records, baseline["stages"])
+        print(f"\nDibandingkan dengan commit {baseline['commit']} ({baseline['timestamp']}):")
+        baseline_by_stage = {record["stage"]: record for record in baseline["stages"]}
+        for record in records:
+            old = baseline_by_stage.get(record["stage"])
+            if old and old["rows_per_second"] and record["rows_per_second"]:
+                memory = f"{record['peak_bytes'] / old['peak_bytes']:>8.2f}x memori" if old["peak_bytes"] else ""
+                print(f"  {record['stage']:<26}{record['rows_per_second'] / old['rows_per_second']:>6.2f}x throughput{memory}")
+        for stage, metric, old_value, new_value in regressions:
+            print(f"  REGRESI {stage}: {metric} {old_value:,.0f} -> {new_value:,.0f}")
+
+    if not args.no_save:
+        append_history({
+            "commit": commit,
+            "dirty": dirty,
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "params": params,
+            "environment": {"python": platform.python_version(), "pandas": pd.__version__, "cpu_count": os.cpu_count()},
+            "stages": records,
+        }, args.history)
+        print(f"Hasil ditambahkan ke {args.history}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
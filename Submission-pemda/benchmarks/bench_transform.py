@@ -0,0 +1,51 @@
+"""
+Benchmark transform_data: jalur skalar (Series.apply) dibandingkan jalur vektor.
+
+Jalankan dari folder Submission-pemda:
+    python -m benchmarks.bench_transform --rows 10000 100000 1000000
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_raw_products
+from utils.transform import transform_data
+
+def _timed_transform(df_raw, vectorized):
+    # Log print transform_data tidak ikut diukur di layar
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = transform_data(df_raw, vectorized=vectorized)
+        elapsed = time.perf_counter() - start
+    return result, elapsed
+
+def run(row_counts, skip_scalar_above=None):
+    results = []
+    for n_rows in row_counts:
+        df_raw = make_raw_products(n_rows)
+        vector_result, vector_time = _timed_transform(df_raw, vectorized=True)
+        scalar_time = None
+        if skip_scalar_above is None or n_rows <= skip_scalar_above:
+            scalar_result, scalar_time = _timed_transform(df_raw, vectorized=False)
+            pd.testing.assert_frame_equal(vector_result, scalar_result)
+        results.append((n_rows, scalar_time, vector_time))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-scalar-above", type=int, default=None,
+                        help="lewati jalur skalar untuk jumlah baris di atas nilai ini")
+    args = parser.parse_args()
+
+    print(f"{'baris':>12}{'skalar (s)':>14}{'vektor (s)':>14}{'speedup':>10}")
+    for n_rows, scalar_time, vector_time in run(args.rows, args.skip_scalar_above):
+        scalar_text = f"{scalar_time:14.2f}" if scalar_time is not None else f"{'-':>14}"
+        speedup = f"{scalar_time / vector_time:9.1f}x" if scalar_time is not None else f"{'-':>10}"
+        print(f"{n_rows:>12,}{scalar_text}{vector_time:14.2f}{speedup}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Server HTTP lokal pengganti fashion-studio untuk benchmark: melayani halaman katalog
+sintetis (benchmarks.synthetic) di "/", "/page2", ... sampai total_pages, dan 404
+setelahnya. latency menambahkan jeda per respons untuk meniru round-trip jaringan.
+"""
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.synthetic import make_page_html
+
+_PAGE_PATH = re.compile(r'^/page(\d+)$')
+
+def _make_handler(total_pages, n_cards, seed, dirty_ratio, latency=0.0):
+    @lru_cache(maxsize=None)
+    def page_body(page_num):
+        return make_page_html(page_num, n_cards, total_pages, seed, dirty_ratio).encode('utf-8')
+
+    class CatalogueHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # keep-alive, seperti server aslinya
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            match = _PAGE_PATH.match(self.path)
+            page_num = 1 if self.path == "/" else int(match.group(1)) if match else None
+            if page_num is None or not 1 <= page_num <= total_pages:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = page_body(page_num)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return CatalogueHandler
+
+class _CatalogueServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Backlog listen default (5) membuat klien asyncio dengan ratusan koneksi bersamaan
+    # menunggu retransmisi SYN, sehingga waktu yang terukur bukan waktu server
+    request_queue_size = 1024
+
+@contextmanager
+def serve_catalogue(total_pages=50, n_cards=20, seed=0, dirty_ratio=0.1, latency=0.0):
+    """Menjalankan server di port acak selama blok with; menghasilkan base URL-nya (diakhiri "/")."""
+    server = _CatalogueServer(("127.0.0.1", 0), _make_handler(total_pages, n_cards, seed, dirty_ratio, latency))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/"
+    finally:
+        server.shutdown()
+        server.server_close()
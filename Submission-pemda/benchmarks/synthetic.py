@@ -0,0 +1,89 @@
+"""
+Generator HTML sintetis yang meniru struktur halaman katalog fashion-studio,
+termasuk baris kotor ("Unknown Product", "Price Unavailable", "Invalid Rating").
+"""
+import random
+
+import pandas as pd
+
+PRODUCT_TYPES = ["T-shirt", "Hoodie", "Pants", "Outerwear", "Jacket", "Shirt", "Crewneck"]
+SIZES = ["S", "M", "L", "XL", "XXL"]
+GENDERS = ["Men", "Women", "Unisex"]
+
+def make_card_html(index, rng, dirty_ratio=0.1):
+    title = f"{rng.choice(PRODUCT_TYPES)} {index}"
+    price_html = f'<div class="price-container"><span class="price">${rng.uniform(10, 500):.2f}</span></div>'
+    rating = f"⭐ {rng.uniform(1, 5):.1f} / 5"
+
+    if rng.random() < dirty_ratio:
+        dirty_kind = rng.randrange(3)
+        if dirty_kind == 0:
+            title = "Unknown Product"
+        elif dirty_kind == 1:
+            price_html = '<p class="price">Price Unavailable</p>'
+        else:
+            rating = "⭐ Invalid Rating / 5"
+
+    return f"""
+    <div class="collection-card">
+        <div style="position: relative;">
+            <img src="https://picsum.photos/280/350?random={index}" class="collection-image" alt="{title}">
+        </div>
+        <div class="product-details">
+            <h3 class="product-title">{title}</h3>
+            {price_html}
+            <p style="font-size: 14px; color: #777;">Rating: {rating}</p>
+            <p style="font-size: 14px; color: #777;">{rng.randint(1, 8)} Colors</p>
+            <p style="font-size: 14px; color: #777;">Size: {rng.choice(SIZES)}</p>
+            <p style="font-size: 14px; color: #777;">Gender: {rng.choice(GENDERS)}</p>
+        </div>
+    </div>"""
+
+def make_page_html(page_num, n_cards=20, total_pages=50, seed=0, dirty_ratio=0.1):
+    """HTML lengkap satu halaman katalog, deterministik untuk (page_num, seed) yang sama."""
+    rng = random.Random(seed * 1_000_003 + page_num)
+    first_index = (page_num - 1) * n_cards + 1
+    cards = "".join(make_card_html(first_index + i, rng, dirty_ratio) for i in range(n_cards))
+    if page_num < total_pages:
+        next_item = f'<li class="page-item next"><a class="page-link" href="/page{page_num + 1}">Next</a></li>'
+    else:
+        next_item = ""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>Fashion Studio</title></head>
+<body>
+    <div class="collection-grid" id="collectionList">{cards}
+    </div>
+    <ul class="pagination">
+        <li class="page-item current"><span class="page-link">Page {page_num} of {total_pages}</span></li>
+        {next_item}
+    </ul>
+</body>
+</html>"""
+
+
+def make_raw_products(n_rows, seed=0, dirty_ratio=0.1, timestamp="2024-05-25 10:00:00"):
+    """DataFrame mentah dengan kolom dan format yang sama seperti keluaran extract_data_from_website."""
+    rng = random.Random(seed)
+    rows = {"title": [], "price": [], "rating": [], "colors": [], "size": [], "gender": []}
+    for i in range(n_rows):
+        title = f"{rng.choice(PRODUCT_TYPES)} {rng.randint(1, n_rows)}"
+        price = f"${rng.uniform(10, 500):.2f}"
+        rating = f"Rating: ⭐ {rng.uniform(1, 5):.1f} / 5"
+        if rng.random() < dirty_ratio:
+            dirty_kind = rng.randrange(3)
+            if dirty_kind == 0:
+                title = "Unknown Product"
+            elif dirty_kind == 1:
+                price = "Price Unavailable"
+            else:
+                rating = "Rating: ⭐ Invalid Rating / 5"
+        rows["title"].append(title)
+        rows["price"].append(price)
+        rows["rating"].append(rating)
+        rows["colors"].append(f"{rng.randint(1, 8)} Colors")
+        rows["size"].append(f"Size: {rng.choice(SIZES)}")
+        rows["gender"].append(f"Gender: {rng.choice(GENDERS)}")
+    df = pd.DataFrame(rows)
+    df["timestamp"] = timestamp
+    return df
@@ -1,10 +1,64 @@
-from utils.extract import extract_data_from_website
-from utils.transform import transform_data
-from utils.load import load_to_csv
+import argparse
+import asyncio
+import os
+
+import pandas as pd
+
+from utils.extract import extract_data_from_website, extract_data_from_website_async, extract_sites, extract_sites_async, load_site_configs, site_source, iter_product_batches, enable_http_cache, enable_checkpoints, REQUEST_STATS, BASE_URL
+from utils.transform import transform_data, transform_batches, memory_report, SOURCE_COLUMN
+from utils.load import load_batches_to_csv, load_data
+from utils.metrics import PIPELINE_METRICS, write_metrics_json, write_metrics_prometheus
+from utils.cdc import compute_changes, changes_to_dataframe, commit_hash_index
+from utils.dag import Pipeline
+from utils.raw_cache import store_raw, load_raw
 
 # output CSV
 CSV_OUTPUT_FILENAME = "products.csv" # [cite: 16]
 
+# Jumlah halaman yang diambil bersamaan saat ekstraksi (1 = serial)
+EXTRACT_MAX_WORKERS = 4
+# Batas laju per host (request per detik) untuk BASE_URL, berlaku untuk semua worker
+# bersama-sama. Default utils.extract (2/detik, sama dengan jeda 0.5 detik versi serial)
+# membuat 4 worker tidak lebih cepat dari serial karena yang membatasi adalah limiter,
+# bukan latensi. 2/detik per worker menjaga kesopanan per koneksi seperti semula.
+EXTRACT_REQUESTS_PER_SECOND = 2.0 * EXTRACT_MAX_WORKERS
+# Mode asyncio (--async) dan multi-sumber: jumlah maksimal request yang berjalan bersamaan
+ASYNC_MAX_CONCURRENCY = 100
+# Mode multi-sumber: file JSON berisi daftar konfigurasi situs (lihat utils.extract.SiteConfig),
+# mis. [{"base_url": "https://fashion-studio.dicoding.dev/", "name": "fashion-studio"}].
+# Semua situs diambil bersamaan dan setiap baris diberi kolom source. None = hanya BASE_URL.
+SITES_FILE = None
+# Cache HTTP di disk agar run terjadwal hanya mengunduh halaman yang berubah
+HTTP_CACHE_DIR = ".http_cache"
+# Checkpoint per halaman: run yang terputus dilanjutkan dari halaman terakhir yang berhasil
+CHECKPOINT_DIR = ".extract_checkpoint"
+# Backend parsing HTML: "bs4", "lxml" atau "selectolax" (kembali ke "bs4" jika library tidak terpasang)
+PARSER_BACKEND = "lxml"
+# Jumlah proses parser HTML terpisah dari thread fetcher (0 = parse di thread fetcher).
+# Berguna untuk backend yang berat di CPU seperti "bs4" pada mesin multi-core.
+PARSE_PROCESSES = 0
+# Output tambahan selain CSV utama, format ditentukan dari ekstensi file
+# (mis. "products.parquet", "products.feather", "products.csv.zst").
+# File .db/.sqlite di-upsert: run berikutnya hanya menulis produk baru atau yang berubah.
+EXTRA_OUTPUT_FILES = []
+# Skema hemat memori hasil transform (size/gender category, timestamp datetime64,
+# price/rating float32 dan colors int8 jika aman); output file tetap bisa dibaca dengan skema biasa
+COMPACT_SCHEMA = False
+# Laporan metrik per tahap/halaman (JSON), dan opsional file teks untuk Prometheus
+METRICS_JSON_FILE = "metrics.json"
+METRICS_PROMETHEUS_FILE = None
+# Change-data-capture: hanya produk baru, berubah dan hilang sejak run sebelumnya
+# ditulis ke CDC_OUTPUT_FILE (None untuk menonaktifkan)
+CDC_INDEX_DIR = ".cdc_index"
+CDC_OUTPUT_FILE = "products_changes.csv"
+# Cache output tahap extract/transform untuk menjalankan ulang satu tahap (--stage)
+STAGE_CACHE_DIR = ".stage_cache"
+# Jumlah tahap (mis. sink) yang boleh berjalan bersamaan
+DAG_MAX_WORKERS = 4
+# Cache data mentah per (source, tanggal) untuk --replay tanpa scraping ulang (None untuk menonaktifkan)
+RAW_CACHE_DIR = ".raw_cache"
+RAW_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
 # (Opsional) Konfigurasi untuk Google Sheets atau PostgreSQL jika digunakan
 # GOOGLE_SHEET_NAME = "Nama Spreadsheet Anda"
 # GOOGLE_SHEETS_CREDENTIALS = "google-sheets-api.json" # [cite: 16]
@@ -17,57 +71,286 @@ CSV_OUTPUT_FILENAME = "products.csv" # [cite: 16]
 # "dbname": "your_database"
 # }
 # POSTGRES_TABLE_NAME = "products_fashion_studio"
+# Upsert inkremental ke PostgreSQL bisa memakai utils.load.upsert_to_database dengan
+# koneksi psycopg2, mis. upsert_to_database(df, conn, POSTGRES_TABLE_NAME, paramstyle="pyformat")
 
-def main_pipeline():
-    print("Memulai ETL Pipeline...")
+def _snapshot_date(raw_product_data):
+    """Tanggal snapshot (YYYY-MM-DD) dari kolom timestamp; run yang dilanjutkan memakai tanggal run aslinya."""
+    if 'timestamp' in raw_product_data.columns and not raw_product_data.empty:
+        return str(raw_product_data['timestamp'].iloc[0])[:10]
+    return None
 
-    # 1. Tahap Ekstraksi
-    print("\n--- Tahap Ekstraksi Dimulai ---")
-    raw_product_data = extract_data_from_website()
-    if raw_product_data is None or raw_product_data.empty:
-        print("Ekstraksi gagal atau tidak menghasilkan data. Pipeline dihentikan.")
-        return
-    print(f"Ekstraksi selesai. Jumlah data mentah: {len(raw_product_data)}")
-
-    # 2. Tahap Transformasi
-    print("\n--- Tahap Transformasi Dimulai ---")
-    transformed_product_data = transform_data(raw_product_data)
-    if transformed_product_data is None or transformed_product_data.empty:
-        print("Transformasi gagal atau tidak menghasilkan data bersih. Pipeline dihentikan.")
-        return
-    print(f"Transformasi selesai. Jumlah data bersih: {len(transformed_product_data)}")
-    print("Sample data setelah transformasi:")
-    print(transformed_product_data.head())
-
-    # 3. Tahap Load
-    print("\n--- Tahap Load Dimulai ---")
-    # Menyimpan ke CSV (Basic Requirement)
-    csv_success = load_to_csv(transformed_product_data, CSV_OUTPUT_FILENAME)
-    if csv_success:
-        print(f"Data berhasil dimuat ke {CSV_OUTPUT_FILENAME}")
+def _store_raw_snapshot(raw_product_data):
+    """Menyimpan data mentah ke RAW_CACHE_DIR; pada mode multi-sumber satu entri per situs."""
+    if SOURCE_COLUMN in raw_product_data.columns:
+        snapshots = [(source, group.reset_index(drop=True))
+                     for source, group in raw_product_data.groupby(SOURCE_COLUMN, sort=False)]
     else:
-        print(f"Gagal memuat data ke {CSV_OUTPUT_FILENAME}")
-
-    # (Opsional) Menyimpan ke Google Sheets (Skilled/Advanced Requirement)
-    # if csv_success: # Mungkin Anda hanya ingin load ke GSheets jika CSV berhasil
-    # print("\n--- Memuat ke Google Sheets ---")
-    # gsheets_success = load_to_google_sheets(transformed_product_data, GOOGLE_SHEET_NAME, GOOGLE_SHEETS_CREDENTIALS)
-    # if gsheets_success:
-    # print(f"Data berhasil dimuat ke Google Sheets: {GOOGLE_SHEET_NAME}")
-    # else:
-    # print(f"Gagal memuat data ke Google Sheets: {GOOGLE_SHEET_NAME}")
-
-    # (Opsional) Menyimpan ke PostgreSQL (Skilled/Advanced Requirement)
-    # if csv_success: # Mungkin Anda hanya ingin load ke DB jika CSV berhasil
-    # print("\n--- Memuat ke PostgreSQL ---")
-    # postgres_success = load_to_postgresql(transformed_product_data, POSTGRES_TABLE_NAME, DB_PARAMS)
-    # if postgres_success:
-    # print(f"Data berhasil dimuat ke PostgreSQL tabel: {POSTGRES_TABLE_NAME}")
-    # else:
-    # print(f"Gagal memuat data ke PostgreSQL tabel: {POSTGRES_TABLE_NAME}")
+        snapshots = [(BASE_URL, raw_product_data)]
+    for source, snapshot in snapshots:
+        store_raw(snapshot, source, _snapshot_date(snapshot), cache_dir=RAW_CACHE_DIR, max_bytes=RAW_CACHE_MAX_BYTES)
+
+def _load_raw_snapshot(date=None, sites=None):
+    """Kebalikan _store_raw_snapshot: data mentah BASE_URL, atau gabungan semua situs yang ada di cache."""
+    if not sites:
+        return load_raw(BASE_URL, date, cache_dir=RAW_CACHE_DIR)
+    frames = [load_raw(site_source(site), date, cache_dir=RAW_CACHE_DIR) for site in sites]
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+def build_pipeline(extra_outputs=None, parse_processes=None, cache_dir=STAGE_CACHE_DIR, replay=None, compact=None,
+                   use_async=False, sites=None):
+    """
+    Deklarasi DAG pipeline: extract -> transform -> sink. Semua sink hanya bergantung
+    pada transform sehingga berjalan bersamaan; menambah sink tidak menambah seluruh
+    latensinya ke total waktu run.
+
+    replay: tanggal (YYYY-MM-DD) atau "latest" untuk memakai data mentah dari RAW_CACHE_DIR
+    sebagai pengganti scraping. compact: pakai skema hemat memori (default COMPACT_SCHEMA).
+    use_async: tahap extract memakai extract_data_from_website_async (coroutine), cocok
+    dengan Pipeline.run_async. sites: list SiteConfig untuk mode multi-sumber (default
+    dari SITES_FILE).
+    """
+    if sites is None and SITES_FILE:
+        sites = load_site_configs(SITES_FILE)
+    compact = COMPACT_SCHEMA if compact is None else compact
+    pipeline = Pipeline(cache_dir=cache_dir, max_workers=DAG_MAX_WORKERS, metrics=PIPELINE_METRICS)
 
+    def finish_extract(raw_product_data):
+        if raw_product_data is None or raw_product_data.empty:
+            print("Ekstraksi gagal atau tidak menghasilkan data. Pipeline dihentikan.")
+            return None
+        print(f"Ekstraksi selesai. Jumlah data mentah: {len(raw_product_data)}")
+        if RAW_CACHE_DIR:
+            _store_raw_snapshot(raw_product_data)
+        return raw_product_data
+
+    def extract():
+        if sites:
+            return finish_extract(extract_sites(sites, max_concurrency=ASYNC_MAX_CONCURRENCY, parser_backend=PARSER_BACKEND))
+        enable_http_cache(HTTP_CACHE_DIR)
+        enable_checkpoints(CHECKPOINT_DIR)
+        raw_product_data = extract_data_from_website(
+            max_workers=EXTRACT_MAX_WORKERS,
+            requests_per_second=EXTRACT_REQUESTS_PER_SECOND,
+            parser_backend=PARSER_BACKEND,
+            parse_processes=PARSE_PROCESSES if parse_processes is None else parse_processes,
+        )
+        return finish_extract(raw_product_data)
+
+    async def extract_async():
+        if sites:
+            raw_product_data = await extract_sites_async(sites, max_concurrency=ASYNC_MAX_CONCURRENCY,
+                                                         parser_backend=PARSER_BACKEND)
+        else:
+            # Cache HTTP tidak dipakai di mode asyncio, checkpoint per halaman tetap berlaku
+            enable_checkpoints(CHECKPOINT_DIR)
+            raw_product_data = await extract_data_from_website_async(
+                max_concurrency=ASYNC_MAX_CONCURRENCY,
+                requests_per_second=EXTRACT_REQUESTS_PER_SECOND,
+                parser_backend=PARSER_BACKEND,
+            )
+        return await asyncio.get_running_loop().run_in_executor(None, finish_extract, raw_product_data)
+
+    def replay_extract():
+        raw_product_data = _load_raw_snapshot(None if replay == "latest" else replay, sites)
+        if raw_product_data is None:
+            print("Replay gagal: data mentah tidak ada di cache. Pipeline dihentikan.")
+        return raw_product_data
+
+    def transform(raw_product_data):
+        transformed_product_data = transform_data(raw_product_data, compact=compact)
+        if transformed_product_data is None or transformed_product_data.empty:
+            print("Transformasi gagal atau tidak menghasilkan data bersih. Pipeline dihentikan.")
+            return None
+        print(f"Transformasi selesai. Jumlah data bersih: {len(transformed_product_data)}")
+        report = memory_report(transformed_product_data)
+        print(f"Memori data bersih: {report['bytes_per_row']:.1f} byte/baris ({report['bytes'] / 1024 ** 2:.2f} MB)")
+        print("Sample data setelah transformasi:")
+        print(transformed_product_data.head())
+        return transformed_product_data
+
+    def load_sink(output_path):
+        def load(transformed_product_data):
+            # CSV utama (Basic Requirement) atau format tambahan (Parquet/Feather/CSV terkompresi/SQLite)
+            if load_data(transformed_product_data, output_path):
+                print(f"Data berhasil dimuat ke {output_path}")
+                return True
+            print(f"Gagal memuat data ke {output_path}")
+            return False
+        return load
+
+    # Output extract dan transform disimpan di cache agar tahap berikutnya bisa dijalankan ulang sendiri
+    if replay:
+        pipeline.add_stage("extract", replay_extract, cache=True)
+    else:
+        pipeline.add_stage("extract", extract_async if use_async else extract, cache=True)
+    pipeline.add_stage("transform", transform, deps=["extract"], cache=True)
+    pipeline.add_stage("load_csv", load_sink(CSV_OUTPUT_FILENAME), deps=["transform"])
+    for output_path in (EXTRA_OUTPUT_FILES if extra_outputs is None else extra_outputs):
+        pipeline.add_stage(f"load:{output_path}", load_sink(output_path), deps=["transform"])
+    # Tahap CDC: hanya perubahan sejak run sebelumnya. Tidak ikut saat replay agar snapshot
+    # lama tidak tercatat sebagai perubahan terbaru di hash index.
+    if CDC_OUTPUT_FILE and not replay:
+        pipeline.add_stage("cdc", capture_changes, deps=["transform"])
 
+    # (Opsional) Sink Google Sheets / PostgreSQL (Skilled/Advanced Requirement) cukup
+    # didaftarkan sebagai tahap baru yang bergantung pada transform, mis.:
+    # def load_gsheets(transformed_product_data):
+    #     return load_to_google_sheets(transformed_product_data, GOOGLE_SHEET_NAME, GOOGLE_SHEETS_CREDENTIALS)
+    # pipeline.add_stage("load_gsheets", load_gsheets, deps=["transform"])
+    #
+    # def load_postgres(transformed_product_data):
+    #     return load_to_postgresql(transformed_product_data, POSTGRES_TABLE_NAME, DB_PARAMS)
+    # pipeline.add_stage("load_postgres", load_postgres, deps=["transform"])
+    # Jika sink hanya boleh jalan setelah CSV berhasil, pakai deps=["transform", "load_csv"]
+    # dan terima dua argumen (output transform, hasil load_csv).
+    return pipeline
+
+def main_pipeline(extra_outputs=None, parse_processes=None, stage=None, replay=None, compact=None, use_async=False,
+                  sites=None):
+    """Menjalankan seluruh DAG pipeline, atau hanya satu tahap (stage) dengan input dari cache."""
+    PIPELINE_METRICS.reset()
+    pipeline = build_pipeline(extra_outputs=extra_outputs, parse_processes=parse_processes, replay=replay, compact=compact,
+                              use_async=use_async, sites=sites)
+    if stage:
+        if stage not in pipeline.stages:
+            print(f"Tahap tidak dikenal: {stage}. Pilihan: {', '.join(pipeline.stages)}")
+            return None
+        print(f"Menjalankan tahap {stage} saja...")
+        result = pipeline.run_stage(stage)
+        print(f"\nTahap {stage} {'selesai' if result is not None else 'gagal'}.")
+        return result
+    print("Memulai ETL Pipeline...")
+    results = pipeline.run()
+    print("\nETL Pipeline Selesai.")
+    return results
+
+async def main_pipeline_async(extra_outputs=None, replay=None, compact=None, sites=None):
+    """
+    Versi asyncio dari main_pipeline untuk disematkan di layanan berbasis asyncio: extract
+    berjalan di event loop pemanggil (aiohttp), transform dan sink di executor.
+    """
+    PIPELINE_METRICS.reset()
+    pipeline = build_pipeline(extra_outputs=extra_outputs, replay=replay, compact=compact, use_async=True, sites=sites)
+    print("Memulai ETL Pipeline (asyncio)...")
+    results = await pipeline.run_async()
     print("\nETL Pipeline Selesai.")
+    return results
+
+def capture_changes(transformed_product_data, output_path=None, index_dir=CDC_INDEX_DIR):
+    """
+    Menulis insert/update/delete dibandingkan run sebelumnya ke output_path, lalu
+    memperbarui hash index. Mengembalikan jumlah baris perubahan yang ditulis (0 jika tidak
+    ada perubahan), atau None jika gagal agar DAG menandai tahap ini gagal.
+    """
+    output_path = output_path or CDC_OUTPUT_FILE
+    try:
+        changes = compute_changes(transformed_product_data, index_dir)
+    except Exception as e:
+        print(f"Gagal menghitung perubahan dari hash index {index_dir}: {e}")
+        return None
+    print(f"Perubahan: {len(changes.inserts)} baru, {len(changes.updates)} berubah, {len(changes.deletes)} dihapus.")
+    change_df = changes_to_dataframe(changes)
+    if change_df.empty:
+        # File perubahan dari run sebelumnya sudah diproses, jangan sampai diproses ulang
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        print("Tidak ada perubahan sejak run sebelumnya.")
+        return 0
+    if not load_data(change_df, output_path):
+        print(f"Gagal menulis perubahan ke {output_path}, hash index tidak diperbarui.")
+        return None
+    if not commit_hash_index(transformed_product_data, index_dir):
+        return None
+    return len(change_df)
+
+def streaming_pipeline(parse_processes=None, compact=None):
+    """
+    Mode streaming: setiap halaman diekstrak, ditransformasi, lalu langsung ditambahkan
+    ke CSV, sehingga memori tetap datar berapa pun jumlah halamannya.
+    """
+    print("Memulai ETL Pipeline (mode streaming)...")
+    PIPELINE_METRICS.reset()
+    enable_http_cache(HTTP_CACHE_DIR)
+    enable_checkpoints(CHECKPOINT_DIR)
+
+    # Tahap-tahap berjalan bergantian per halaman, jadi diukur sebagai satu tahap
+    with PIPELINE_METRICS.stage("streaming") as stage:
+        raw_batches = iter_product_batches(
+            max_workers=EXTRACT_MAX_WORKERS,
+            requests_per_second=EXTRACT_REQUESTS_PER_SECOND,
+            parser_backend=PARSER_BACKEND,
+            parse_processes=PARSE_PROCESSES if parse_processes is None else parse_processes,
+        )
+        clean_batches = transform_batches(raw_batches, compact=COMPACT_SCHEMA if compact is None else compact)
+        rows_written = load_batches_to_csv(clean_batches, CSV_OUTPUT_FILENAME)
+        stage.rows = rows_written
+    if rows_written:
+        print(f"Data berhasil dimuat ke {CSV_OUTPUT_FILENAME} ({rows_written} baris)")
+    else:
+        print(f"Gagal memuat data ke {CSV_OUTPUT_FILENAME} atau tidak ada data bersih.")
+
+    print("\nETL Pipeline Selesai.")
+
+def write_pipeline_metrics(json_path=METRICS_JSON_FILE, prometheus_path=METRICS_PROMETHEUS_FILE):
+    """Menulis laporan metrik run terakhir (per tahap, per halaman, request HTTP)."""
+    report = PIPELINE_METRICS.report(REQUEST_STATS.snapshot())
+    for stage in report["stages"]:
+        rate = f", {stage['rows_per_second']:.0f} baris/detik" if stage["rows_per_second"] else ""
+        print(f"Tahap {stage['stage']}: {stage['seconds']:.2f} detik{rate}")
+    if json_path:
+        write_metrics_json(report, json_path)
+    if prometheus_path:
+        write_metrics_prometheus(report, prometheus_path)
+    return report
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ETL Pipeline produk fashion-studio")
+    parser.add_argument("--streaming", action="store_true",
+                        help="proses data per halaman (extract -> transform -> load) dengan memori terbatas")
+    parser.add_argument("--output", action="append", default=None, metavar="PATH",
+                        help="output tambahan selain CSV utama, format dari ekstensi (.parquet, .feather, .csv.gz, .csv.zst, .db); bisa diulang, hanya mode non-streaming")
+    parser.add_argument("--parse-processes", type=int, default=None, metavar="N",
+                        help="jumlah proses parser HTML terpisah dari fetcher (0 = parse di thread fetcher)")
+    parser.add_argument("--stage", default=None, metavar="NAME",
+                        help="jalankan satu tahap saja dengan input dari cache run sebelumnya (extract, transform, load_csv, load:PATH, cdc)")
+    parser.add_argument("--replay", nargs="?", const="latest", default=None, metavar="DATE",
+                        help="jalankan transform dan load dari data mentah di cache (tanggal YYYY-MM-DD, default terbaru) tanpa scraping")
+    parser.add_argument("--list-stages", action="store_true",
+                        help="tampilkan tahap-tahap pipeline beserta dependensinya lalu keluar")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="ekstraksi dengan asyncio/aiohttp (banyak request bersamaan), transform dan load di executor")
+    parser.add_argument("--sites", default=SITES_FILE, metavar="PATH",
+                        help="file JSON daftar situs katalog yang diambil bersamaan (mode multi-sumber, hanya mode non-streaming)")
+    parser.add_argument("--compact", action="store_true", default=None,
+                        help="pakai skema hemat memori (category/datetime64/float32) untuk hasil transform")
+    parser.add_argument("--metrics-json", default=METRICS_JSON_FILE, metavar="PATH",
+                        help="file laporan metrik JSON (kosongkan untuk menonaktifkan)")
+    parser.add_argument("--prometheus-file", default=METRICS_PROMETHEUS_FILE, metavar="PATH",
+                        help="file teks metrik format Prometheus (textfile collector)")
+    return parser.parse_args(argv)
 
 if __name__ == '__main__':
-    main_pipeline()
\ No newline at end of file
+    args = parse_args()
+    if args.list_stages:
+        pipeline = build_pipeline(extra_outputs=args.output)
+        for name in pipeline.topological_order():
+            deps = pipeline.stages[name].deps
+            print(f"{name}" + (f" <- {', '.join(deps)}" if deps else ""))
+        raise SystemExit(0)
+    sites = None
+    if args.sites:
+        sites = load_site_configs(args.sites)
+        if sites is None:
+            raise SystemExit(1)
+    if args.streaming:
+        streaming_pipeline(parse_processes=args.parse_processes, compact=args.compact)
+    elif args.use_async and not args.stage:
+        asyncio.run(main_pipeline_async(extra_outputs=args.output, replay=args.replay, compact=args.compact, sites=sites))
+    else:
+        main_pipeline(extra_outputs=args.output, parse_processes=args.parse_processes,
+                      stage=args.stage, replay=args.replay, compact=args.compact, use_async=args.use_async, sites=sites)
+    write_pipeline_metrics(args.metrics_json, args.prometheus_file)
\ No newline at end of file
@@ -0,0 +1,166 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cdc import (
+    CHANGE_COLUMN,
+    INDEX_DTYPE,
+    INDEX_FILENAME,
+    changes_to_dataframe,
+    commit_hash_index,
+    compute_changes,
+    load_hash_index,
+)
+from utils.transform import OUTPUT_DTYPES, to_compact_schema
+
+@pytest.fixture
+def snapshot_df():
+    """Snapshot produk bersih seperti keluaran transform_data."""
+    data = {
+        'title': ["T-shirt Keren", "Jaket Bagus", "Celana Panjang", "Topi"],
+        'price': [400000.0, 815840.0, 250000.0, 100000.0],
+        'rating': [4.5, 4.0, 3.0, 4.8],
+        'colors': [3, 5, 1, 2],
+        'size': ["L", "XL", "S", "M"],
+        'gender': ["Men", "Women", "Men", "Unisex"],
+        'timestamp': ["2024-05-25 10:00:00"] * 4
+    }
+    return pd.DataFrame(data).astype(OUTPUT_DTYPES)
+
+def _sizes(changes):
+    return len(changes.inserts), len(changes.updates), len(changes.deletes)
+
+def test_compact_schema_matches_standard_index(snapshot_df, tmp_path):
+    index_dir = str(tmp_path / "cdc")
+    commit_hash_index(snapshot_df, index_dir)
+    compact_df = to_compact_schema(snapshot_df.iloc[1:])
+    assert _sizes(compute_changes(compact_df, index_dir)) == (0, 0, 1)
+
+    commit_hash_index(compact_df, index_dir)
+    changes = compute_changes(snapshot_df.iloc[2:], index_dir)
+    # Baris yang dihapus dibaca kembali dari rows.jsonl dengan timestamp sebagai teks
+    assert changes.deletes['timestamp'].tolist() == ["2024-05-25 10:00:00"]
+
+def test_first_run_everything_is_insert(snapshot_df, tmp_path):
+    changes = compute_changes(snapshot_df, str(tmp_path / "cdc"))
+    assert _sizes(changes) == (4, 0, 0)
+    pd.testing.assert_frame_equal(changes.inserts, snapshot_df)
+
+def test_unchanged_rerun_has_no_changes(snapshot_df, tmp_path):
+    index_dir = str(tmp_path / "cdc")
+    assert commit_hash_index(snapshot_df, index_dir) is True
+
+    # Timestamp baru dan urutan baris berbeda bukan perubahan
+    rerun_df = snapshot_df.iloc[::-1].assign(timestamp="2024-05-26 10:00:00")
+    assert _sizes(compute_changes(rerun_df, index_dir)) == (0, 0, 0)
+
+def test_detects_insert_update_and_delete(snapshot_df, tmp_path):
+    index_dir = str(tmp_path / "cdc")
+    commit_hash_index(snapshot_df, index_dir)
+
+    next_df = snapshot_df[snapshot_df['title'] != "Celana Panjang"].copy()
+    next_df.loc[next_df['title'] == "Jaket Bagus", 'price'] = 900000.0
+    new_row = pd.DataFrame([{
+        'title': "Sepatu", 'price': 700000.0, 'rating': 4.1, 'colors': 1,
+        'size': "M", 'gender': "Men", 'timestamp': "2024-05-26 10:00:00"
+    }]).astype(OUTPUT_DTYPES)
+    next_df = pd.concat([next_df, new_row], ignore_index=True)
+
+    changes = compute_changes(next_df, index_dir)
+
+    assert changes.inserts['title'].tolist() == ["Sepatu"]
+    assert changes.updates['title'].tolist() == ["Jaket Bagus"]
+    assert changes.updates['price'].tolist() == [900000.0]
+    # Delete membawa baris lengkap dari run sebelumnya dengan tipe data yang sama
+    expected_delete = snapshot_df[snapshot_df['title'] == "Celana Panjang"].reset_index(drop=True)
+    pd.testing.assert_frame_equal(changes.deletes, expected_delete)
+
+def test_changes_to_dataframe_labels_rows(snapshot_df, tmp_path):
+    index_dir = str(tmp_path / "cdc")
+    commit_hash_index(snapshot_df.iloc[:2], index_dir)
+    next_df = snapshot_df.iloc[1:3].copy()
+    next_df.loc[1, 'rating'] = 1.0
+
+    change_df = changes_to_dataframe(compute_changes(next_df, index_dir))
+
+    assert list(change_df.columns) == [CHANGE_COLUMN] + list(OUTPUT_DTYPES)
+    assert change_df[[CHANGE_COLUMN, 'title']].values.tolist() == [
+        ["insert", "Celana Panjang"], ["update", "Jaket Bagus"], ["delete", "T-shirt Keren"]
+    ]
+
+def test_changes_to_dataframe_empty(snapshot_df, tmp_path):
+    index_dir = str(tmp_path / "cdc")
+    commit_hash_index(snapshot_df, index_dir)
+    assert changes_to_dataframe(compute_changes(snapshot_df, index_dir)).empty
+
+def test_hash_index_is_sorted_memory_mapped_array(snapshot_df, tmp_path):
+    index_dir = str(tmp_path / "cdc")
+    commit_hash_index(snapshot_df, index_dir)
+
+    index = load_hash_index(index_dir)
+    assert isinstance(index, np.memmap)
+    assert index.dtype == INDEX_DTYPE
+    assert len(index) == len(snapshot_df)
+    assert np.all(index['key'][:-1] <= index['key'][1:])
+
+def test_commit_appends_only_changed_rows_until_compaction(snapshot_df, tmp_path):
+    index_dir = tmp_path / "cdc"
+    commit_hash_index(snapshot_df, str(index_dir))
+    rows_size = (index_dir / "rows.jsonl").stat().st_size
+
+    changed_df = snapshot_df.copy()
+    changed_df.loc[0, 'price'] = 1.0
+    commit_hash_index(changed_df, str(index_dir))
+
+    meta = json.loads((index_dir / "meta.json").read_text())
+    assert meta == {'rows_written': 5, 'products': 4}
+    assert (index_dir / "rows.jsonl").stat().st_size > rows_size
+    # Baris lama yang sudah usang tidak lagi dibaca
+    assert _sizes(compute_changes(changed_df, str(index_dir))) == (0, 0, 0)
+
+    # Setelah cukup banyak baris usang, rows.jsonl ditulis ulang hanya berisi produk aktif
+    for price in [2.0, 3.0, 4.0, 5.0]:
+        changed_df['price'] = price
+        commit_hash_index(changed_df, str(index_dir))
+    meta = json.loads((index_dir / "meta.json").read_text())
+    assert meta['rows_written'] <= 2 * len(changed_df)
+    assert _sizes(compute_changes(changed_df, str(index_dir))) == (0, 0, 0)
+    assert compute_changes(changed_df.iloc[:1], str(index_dir)).deletes['price'].tolist() == [5.0, 5.0, 5.0]
+
+def test_duplicate_keys_keep_last(snapshot_df, tmp_path):
+    duplicated = pd.concat([snapshot_df, snapshot_df.iloc[[0]].assign(price=1.0)], ignore_index=True)
+    changes = compute_changes(duplicated, str(tmp_path / "cdc"))
+    assert len(changes.inserts) == 4
+    assert changes.inserts.loc[changes.inserts['title'] == "T-shirt Keren", 'price'].item() == 1.0
+
+def test_source_column_is_part_of_product_key(snapshot_df, tmp_path):
+    index_dir = str(tmp_path / "cdc")
+    multi = pd.concat([snapshot_df.assign(source="toko-a"), snapshot_df.assign(source="toko-b")], ignore_index=True)
+    assert _sizes(compute_changes(multi, index_dir)) == (8, 0, 0)
+    commit_hash_index(multi, index_dir)
+
+    changes = compute_changes(multi[multi['source'] == "toko-a"], index_dir)
+    assert _sizes(changes) == (0, 0, 4)
+    assert changes.deletes['source'].eq("toko-b").all()
+
+def test_capture_changes_reports_failure_to_dag(snapshot_df, tmp_path):
+    from main import capture_changes
+    from utils.dag import _is_failure
+
+    index_dir = str(tmp_path / "cdc")
+    output_path = str(tmp_path / "changes.csv")
+    # Format output tidak dikenali: gagal, hash index tidak diperbarui
+    assert capture_changes(snapshot_df, str(tmp_path / "changes.xyz"), index_dir) is None
+    assert _is_failure(None)
+    assert capture_changes(snapshot_df, output_path, index_dir) == 4
+    # Tidak ada perubahan tetap berhasil, bukan kegagalan
+    result = capture_changes(snapshot_df, output_path, index_dir)
+    assert result == 0 and not _is_failure(result)
+    # Hash index tidak bisa dibaca
+    np.save(tmp_path / "cdc" / INDEX_FILENAME, np.zeros(3))
+    assert capture_changes(snapshot_df, output_path, index_dir) is None
+    # Hash index tidak bisa disimpan
+    (tmp_path / "bukan_direktori").write_text("")
+    assert capture_changes(snapshot_df, output_path, str(tmp_path / "bukan_direktori")) is None
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from utils.dag import Pipeline
+from utils.metrics import PipelineMetrics
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({'title': ["T-shirt Keren", "Jaket Bagus"], 'price': [400000.0, 815840.0]})
+
+def test_stages_receive_dependency_outputs(sample_df, tmp_path):
+    pipeline = Pipeline(cache_dir=str(tmp_path))
+    pipeline.add_stage("extract", lambda: sample_df)
+    pipeline.add_stage("transform", lambda df: df.assign(price=df['price'] * 2), deps=["extract"])
+    pipeline.add_stage("count", lambda raw, clean: len(raw) + len(clean), deps=["extract", "transform"])
+
+    results = pipeline.run()
+
+    assert results["transform"]['price'].tolist() == [800000.0, 1631680.0]
+    assert results["count"] == 4
+    assert pipeline.topological_order() == ["extract", "transform", "count"]
+
+def test_independent_sinks_run_concurrently(sample_df, tmp_path):
+    def slow_sink(df):
+        time.sleep(0.3)
+        return True
+
+    pipeline = Pipeline(cache_dir=str(tmp_path), max_workers=3)
+    pipeline.add_stage("transform", lambda: sample_df)
+    for name in ["load_a", "load_b", "load_c"]:
+        pipeline.add_stage(name, slow_sink, deps=["transform"])
+
+    start = time.perf_counter()
+    results = pipeline.run()
+    elapsed = time.perf_counter() - start
+
+    assert all(results[name] is True for name in ["load_a", "load_b", "load_c"])
+    # Tiga sink masing-masing 0.3 detik: serial butuh >= 0.9 detik
+    assert elapsed < 0.75
+
+def test_failed_stage_skips_dependents_only(sample_df, tmp_path):
+    calls = []
+
+    def failing(df):
+        raise RuntimeError("Simulated sink failure")
+
+    pipeline = Pipeline(cache_dir=str(tmp_path))
+    pipeline.add_stage("transform", lambda: sample_df)
+    pipeline.add_stage("load_db", failing, deps=["transform"])
+    pipeline.add_stage("after_db", lambda ok: calls.append("after_db"), deps=["load_db"])
+    pipeline.add_stage("load_csv", lambda df: calls.append("load_csv") or True, deps=["transform"])
+
+    results = pipeline.run()
+
+    assert results["load_db"] is None
+    assert "after_db" not in results
+    assert results["load_csv"] is True
+    assert calls == ["load_csv"]
+
+def test_empty_dataframe_stops_pipeline(tmp_path):
+    pipeline = Pipeline(cache_dir=str(tmp_path))
+    pipeline.add_stage("extract", lambda: pd.DataFrame())
+    pipeline.add_stage("transform", lambda df: df, deps=["extract"])
+    results = pipeline.run()
+    assert results == {"extract": None}
+
+def test_run_stage_uses_cached_inputs(sample_df, tmp_path):
+    extract_calls = []
+
+    def extract():
+        extract_calls.append(1)
+        return sample_df
+
+    def build():
+        pipeline = Pipeline(cache_dir=str(tmp_path))
+        pipeline.add_stage("extract", extract, cache=True)
+        pipeline.add_stage("transform", lambda df: df.assign(price=df['price'] + 1), deps=["extract"], cache=True)
+        return pipeline
+
+    build().run()
+    result = build().run_stage("transform")
+
+    assert len(extract_calls) == 1, "Tahap extract tidak boleh dijalankan ulang"
+    assert result['price'].tolist() == [400001.0, 815841.0]
+    pd.testing.assert_frame_equal(build().load_cached("transform"), result)
+
+def test_run_stage_without_cache(tmp_path):
+    pipeline = Pipeline(cache_dir=str(tmp_path))
+    pipeline.add_stage("extract", lambda: pd.DataFrame({'a': [1]}), cache=True)
+    pipeline.add_stage("transform", lambda df: df, deps=["extract"])
+    assert pipeline.run_stage("transform") is None
+    with pytest.raises(ValueError):
+        pipeline.run_stage("tidak_ada")
+
+@pytest.mark.parametrize("stages", [
+    [("a", ["b"]), ("b", ["a"])],
+    [("a", ["tidak_ada"])],
+])
+def test_invalid_dependencies_raise(stages, tmp_path):
+    pipeline = Pipeline(cache_dir=str(tmp_path))
+    for name, deps in stages:
+        pipeline.add_stage(name, lambda *inputs: True, deps=deps)
+    with pytest.raises(ValueError):
+        pipeline.run()
+
+def test_stage_metrics_recorded(sample_df, tmp_path):
+    metrics = PipelineMetrics()
+    pipeline = Pipeline(cache_dir=str(tmp_path), metrics=metrics)
+    pipeline.add_stage("transform", lambda: sample_df)
+    pipeline.add_stage("load_csv", lambda df: True, deps=["transform"])
+    pipeline.run()
+
+    rows = {stage["stage"]: stage["rows"] for stage in metrics.report()["stages"]}
+    assert rows == {"transform": 2, "load_csv": 2}
+
+def test_run_async_awaits_coroutines_and_offloads_sync_stages(sample_df, tmp_path):
+    loop_thread = threading.get_ident()
+    threads = {}
+
+    async def extract():
+        await asyncio.sleep(0)
+        threads['extract'] = threading.get_ident()
+        return sample_df
+
+    def transform(df):
+        threads['transform'] = threading.get_ident()
+        return df
+
+    pipeline = Pipeline(cache_dir=str(tmp_path))
+    pipeline.add_stage("extract", extract, cache=True)
+    pipeline.add_stage("transform", transform, deps=["extract"])
+    pipeline.add_stage("load_csv", lambda df: False, deps=["transform"])
+    pipeline.add_stage("cdc", lambda df: True, deps=["load_csv"])
+
+    results = asyncio.run(pipeline.run_async())
+
+    assert threads['extract'] == loop_thread
+    assert threads['transform'] != loop_thread
+    assert results['transform'] is sample_df
+    assert results['load_csv'] is None and "cdc" not in results
+    pd.testing.assert_frame_equal(pipeline.load_cached("extract"), sample_df)
+
+def test_run_executes_coroutine_stages(sample_df, tmp_path):
+    async def extract():
+        return sample_df
+
+    pipeline = Pipeline(cache_dir=str(tmp_path))
+    pipeline.add_stage("extract", extract)
+    pipeline.add_stage("count", len, deps=["extract"])
+    assert pipeline.run()["count"] == 2
@@ -1,3 +1,9 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 import pandas as pd
 from bs4 import BeautifulSoup
@@ -5,48 +11,113 @@ from datetime import datetime
 from unittest.mock import patch, MagicMock, ANY
 import requests
 
-from utils.extract import scrape_page, extract_product_details, extract_data_from_website
+from utils.extract import (
+    scrape_page,
+    extract_product_details,
+    extract_data_from_website,
+    HostRateLimiter,
+    REQUEST_STATS,
+    create_session,
+    get_session,
+    fetch_page,
+    HttpCache,
+    enable_http_cache,
+    disable_http_cache,
+    iter_product_batches,
+    PageCheckpoint,
+    PageResult,
+    enable_checkpoints,
+    disable_checkpoints,
+    AsyncTokenBucket,
+    extract_data_from_website_async,
+    fetch_page_async,
+    SiteConfig,
+    extract_sites_async,
+    load_site_configs,
+    site_page_url,
+)
+from utils.metrics import PIPELINE_METRICS
+from benchmarks.server import serve_catalogue
+from benchmarks.synthetic import make_page_html, PRODUCT_TYPES
 
 # --- Tes untuk scrape_page ---
 
-@patch('utils.extract.requests.get')
-def test_scrape_page_success(mock_get):
+@patch('utils.extract.get_session')
+def test_scrape_page_success(mock_get_session):
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.content = "<html><body><h1>Test Page</h1></body></html>"
     mock_response.raise_for_status = MagicMock()
+    mock_get = mock_get_session.return_value.get
     mock_get.return_value = mock_response
 
     soup = scrape_page("http://example.com/success")
     
     assert soup is not None
     assert soup.find('h1').text == "Test Page"
-    mock_get.assert_called_once_with("http://example.com/success", headers=ANY, timeout=ANY)
+    mock_get.assert_called_once_with("http://example.com/success", timeout=ANY)
 
-@patch('utils.extract.requests.get')
-def test_scrape_page_request_exception(mock_get): # Ganti nama agar lebih jelas dari test_scrape_page_failure
+@patch('utils.extract.get_session')
+def test_scrape_page_request_exception(mock_get_session): # Ganti nama agar lebih jelas dari test_scrape_page_failure
+    mock_get = mock_get_session.return_value.get
     mock_get.side_effect = requests.exceptions.RequestException("Simulated Network Error")
     soup = scrape_page("http://example.com/network_error")
     assert soup is None
-    mock_get.assert_called_once_with("http://example.com/network_error", headers=ANY, timeout=ANY)
+    mock_get.assert_called_once_with("http://example.com/network_error", timeout=ANY)
 
-@patch('utils.extract.requests.get')
-def test_scrape_page_timeout(mock_get):
+@patch('utils.extract.get_session')
+def test_scrape_page_timeout(mock_get_session):
+    mock_get = mock_get_session.return_value.get
     mock_get.side_effect = requests.exceptions.Timeout("Simulated Timeout")
     soup = scrape_page("http://example.com/timeout_error")
     assert soup is None
-    mock_get.assert_called_once_with("http://example.com/timeout_error", headers=ANY, timeout=ANY)
+    mock_get.assert_called_once_with("http://example.com/timeout_error", timeout=ANY)
 
-@patch('utils.extract.requests.get')
-def test_scrape_page_http_error(mock_get):
+@patch('utils.extract.get_session')
+def test_scrape_page_http_error(mock_get_session):
     mock_response = MagicMock()
     # Simulasikan raise_for_status() yang memunculkan HTTPError
     mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("Simulated HTTP Error 404")
+    mock_get = mock_get_session.return_value.get
     mock_get.return_value = mock_response
     
     soup = scrape_page("http://example.com/http_404_error")
     assert soup is None
-    mock_get.assert_called_once_with("http://example.com/http_404_error", headers=ANY, timeout=ANY)
+    mock_get.assert_called_once_with("http://example.com/http_404_error", timeout=ANY)
+
+@patch('utils.extract.get_session')
+def test_scrape_page_records_latency_and_bytes(mock_get_session):
+    mock_response = MagicMock()
+    mock_response.content = b"<html><body><h1>Stats</h1></body></html>"
+    mock_response.raw.tell.return_value = 25 # byte terkompresi yang ditransfer
+    mock_get_session.return_value.get.return_value = mock_response
+
+    REQUEST_STATS.reset()
+    scrape_page("http://example.com/stats")
+    mock_get_session.return_value.get.side_effect = requests.exceptions.RequestException("boom")
+    scrape_page("http://example.com/stats_fail")
+
+    stats = REQUEST_STATS.snapshot()
+    assert stats['requests'] == 2
+    assert stats['failures'] == 1
+    assert stats['bytes_downloaded'] == 25
+    assert stats['total_latency'] >= 0
+    assert stats['latency_histogram']['count'] == 2
+
+def test_create_session_configures_pool_and_retries():
+    session = create_session(pool_size=7, max_retries=4, backoff_factor=0.2)
+    adapter = session.get_adapter("https://fashion-studio.dicoding.dev/")
+
+    assert adapter._pool_maxsize == 7
+    assert adapter.max_retries.total == 4
+    assert adapter.max_retries.backoff_factor == 0.2
+    assert 503 in adapter.max_retries.status_forcelist
+    assert "gzip" in session.headers['Accept-Encoding']
+    assert session.headers['Connection'] == "keep-alive"
+    session.close()
+
+def test_get_session_is_shared():
+    assert get_session() is get_session()
 
 # --- Tes untuk extract_product_details ---
 
@@ -172,7 +243,8 @@ def test_extract_data_from_website_all_pages_fail_to_scrape(mock_scrape_page):
         df = extract_data_from_website()
 
     assert df.empty
-    assert mock_scrape_page.call_count == 3
+    # 3 halaman di putaran utama + 3 di putaran ulang halaman yang gagal
+    assert mock_scrape_page.call_count == 6
 
 @patch('utils.extract.scrape_page')
 def test_extract_data_from_website_no_product_cards_on_any_page(mock_scrape_page):
@@ -184,7 +256,8 @@ def test_extract_data_from_website_no_product_cards_on_any_page(mock_scrape_page
         df = extract_data_from_website()
 
     assert df.empty
-    assert mock_scrape_page.call_count == 2
+    # Halaman kosong menandakan katalog sudah habis, halaman berikutnya tidak diminta
+    assert mock_scrape_page.call_count == 1
 
 @patch('utils.extract.scrape_page')
 @patch('utils.extract.extract_product_details')
@@ -215,7 +288,8 @@ def test_extract_data_from_website_partial_scrape_and_extract_success(mock_extra
     mock_card1_p3 = BeautifulSoup('<div class="collection-card">P3C1</div>', 'html.parser').div
     mock_soup_page3.find_all.return_value = [mock_card1_p3]
 
-    mock_scrape_page.side_effect = [mock_soup_page1, None, mock_soup_page3]
+    # Halaman 2 gagal di putaran utama dan di putaran ulang
+    mock_scrape_page.side_effect = [mock_soup_page1, None, mock_soup_page3, None]
 
     product1_details = {"title": "Prod1", "price": "$1", "rating": "1/5", "colors": "1C", "size": "S", "gender": "M"}
     product3_details = {"title": "Prod3", "price": "$3", "rating": "3/5", "colors": "3C", "size": "L", "gender": "F"}
@@ -226,9 +300,607 @@ def test_extract_data_from_website_partial_scrape_and_extract_success(mock_extra
         
     assert len(df) == 2
     assert df['title'].tolist() == ["Prod1", "Prod3"]
-    assert mock_scrape_page.call_count == 3
+    assert mock_scrape_page.call_count == 4
     assert mock_extract_details.call_count == 3
     
     # Cek timestamp ada di semua baris yang berhasil
     assert 'timestamp' in df.columns
-    assert df['timestamp'].notna().all()
\ No newline at end of file
+    assert df['timestamp'].notna().all()
+
+# --- Tes untuk mode konkuren ---
+
+def _make_page_soup(page_num, n_cards=2):
+    cards = "".join(
+        f"""<div class="collection-card"><div class="product-details">
+            <h3 class="product-title">Page{page_num} Item{i}</h3>
+            <div class="price-container"><span class="price">$10.00</span></div>
+            <p>Rating: ⭐ 4.0 / 5</p><p>3 Colors</p><p>Size: M</p><p>Gender: Men</p>
+        </div></div>"""
+        for i in range(n_cards)
+    )
+    return BeautifulSoup(f"<html><body>{cards}</body></html>", 'html.parser')
+
+@patch('utils.extract.scrape_page')
+def test_extract_data_from_website_concurrent_keeps_page_order(mock_scrape_page):
+    import random
+    import time as time_module
+
+    def fake_scrape(url):
+        # Halaman selesai dalam urutan acak untuk memastikan hasil tetap berurutan
+        time_module.sleep(random.uniform(0, 0.02))
+        page_num = 1 if url.endswith("/") else int(url.rsplit("page", 1)[1])
+        return _make_page_soup(page_num)
+
+    mock_scrape_page.side_effect = fake_scrape
+
+    with patch('utils.extract.MAX_PAGES', 6):
+        df = extract_data_from_website(max_workers=4, requests_per_second=0)
+
+    expected_titles = [f"Page{p} Item{i}" for p in range(1, 7) for i in range(2)]
+    assert df['title'].tolist() == expected_titles
+    assert mock_scrape_page.call_count == 6
+    assert df['timestamp'].nunique() == 1
+
+def test_host_rate_limiter_spaces_requests_per_host():
+    limiter = HostRateLimiter(requests_per_second=20)
+    start = datetime.now()
+    for _ in range(3):
+        limiter.wait("http://host-a.test/page")
+    limiter.wait("http://host-b.test/page") # host berbeda tidak ikut tertahan
+    elapsed = (datetime.now() - start).total_seconds()
+    assert 0.09 <= elapsed < 0.5
+
+def test_host_rate_limiter_disabled():
+    limiter = HostRateLimiter(requests_per_second=0)
+    start = datetime.now()
+    for _ in range(10):
+        limiter.wait("http://host-a.test/page")
+    assert (datetime.now() - start).total_seconds() < 0.05
+
+
+# --- Tes untuk penghentian pagination ---
+
+def _make_paginated_soup(page_num, last_page, n_cards=2):
+    soup = _make_page_soup(page_num, n_cards)
+    if page_num < last_page:
+        nav = f'<ul class="pagination"><li class="page-item next"><a class="page-link" href="/page{page_num + 1}">Next</a></li></ul>'
+    else:
+        nav = '<ul class="pagination"><li class="page-item current"><span class="page-link">Page 10 of 10</span></li></ul>'
+    soup.body.append(BeautifulSoup(nav, 'html.parser'))
+    return soup
+
+def _page_num_from_url(url):
+    return 1 if url.endswith("/") else int(url.rsplit("page", 1)[1])
+
+@patch('utils.extract.scrape_page')
+def test_extract_data_from_website_stops_when_next_link_missing(mock_scrape_page):
+    mock_scrape_page.side_effect = lambda url: _make_paginated_soup(_page_num_from_url(url), last_page=10)
+
+    df = extract_data_from_website(requests_per_second=0)
+
+    assert mock_scrape_page.call_count == 10
+    assert len(df) == 20
+
+@patch('utils.extract.scrape_page')
+def test_extract_data_from_website_records_page_metrics(mock_scrape_page):
+    mock_scrape_page.side_effect = lambda url: _make_paginated_soup(_page_num_from_url(url), last_page=3)
+
+    PIPELINE_METRICS.reset()
+    extract_data_from_website(requests_per_second=0)
+
+    pages = PIPELINE_METRICS.report()["pages"]
+    assert pages["count"] == 3
+    assert [page["page"] for page in pages["records"]] == [1, 2, 3]
+    assert all(page["products"] == 2 and page["seconds"] >= 0 for page in pages["records"])
+
+@patch('utils.extract.scrape_page')
+def test_extract_data_from_website_stops_on_empty_page_without_pagination(mock_scrape_page):
+    mock_scrape_page.side_effect = lambda url: _make_page_soup(_page_num_from_url(url), n_cards=2 if _page_num_from_url(url) <= 10 else 0)
+
+    df = extract_data_from_website(requests_per_second=0)
+
+    assert mock_scrape_page.call_count == 11
+    assert len(df) == 20
+
+@patch('utils.extract.scrape_page')
+def test_extract_data_from_website_lookahead_skips_missing_pages(mock_scrape_page):
+    # Halaman 3 kosong tetapi halaman 4 masih berisi produk
+    filled_pages = {1, 2, 4}
+    mock_scrape_page.side_effect = lambda url: _make_page_soup(_page_num_from_url(url), n_cards=2 if _page_num_from_url(url) in filled_pages else 0)
+
+    df = extract_data_from_website(requests_per_second=0, lookahead=1)
+
+    assert df['title'].str.startswith("Page4").sum() == 2
+    assert len(df) == 6
+    assert mock_scrape_page.call_count == 6 # halaman 5 dan 6 kosong -> berhenti
+
+@patch('utils.extract.scrape_page')
+def test_extract_data_from_website_concurrent_stops_early(mock_scrape_page):
+    mock_scrape_page.side_effect = lambda url: _make_paginated_soup(_page_num_from_url(url), last_page=10)
+
+    df = extract_data_from_website(max_workers=4, requests_per_second=0)
+
+    assert len(df) == 20
+    assert df['title'].iloc[-1] == "Page10 Item1"
+    # Paling banyak (max_workers - 1) request tambahan yang sudah terlanjur berjalan
+    assert 10 <= mock_scrape_page.call_count <= 13
+
+
+# --- Tes untuk cache HTTP (conditional GET) ---
+
+def _mock_response(status_code=200, content=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    response.raw.tell.return_value = len(content)
+    return response
+
+def test_http_cache_conditional_headers_and_ttl(tmp_path):
+    cache = HttpCache(str(tmp_path), ttl=60)
+    assert cache.conditional_headers("http://example.com/") == {}
+
+    assert cache.store("http://example.com/", b"<html>v1</html>", {'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+    assert cache.conditional_headers("http://example.com/") == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+
+    # Index dibaca ulang dari disk pada instance baru
+    reopened = HttpCache(str(tmp_path), ttl=0)
+    assert reopened.get_body("http://example.com/") == b"<html>v1</html>"
+    with patch('utils.extract.time.time', return_value=datetime.now().timestamp() + 10):
+        assert reopened.conditional_headers("http://example.com/") == {} # kedaluwarsa
+    assert reopened.get_body("http://example.com/") is None
+
+def test_http_cache_skips_responses_without_validators(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    assert cache.store("http://example.com/", b"body", {}) is False
+    assert cache.get_body("http://example.com/") is None
+
+def test_http_cache_lru_eviction(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=25)
+    cache.store("http://example.com/a", b"a" * 10, {'ETag': 'a'})
+    cache.store("http://example.com/b", b"b" * 10, {'ETag': 'b'})
+    cache.get_body("http://example.com/a") # a menjadi yang terakhir dipakai
+    cache.store("http://example.com/c", b"c" * 10, {'ETag': 'c'})
+
+    assert cache.get_body("http://example.com/b") is None
+    assert cache.get_body("http://example.com/a") == b"a" * 10
+    assert cache.get_body("http://example.com/c") == b"c" * 10
+    assert cache.total_bytes() <= 25
+
+def test_http_cache_hit_defers_index_write_until_flush(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=25)
+    cache.store("http://example.com/a", b"a" * 10, {'ETag': 'a'})
+    cache.store("http://example.com/b", b"b" * 10, {'ETag': 'b'})
+    index_path = tmp_path / HttpCache.INDEX_FILENAME
+    saved = index_path.read_bytes()
+
+    with patch.object(cache, '_save_index', wraps=cache._save_index) as mock_save:
+        assert cache.get_body("http://example.com/a") == b"a" * 10
+        mock_save.assert_not_called()
+    assert index_path.read_bytes() == saved
+
+    # Urutan LRU dari cache hit ikut tersimpan setelah flush
+    cache.flush()
+    reopened = HttpCache(str(tmp_path), max_bytes=25)
+    reopened.store("http://example.com/c", b"c" * 10, {'ETag': 'c'})
+    assert reopened.get_body("http://example.com/a") == b"a" * 10
+    assert reopened.get_body("http://example.com/b") is None
+
+def test_enable_http_cache_replaces_previous_cache(tmp_path):
+    with patch('utils.extract.atexit') as mock_atexit:
+        first = enable_http_cache(str(tmp_path / "a"), max_bytes=25)
+        first.store("http://example.com/a", b"a" * 10, {'ETag': 'a'})
+        first.store("http://example.com/b", b"b" * 10, {'ETag': 'b'})
+        first.get_body("http://example.com/a")
+
+        second = enable_http_cache(str(tmp_path / "b"))
+        # Cache lama di-flush dan handler atexit-nya dilepas, hanya satu handler yang terdaftar
+        mock_atexit.unregister.assert_called_once_with(first.flush)
+        assert mock_atexit.register.call_args_list[-1].args == (second.flush,)
+        disable_http_cache()
+    assert mock_atexit.register.call_count == mock_atexit.unregister.call_count == 2
+
+    reopened = HttpCache(str(tmp_path / "a"), max_bytes=25)
+    reopened.store("http://example.com/c", b"c" * 10, {'ETag': 'c'})
+    assert reopened.get_body("http://example.com/b") is None
+
+def test_http_cache_parsed_results_follow_body_digest(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.store("http://example.com/", b"v1", {'ETag': 'v1'})
+    cache.store_parsed("http://example.com/", b"v1", [[{"title": "A"}], 1, None])
+
+    assert cache.get_parsed("http://example.com/", b"v1") == [[{"title": "A"}], 1, None]
+    assert cache.get_parsed("http://example.com/", b"v2") is None
+
+@patch('utils.extract.get_session')
+def test_fetch_page_serves_not_modified_from_cache(mock_get_session, tmp_path):
+    mock_get = mock_get_session.return_value.get
+    mock_get.side_effect = [
+        _mock_response(200, b"<html>cached</html>", {'ETag': '"v1"'}),
+        _mock_response(304),
+    ]
+    enable_http_cache(str(tmp_path))
+    try:
+        REQUEST_STATS.reset()
+        assert fetch_page("http://example.com/") == b"<html>cached</html>"
+        assert fetch_page("http://example.com/") == b"<html>cached</html>"
+    finally:
+        disable_http_cache()
+
+    assert mock_get.call_args_list[1].kwargs['headers'] == {'If-None-Match': '"v1"'}
+    stats = REQUEST_STATS.snapshot()
+    assert stats['not_modified'] == 1
+    assert stats['bytes_downloaded'] == len(b"<html>cached</html>")
+
+@patch('utils.extract.get_session')
+def test_extract_data_from_website_reuses_parsed_pages_from_cache(mock_get_session, tmp_path):
+    page_html = str(_make_paginated_soup(1, last_page=1)).encode('utf-8')
+    mock_get = mock_get_session.return_value.get
+    mock_get.side_effect = [
+        _mock_response(200, page_html, {'ETag': '"p1"'}),
+        _mock_response(304),
+    ]
+    enable_http_cache(str(tmp_path))
+    try:
+        df_first = extract_data_from_website(requests_per_second=0)
+        with patch('utils.extract.extract_product_details') as mock_extract_details:
+            df_second = extract_data_from_website(requests_per_second=0)
+    finally:
+        disable_http_cache()
+
+    mock_extract_details.assert_not_called()
+    pd.testing.assert_frame_equal(df_first.drop(columns='timestamp'), df_second.drop(columns='timestamp'))
+
+@pytest.mark.parametrize("backend", ["bs4", "lxml", "selectolax"])
+@patch('utils.extract.get_session')
+def test_extract_data_from_website_with_parser_backend(mock_get_session, backend):
+    pages = {p: str(_make_paginated_soup(p, last_page=3)).encode('utf-8') for p in range(1, 4)}
+    mock_get_session.return_value.get.side_effect = lambda url, **kwargs: _mock_response(200, pages[_page_num_from_url(url)])
+
+    df = extract_data_from_website(requests_per_second=0, parser_backend=backend)
+
+    assert df['title'].tolist() == [f"Page{p} Item{i}" for p in range(1, 4) for i in range(2)]
+    assert df['price'].eq("$10.00").all()
+    assert mock_get_session.return_value.get.call_count == 3
+
+# --- Tes untuk parsing multi-proses ---
+
+def _synthetic_pages(total_pages):
+    return {p: make_page_html(p, n_cards=5, total_pages=total_pages).encode('utf-8') for p in range(1, total_pages + 1)}
+
+def _synthetic_response(pages, url):
+    # Fetcher bisa mengambil beberapa halaman melewati halaman terakhir sebelum hasil parse-nya diketahui
+    page_num = _page_num_from_url(url)
+    return _mock_response(200, pages[page_num]) if page_num in pages else _mock_response(404)
+
+@patch('utils.extract.get_session')
+def test_extract_data_from_website_parse_processes_matches_threads(mock_get_session):
+    pages = _synthetic_pages(6)
+    mock_get_session.return_value.get.side_effect = lambda url, **kwargs: _synthetic_response(pages, url)
+
+    expected = extract_data_from_website(requests_per_second=0)
+    df = extract_data_from_website(max_workers=2, requests_per_second=0, parse_processes=2)
+
+    pd.testing.assert_frame_equal(df.drop(columns='timestamp'), expected.drop(columns='timestamp'))
+
+@patch('utils.extract.get_session')
+def test_parse_processes_queue_applies_backpressure(mock_get_session):
+    pages = _synthetic_pages(8)
+    fetched = []
+    def get(url, **kwargs):
+        fetched.append(_page_num_from_url(url))
+        return _synthetic_response(pages, url)
+    mock_get_session.return_value.get.side_effect = get
+
+    with patch('utils.extract.PARSE_QUEUE_SIZE', 2):
+        batches = iter_product_batches(requests_per_second=0, parse_processes=1)
+        next(batches)
+        # Antrean 2 halaman + 1 halaman yang sedang diambil fetcher
+        assert len(fetched) <= 3
+        batches.close()
+
+@patch('utils.extract.get_session')
+def test_parse_processes_failed_fetch_is_retried(mock_get_session):
+    pages = _synthetic_pages(3)
+    attempts = {}
+    def get(url, **kwargs):
+        page_num = _page_num_from_url(url)
+        attempts[page_num] = attempts.get(page_num, 0) + 1
+        if page_num == 2 and attempts[page_num] == 1:
+            return _mock_response(500)
+        return _synthetic_response(pages, url)
+    mock_get_session.return_value.get.side_effect = get
+
+    df = extract_data_from_website(requests_per_second=0, parse_processes=1)
+
+    assert attempts[2] == 2
+    assert len(df) == 15
+    assert set(df['title'].iloc[5:10]) <= {f"{kind} {i}" for kind in PRODUCT_TYPES for i in range(6, 11)} | {"Unknown Product"}
+
+# --- Tes untuk mode streaming ---
+
+@patch('utils.extract.scrape_page')
+def test_iter_product_batches_yields_one_frame_per_page(mock_scrape_page):
+    mock_scrape_page.side_effect = lambda url: _make_paginated_soup(_page_num_from_url(url), last_page=3)
+
+    batches = list(iter_product_batches(requests_per_second=0))
+    df_full = extract_data_from_website(requests_per_second=0)
+
+    assert len(batches) == 3
+    assert all(list(batch.columns) == ['title', 'price', 'rating', 'colors', 'size', 'gender', 'timestamp'] for batch in batches)
+    assert batches[1]['title'].tolist() == ["Page2 Item0", "Page2 Item1"]
+    assert pd.concat(batches, ignore_index=True)['title'].tolist() == df_full['title'].tolist()
+    assert pd.concat(batches)['timestamp'].nunique() == 1
+
+@patch('utils.extract.scrape_page')
+def test_iter_product_batches_skips_failed_pages(mock_scrape_page):
+    mock_scrape_page.side_effect = [_make_page_soup(1), None, _make_page_soup(3), None]
+
+    with patch('utils.extract.MAX_PAGES', 3):
+        batches = list(iter_product_batches(requests_per_second=0))
+
+    assert [batch['title'].iloc[0] for batch in batches] == ["Page1 Item0", "Page3 Item0"]
+
+# --- Tes untuk putaran ulang dan checkpoint ---
+
+@patch('utils.extract.scrape_page')
+def test_extract_data_from_website_retries_failed_pages_in_separate_pass(mock_scrape_page):
+    attempts = {}
+    def flaky_page(url):
+        page_num = _page_num_from_url(url)
+        attempts[page_num] = attempts.get(page_num, 0) + 1
+        if page_num == 2 and attempts[page_num] == 1:
+            return None
+        return _make_paginated_soup(page_num, last_page=3)
+    mock_scrape_page.side_effect = flaky_page
+
+    df = extract_data_from_website(requests_per_second=0)
+
+    assert attempts == {1: 1, 2: 2, 3: 1}
+    # Halaman hasil putaran ulang kembali ke posisinya
+    assert df['title'].tolist() == ["Page1 Item0", "Page1 Item1", "Page2 Item0", "Page2 Item1", "Page3 Item0", "Page3 Item1"]
+
+    attempts.clear()
+    batches = list(iter_product_batches(requests_per_second=0))
+    # Mode streaming: batch halaman hasil putaran ulang menyusul setelah halaman terakhir
+    assert [batch['title'].iloc[0] for batch in batches] == ["Page1 Item0", "Page3 Item0", "Page2 Item0"]
+
+@pytest.fixture
+def checkpoint_dir(tmp_path):
+    yield str(tmp_path / "checkpoint")
+    disable_checkpoints()
+
+@patch('utils.extract.scrape_page')
+def test_checkpoint_resumes_after_crash(mock_scrape_page, checkpoint_dir):
+    def crash_on_page_3(url):
+        page_num = _page_num_from_url(url)
+        if page_num == 3:
+            raise RuntimeError("Simulated crash")
+        return _make_paginated_soup(page_num, last_page=4)
+    mock_scrape_page.side_effect = crash_on_page_3
+    enable_checkpoints(checkpoint_dir)
+
+    with pytest.raises(RuntimeError):
+        extract_data_from_website(requests_per_second=0)
+    assert PageCheckpoint(checkpoint_dir).saved_pages() == [1, 2]
+
+    mock_scrape_page.reset_mock()
+    mock_scrape_page.side_effect = lambda url: _make_paginated_soup(_page_num_from_url(url), last_page=4)
+    df = extract_data_from_website(requests_per_second=0)
+
+    # Halaman 1-2 dibaca dari checkpoint, hanya halaman 3-4 yang diambil
+    assert [call.args[0] for call in mock_scrape_page.call_args_list] == [
+        "https://fashion-studio.dicoding.dev/page3", "https://fashion-studio.dicoding.dev/page4"
+    ]
+    assert len(df) == 8
+    assert df['timestamp'].nunique() == 1
+    # Ekstraksi lengkap menghapus checkpoint
+    assert PageCheckpoint(checkpoint_dir).saved_pages() == []
+
+@patch('utils.extract.scrape_page')
+def test_checkpoint_kept_for_pages_that_still_fail(mock_scrape_page, checkpoint_dir):
+    mock_scrape_page.side_effect = lambda url: (
+        None if _page_num_from_url(url) == 2 else _make_paginated_soup(_page_num_from_url(url), last_page=3)
+    )
+    enable_checkpoints(checkpoint_dir)
+
+    extract_data_from_website(requests_per_second=0)
+    assert PageCheckpoint(checkpoint_dir).saved_pages() == [1, 3]
+
+    mock_scrape_page.reset_mock()
+    mock_scrape_page.side_effect = lambda url: _make_paginated_soup(_page_num_from_url(url), last_page=3)
+    df = extract_data_from_website(requests_per_second=0)
+
+    assert mock_scrape_page.call_count == 1
+    assert len(df) == 6
+
+def test_checkpoint_discards_stale_or_foreign_runs(checkpoint_dir):
+    checkpoint = PageCheckpoint(checkpoint_dir, max_age=60)
+    assert checkpoint.start_run("2024-05-25 10:00:00") == "2024-05-25 10:00:00"
+    checkpoint.save(PageResult(1, [{'title': "Saved"}], 1, True))
+    assert checkpoint.start_run("2024-05-25 11:00:00") == "2024-05-25 10:00:00"
+    assert checkpoint.saved_pages() == [1]
+
+    with patch('utils.extract.BASE_URL', "https://example.com/"):
+        assert checkpoint.start_run("2024-05-25 12:00:00") == "2024-05-25 12:00:00"
+    assert checkpoint.saved_pages() == []
+
+    expired = PageCheckpoint(checkpoint_dir, max_age=-1)
+    assert expired.start_run("2024-05-25 13:00:00") == "2024-05-25 13:00:00"
+
+# --- Tes untuk mode asyncio ---
+
+@pytest.fixture
+def catalogue_url():
+    with serve_catalogue(total_pages=4, n_cards=10) as base_url, \
+            patch('utils.extract.BASE_URL', base_url), patch('utils.extract.MAX_PAGES', 10):
+        yield base_url
+
+def test_extract_data_from_website_async_matches_threads(catalogue_url):
+    expected = extract_data_from_website(max_workers=2, requests_per_second=0, parser_backend="lxml")
+    df = asyncio.run(extract_data_from_website_async(requests_per_second=0, parser_backend="lxml"))
+
+    pd.testing.assert_frame_equal(df.drop(columns='timestamp'), expected.drop(columns='timestamp'))
+    assert df['timestamp'].nunique() == 1
+
+def test_extract_data_from_website_async_keeps_page_order_after_retry(catalogue_url):
+    pytest.importorskip("aiohttp")
+    from utils.extract import _AsyncSiteScraper
+    scrape = _AsyncSiteScraper.scrape
+    attempts = {}
+    async def flaky_scrape(self, page_num, stop_event=None):
+        attempts[page_num] = attempts.get(page_num, 0) + 1
+        if page_num == 2 and attempts[page_num] == 1:
+            return PageResult(page_num, None, 0, None)
+        return await scrape(self, page_num, stop_event)
+
+    expected = extract_data_from_website(requests_per_second=0)
+    with patch.object(_AsyncSiteScraper, 'scrape', flaky_scrape):
+        df = asyncio.run(extract_data_from_website_async(requests_per_second=0))
+
+    assert attempts[2] == 2
+    pd.testing.assert_frame_equal(df.drop(columns='timestamp'), expected.drop(columns='timestamp'))
+
+def test_extract_data_from_website_async_bounds_requests_in_flight(catalogue_url):
+    asyncio.run(extract_data_from_website_async(max_concurrency=2, requests_per_second=0))
+    # Halaman 1-4 ditambah paling banyak 2 request melewati halaman terakhir
+    assert REQUEST_STATS.snapshot()['requests'] <= 6
+
+def test_extract_data_from_website_async_without_aiohttp(catalogue_url):
+    with patch('utils.extract.aiohttp', None):
+        df = asyncio.run(extract_data_from_website_async(requests_per_second=0))
+    assert len(df) == 40
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    """Menjawab 503 untuk request pertama setiap path, lalu 200."""
+    protocol_version = "HTTP/1.1"
+    seen = set()
+
+    def do_GET(self):
+        first = self.path not in self.seen
+        self.seen.add(self.path)
+        body = b"" if first else b"<html>ok</html>"
+        self.send_response(503 if first else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def test_fetch_page_async_retries_server_errors():
+    aiohttp = pytest.importorskip("aiohttp")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/page2"
+
+    async def fetch(max_retries):
+        async with aiohttp.ClientSession() as session:
+            return await fetch_page_async(session, url, asyncio.Semaphore(1), AsyncTokenBucket(0),
+                                          max_retries=max_retries, backoff_factor=0.01)
+    try:
+        _FlakyHandler.seen = set()
+        assert asyncio.run(fetch(max_retries=1)) == b"<html>ok</html>"
+        _FlakyHandler.seen = set()
+        assert asyncio.run(fetch(max_retries=0)) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_async_token_bucket_spaces_requests_per_host():
+    async def acquire_all(bucket, urls):
+        start = time.perf_counter()
+        await asyncio.gather(*(bucket.acquire(url) for url in urls))
+        return time.perf_counter() - start
+
+    urls = ["http://host-a.test/page"] * 3 + ["http://host-b.test/page"]
+    assert 0.09 <= asyncio.run(acquire_all(AsyncTokenBucket(20), urls)) < 0.5
+    # burst 3: tiga request pertama ke host yang sama tidak perlu menunggu
+    assert asyncio.run(acquire_all(AsyncTokenBucket(20, burst=3), urls)) < 0.05
+    assert asyncio.run(acquire_all(AsyncTokenBucket(0), urls * 10)) < 0.05
+
+# --- Tes untuk mode multi-sumber ---
+
+SITE_SELECTORS = {
+    'card': 'div.collection-card', 'title': 'h3.product-title', 'price': 'span.price',
+    'rating': 'div.product-details p:nth-of-type(1)', 'colors': 'div.product-details p:nth-of-type(2)',
+    'size': 'div.product-details p:nth-of-type(3)', 'gender': 'div.product-details p:nth-of-type(4)',
+    'next': 'ul.pagination li.next a',
+}
+
+def test_extract_sites_tags_rows_with_source():
+    pytest.importorskip("aiohttp")
+    with serve_catalogue(total_pages=3, n_cards=5, dirty_ratio=0) as url_a, \
+            serve_catalogue(total_pages=2, n_cards=5, seed=1, dirty_ratio=0) as url_b:
+        sites = [SiteConfig(url_a, name="toko-a", max_pages=10, requests_per_second=0),
+                 SiteConfig(url_b, max_pages=10, selectors=SITE_SELECTORS, requests_per_second=0)]
+        df = asyncio.run(extract_sites_async(sites))
+        with patch('utils.extract.BASE_URL', url_b), patch('utils.extract.MAX_PAGES', 10):
+            expected_b = extract_data_from_website(requests_per_second=0)
+
+    assert df['source'].value_counts().to_dict() == {"toko-a": 15, url_b: 10}
+    assert list(df.columns[-2:]) == ['timestamp', 'source']
+    assert df['timestamp'].nunique() == 1
+    site_b = df[df['source'] == url_b].drop(columns=['timestamp', 'source']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(site_b, expected_b.drop(columns='timestamp'))
+
+class _ConcurrencyHandler(BaseHTTPRequestHandler):
+    """Mencatat jumlah maksimal request yang dilayani bersamaan."""
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active -= 1
+        body = make_page_html(1, n_cards=1, total_pages=50).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def test_extract_sites_limits_concurrency_per_host():
+    pytest.importorskip("aiohttp")
+    _ConcurrencyHandler.max_active = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ConcurrencyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+    try:
+        # Dua situs di host yang sama berbagi batas host
+        sites = [SiteConfig(base_url, name="a", max_pages=6, max_concurrency=2, requests_per_second=0),
+                 SiteConfig(f"{base_url}b/", name="b", max_pages=6, requests_per_second=0)]
+        df = asyncio.run(extract_sites_async(sites, max_concurrency=50))
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(df) == 12
+    assert _ConcurrencyHandler.max_active == 2
+
+def test_site_page_url_patterns():
+    assert site_page_url(SiteConfig("https://toko.test/"), 1) == "https://toko.test/"
+    assert site_page_url(SiteConfig("https://toko.test/"), 3) == "https://toko.test/page3"
+    site = SiteConfig("https://toko.test/katalog/", page_pattern="?halaman={page}")
+    assert site_page_url(site, 1) == "https://toko.test/katalog/?halaman=1"
+
+def test_load_site_configs(tmp_path):
+    path = tmp_path / "sites.json"
+    path.write_text(json.dumps([{"base_url": "https://toko.test/", "name": "toko", "selectors": {"card": "div.item"}}]))
+    assert load_site_configs(str(path)) == [SiteConfig("https://toko.test/", name="toko", selectors={"card": "div.item"})]
+
+    path.write_text(json.dumps([{"base_url": "https://toko.test/", "halaman": 3}]))
+    assert load_site_configs(str(path)) is None
+    path.write_text(json.dumps([{"base_url": "https://toko.test/", "selectors": {"card": "div["}}]))
+    assert load_site_configs(str(path)) is None
+    assert load_site_configs(str(tmp_path / "tidak_ada.json")) is None
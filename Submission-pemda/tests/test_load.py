@@ -1,8 +1,13 @@
 import pytest
 import pandas as pd
 import os
+import sqlite3
 
-from utils.load import load_to_csv
+from utils.load import (
+    load_to_csv, load_batches_to_csv, load_data, read_output, detect_format, available_formats,
+    load_to_sqlite, upsert_to_database
+)
+from utils.transform import OUTPUT_DTYPES, to_compact_schema
 
 @pytest.fixture
 def sample_transformed_df():
@@ -73,4 +78,168 @@ def test_load_to_csv_with_subdirectories(sample_transformed_df, tmp_path):
     assert output_file_path.exists(), "File CSV di subdirektori seharusnya sudah dibuat."
     
     df_read = pd.read_csv(output_file_path)
-    pd.testing.assert_frame_equal(df_read, sample_transformed_df, check_dtype=False)
\ No newline at end of file
+    pd.testing.assert_frame_equal(df_read, sample_transformed_df, check_dtype=False)
+
+def test_load_batches_to_csv_matches_single_write(sample_transformed_df, tmp_path):
+    full_path = tmp_path / "full.csv"
+    batched_path = tmp_path / "out" / "batched.csv"
+    batches = [sample_transformed_df.iloc[:1], pd.DataFrame(), sample_transformed_df.iloc[1:]]
+
+    load_to_csv(sample_transformed_df, str(full_path))
+    rows_written = load_batches_to_csv(iter(batches), str(batched_path))
+
+    assert rows_written == len(sample_transformed_df)
+    assert batched_path.read_text() == full_path.read_text()
+    assert not (tmp_path / "out" / "batched.csv.tmp").exists()
+
+def test_load_batches_to_csv_without_data(tmp_path):
+    output_file_path = tmp_path / "empty_batches.csv"
+    assert load_batches_to_csv(iter([pd.DataFrame(), None]), str(output_file_path)) == 0
+    assert not output_file_path.exists()
+
+def test_load_batches_to_csv_keeps_previous_file_on_failure(sample_transformed_df, tmp_path):
+    output_file_path = tmp_path / "products.csv"
+    output_file_path.write_text("versi lama\n")
+
+    def failing_batches():
+        yield sample_transformed_df
+        raise RuntimeError("Simulated extract failure")
+
+    assert load_batches_to_csv(failing_batches(), str(output_file_path)) == 0
+    assert output_file_path.read_text() == "versi lama\n"
+
+@pytest.mark.parametrize("filename, expected", [
+    ("products.csv", "csv"),
+    ("products.CSV.GZ", "csv"),
+    ("out/products.csv.zst", "csv"),
+    ("products.parquet", "parquet"),
+    ("products.feather", "feather"),
+    ("products.arrow", "feather"),
+    ("products.db", "sqlite"),
+    ("products.xlsx", None),
+])
+def test_detect_format(filename, expected):
+    assert detect_format(filename) == expected
+
+@pytest.mark.parametrize("filename, kwargs", [
+    ("products.csv", {}),
+    ("products.csv.gz", {}),
+    ("products.csv.zst", {}),
+    ("products.parquet", {}),
+    ("products.parquet", {"compression": "zstd"}),
+    ("products.feather", {}),
+    ("products.arrow", {"compression": "lz4"}),
+    ("products.db", {}),
+])
+def test_load_data_round_trip_keeps_schema(sample_transformed_df, tmp_path, filename, kwargs):
+    fmt = detect_format(filename)
+    if fmt not in available_formats():
+        pytest.skip(f"Library untuk format {fmt} tidak terpasang")
+    if filename.endswith(".zst"):
+        pytest.importorskip("zstandard")
+    expected = sample_transformed_df.astype(OUTPUT_DTYPES)
+    output_file_path = tmp_path / "out" / filename
+
+    assert load_data(expected, str(output_file_path), **kwargs) is True
+    df_read = read_output(str(output_file_path))
+
+    assert df_read['price'].dtype == 'float64'
+    assert df_read['rating'].dtype == 'float64'
+    assert df_read['colors'].dtype == 'int64'
+    pd.testing.assert_frame_equal(df_read, expected)
+
+@pytest.mark.parametrize("filename", ["products.csv", "products.parquet", "products.feather", "products.db"])
+def test_load_data_compact_schema(sample_transformed_df, tmp_path, filename):
+    fmt = detect_format(filename)
+    if fmt not in available_formats():
+        pytest.skip(f"Library untuk format {fmt} tidak terpasang")
+    expected = sample_transformed_df.astype(OUTPUT_DTYPES)
+    output_file_path = str(tmp_path / filename)
+
+    assert load_data(to_compact_schema(expected), output_file_path) is True
+
+    pd.testing.assert_frame_equal(read_output(output_file_path), expected)
+    assert read_output(output_file_path, compact=True)['timestamp'].dtype == 'datetime64[s]'
+
+def test_load_data_unknown_format(sample_transformed_df, tmp_path):
+    output_file_path = tmp_path / "products.xlsx"
+    assert load_data(sample_transformed_df, str(output_file_path)) is False
+    assert not output_file_path.exists()
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_load_data_columnar_empty_dataframe(tmp_path, fmt):
+    output_file_path = tmp_path / f"empty.{fmt}"
+    assert load_data(pd.DataFrame(), str(output_file_path)) is False
+    assert not output_file_path.exists()
+
+def test_load_data_columnar_without_pyarrow(sample_transformed_df, tmp_path, monkeypatch):
+    monkeypatch.setattr('utils.load.pyarrow', None)
+    output_file_path = tmp_path / "products.parquet"
+    assert load_data(sample_transformed_df, str(output_file_path)) is False
+    assert not output_file_path.exists()
+
+def _read_table(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query("SELECT title, price, size, gender FROM products ORDER BY title", connection)
+    finally:
+        connection.close()
+
+def test_load_to_sqlite_rerun_writes_only_delta(sample_transformed_df, tmp_path):
+    db_path = str(tmp_path / "products.db")
+    assert load_to_sqlite(sample_transformed_df, db_path) == 3
+    # Run ulang dengan data yang sama (timestamp baru) tidak menulis apa pun
+    rerun_df = sample_transformed_df.assign(timestamp="2024-05-26 10:00:00")
+    assert load_to_sqlite(rerun_df, db_path) == 0
+
+    changed_df = sample_transformed_df.copy()
+    changed_df.loc[0, 'price'] = 500000.0
+    new_row = pd.DataFrame([{
+        'title': "Topi", 'price': 100000.0, 'rating': 4.0, 'colors': 2,
+        'size': "M", 'gender': "Unisex", 'timestamp': "2024-05-26 10:00:00"
+    }])
+    assert load_to_sqlite(pd.concat([changed_df, new_row], ignore_index=True), db_path) == 2
+
+    table = _read_table(db_path)
+    assert len(table) == 4
+    assert table.loc[table['title'] == "T-shirt Keren", 'price'].item() == 500000.0
+    assert table.loc[table['title'] == "Jaket Bagus", 'price'].item() == 815840.0
+
+def test_load_to_sqlite_duplicate_keys_keep_last(sample_transformed_df, tmp_path):
+    db_path = str(tmp_path / "products.db")
+    duplicated = pd.concat([sample_transformed_df, sample_transformed_df.iloc[[0]].assign(price=1.0)], ignore_index=True)
+    assert load_to_sqlite(duplicated, db_path) == 3
+    table = _read_table(db_path)
+    assert table.loc[table['title'] == "T-shirt Keren", 'price'].item() == 1.0
+
+def test_load_to_sqlite_empty_dataframe(tmp_path):
+    db_path = tmp_path / "products.db"
+    assert load_to_sqlite(pd.DataFrame(), str(db_path)) is None
+    assert not db_path.exists()
+
+def test_upsert_to_database_numeric_paramstyle(sample_transformed_df):
+    connection = sqlite3.connect(":memory:")
+    assert upsert_to_database(sample_transformed_df, connection, "produk", paramstyle="numeric", batch_size=2) == 3
+    assert connection.execute('SELECT COUNT(*) FROM "produk"').fetchone()[0] == 3
+
+def test_upsert_to_database_rolls_back_on_failure(sample_transformed_df):
+    connection = sqlite3.connect(":memory:")
+    assert upsert_to_database(sample_transformed_df.iloc[:1], connection) == 1
+
+    bad_df = sample_transformed_df.copy()
+    bad_df['timestamp'] = ["2024-05-26", "2024-05-26", object()] # batch terakhir tidak bisa di-bind oleh sqlite3
+    assert upsert_to_database(bad_df, connection, batch_size=1) is None
+    assert connection.execute('SELECT COUNT(*) FROM "products"').fetchone()[0] == 1
+
+def test_upsert_to_database_rejects_invalid_table_name(sample_transformed_df):
+    connection = sqlite3.connect(":memory:")
+    assert upsert_to_database(sample_transformed_df, connection, 'products"; DROP TABLE x; --') is None
+
+def test_load_to_sqlite_multi_source_keys(sample_transformed_df, tmp_path):
+    db_path = str(tmp_path / "products.db")
+    multi = pd.concat([sample_transformed_df.assign(source="toko-a"), sample_transformed_df.assign(source="toko-b")],
+                      ignore_index=True)
+    assert load_to_sqlite(multi, db_path) == 6
+    multi.loc[multi['source'] == "toko-b", 'price'] += 1
+    assert load_to_sqlite(multi, db_path) == 3
+    assert read_output(db_path)['source'].value_counts().to_dict() == {"toko-a": 3, "toko-b": 3}
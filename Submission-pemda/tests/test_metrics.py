@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from utils.metrics import (
+    LatencyHistogram,
+    PipelineMetrics,
+    format_prometheus,
+    write_metrics_json,
+    write_metrics_prometheus,
+)
+
+def test_latency_histogram_is_cumulative():
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for value in [0.05, 0.1, 0.5, 3.0]:
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.65)
+
+def test_stage_records_time_rows_and_rate():
+    metrics = PipelineMetrics()
+    with metrics.stage("transform") as stage:
+        stage.rows = 100
+
+    with pytest.raises(RuntimeError):
+        with metrics.stage("load"):
+            raise RuntimeError("Simulated load failure")
+
+    transform_stage, load_stage = metrics.report()["stages"]
+    assert transform_stage["stage"] == "transform"
+    assert transform_stage["rows"] == 100
+    assert transform_stage["rows_per_second"] > 0
+    # Tahap yang gagal tetap tercatat waktunya
+    assert load_stage["stage"] == "load"
+    assert load_stage["rows"] is None
+    assert load_stage["rows_per_second"] is None
+
+def test_reset_clears_previous_run():
+    metrics = PipelineMetrics()
+    metrics.record_page(1, 0.2, 20, 20)
+    with metrics.stage("extract"):
+        pass
+
+    metrics.reset()
+
+    report = metrics.report()
+    assert report["stages"] == []
+    assert report["pages"]["count"] == 0
+
+def _sample_report():
+    metrics = PipelineMetrics()
+    with metrics.stage("extract") as stage:
+        stage.rows = 40
+    metrics.record_page(2, 0.3, 20, 20)
+    metrics.record_page(1, 0.07, 20, 20)
+    request_histogram = LatencyHistogram()
+    request_histogram.observe(0.2)
+    return metrics.report({
+        "requests": 2, "failures": 0, "not_modified": 1, "bytes_downloaded": 2048,
+        "total_latency": 0.2, "avg_latency": 0.1, "latency_histogram": request_histogram.snapshot(),
+    })
+
+def test_report_pages_sorted_by_page_number():
+    report = _sample_report()
+    assert [page["page"] for page in report["pages"]["records"]] == [1, 2]
+    assert report["pages"]["wall_time"]["count"] == 2
+
+def test_format_prometheus_exposition():
+    text = format_prometheus(_sample_report())
+
+    assert '# TYPE etl_stage_seconds gauge' in text
+    assert 'etl_stage_rows{stage="extract"} 40' in text
+    assert 'etl_page_duration_seconds_bucket{le="0.1"} 1' in text
+    assert 'etl_page_duration_seconds_bucket{le="+Inf"} 2' in text
+    assert 'etl_request_latency_seconds_count 1' in text
+    assert 'etl_bytes_downloaded 2048' in text
+    assert text.endswith("\n")
+
+def test_write_metrics_files(tmp_path):
+    report = _sample_report()
+    json_path = tmp_path / "out" / "metrics.json"
+    prometheus_path = tmp_path / "etl.prom"
+
+    assert write_metrics_json(report, str(json_path)) is True
+    assert write_metrics_prometheus(report, str(prometheus_path)) is True
+
+    assert json.loads(json_path.read_text()) == report
+    assert prometheus_path.read_text() == format_prometheus(report)
+    assert not (tmp_path / "etl.prom.tmp").exists()
@@ -0,0 +1,154 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from utils.extract import extract_product_details
+from utils.parsing import parse_page, parse_page_with_selectors, validate_selectors, available_backends, resolve_backend
+from benchmarks.synthetic import make_page_html
+
+BACKENDS = ["bs4", "lxml", "selectolax"]
+
+# Kartu yang sama dengan fixture di test_extract.py, ditambah beberapa kasus harga
+CARD_FIXTURES = [
+    """
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">Awesome T-Shirt</h3>
+            <div class="price-container"><span class="price">$29.99</span></div>
+            <p>Rating: ⭐ 4.5 / 5</p>
+            <p>3 Colors</p>
+            <p>Size: L</p>
+            <p>Gender: Unisex</p>
+        </div>
+    </div>
+    """,
+    """
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">Basic Shirt</h3>
+            </div>
+    </div>
+    """,
+    """
+    <div class="collection-card">
+        <h3 class="product-title-outside">Shirt No Details Div</h3>
+    </div>
+    """,
+    """
+    <div class="collection-card">
+        <div class="product-details">
+            <div class="price-container"><span class="price">$29.99</span></div>
+        </div>
+    </div>
+    """,
+    """
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">Unavailable Price Shirt</h3>
+            <p class="price">Price Unavailable</p>
+        </div>
+    </div>
+    """,
+    """
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">Unknown Product</h3>
+            <div class="price-container"><span class="price-tag">$10</span></div>
+            <p>Rating: ⭐ Invalid Rating / 5</p>
+            <p>5 Colors</p>
+            <p>Size: M</p>
+            <p>Gender: Women</p>
+        </div>
+    </div>
+    """,
+    """
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">Fallback Price</h3>
+            <span>Price Unavailable</span>
+            <p>Rating: Not Rated</p>
+        </div>
+    </div>
+    """,
+]
+
+def _backend_or_skip(backend):
+    if backend not in available_backends():
+        pytest.skip(f"Library untuk backend {backend} tidak terpasang")
+    return backend
+
+def _expected_records(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    records = [extract_product_details(card) for card in soup.find_all('div', class_='collection-card')]
+    return [record for record in records if record and record.get('title')]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_parse_page_matches_extract_product_details(backend):
+    _backend_or_skip(backend)
+    html = "<html><body>" + "".join(CARD_FIXTURES) + "</body></html>"
+
+    products, card_count, has_next = parse_page(html.encode('utf-8'), backend)
+
+    assert card_count == len(CARD_FIXTURES)
+    assert products == _expected_records(html)
+    assert has_next is None # tidak ada pagination
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("nav_html, expected", [
+    ('<ul class="pagination"><li class="page-item next"><a class="page-link" href="/page2">Next</a></li></ul>', True),
+    ('<ul class="pagination"><li class="page-item next disabled"><span>Next</span></li></ul>', False),
+    ('<ul class="pagination"><li class="page-item current"><span>Page 50 of 50</span></li></ul>', False),
+    ('<nav class="pagination"><a href="/page3">Next &raquo;</a></nav>', True),
+])
+def test_parse_page_reads_pagination(backend, nav_html, expected):
+    _backend_or_skip(backend)
+    html = f"<html><body>{CARD_FIXTURES[0]}{nav_html}</body></html>"
+
+    _, _, has_next = parse_page(html.encode('utf-8'), backend)
+
+    assert has_next is expected
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_parse_page_empty_document(backend):
+    _backend_or_skip(backend)
+    assert parse_page(b"", backend) == ([], 0, None)
+
+def test_resolve_backend_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        resolve_backend("regex")
+
+def test_resolve_backend_falls_back_when_library_missing(monkeypatch):
+    monkeypatch.setattr('utils.parsing.available_backends', lambda: ["bs4"])
+    assert resolve_backend("selectolax") == "bs4"
+
+# --- Tes untuk parser berbasis selector CSS ---
+
+SITE_SELECTORS = {
+    'card': 'div.collection-card', 'title': 'h3.product-title', 'price': 'span.price',
+    'rating': 'div.product-details p:nth-of-type(1)', 'colors': 'div.product-details p:nth-of-type(2)',
+    'size': 'div.product-details p:nth-of-type(3)', 'gender': 'div.product-details p:nth-of-type(4)',
+    'next': 'ul.pagination li.next a',
+}
+
+@pytest.mark.parametrize("page_num, expected_next", [(1, True), (3, False)])
+def test_parse_page_with_selectors_matches_parse_page(page_num, expected_next):
+    html = make_page_html(page_num, n_cards=6, total_pages=3, dirty_ratio=0).encode('utf-8')
+    products, card_count, has_next = parse_page_with_selectors(html, SITE_SELECTORS)
+    assert (products, card_count) == parse_page(html)[:2]
+    assert has_next is expected_next
+
+def test_parse_page_with_selectors_missing_fields():
+    html = b'<div class="item"><h2> Topi </h2></div><div class="item"><span>tanpa judul</span></div>'
+    products, card_count, has_next = parse_page_with_selectors(html, {'card': 'div.item', 'title': 'h2', 'price': 'b'})
+    assert card_count == 2
+    assert products == [{'title': "Topi", 'price': None, 'rating': None, 'colors': None, 'size': None, 'gender': None}]
+    assert has_next is None
+
+@pytest.mark.parametrize("selectors", [
+    {'title': 'h2'},
+    {'card': 'div.item', 'judul': 'h2'},
+    {'card': 'div['},
+    "div.item",
+])
+def test_validate_selectors_rejects_invalid_config(selectors):
+    with pytest.raises(ValueError):
+        validate_selectors(selectors)
@@ -0,0 +1,92 @@
+import os
+
+import pandas as pd
+import pytest
+
+from utils.raw_cache import content_key, list_raw_entries, load_raw, store_raw, BLOB_DIRNAME
+
+SOURCE = "https://fashion-studio.dicoding.dev/"
+
+@pytest.fixture
+def raw_df():
+    """DataFrame mentah seperti hasil extract_data_from_website (semua kolom string)."""
+    return pd.DataFrame({
+        'title': ["T-shirt 1", "Unknown Product", "Jacket 3"],
+        'price': ["$20.00", "Price Unavailable", "$55.50"],
+        'rating': ["Rating: ⭐ 4.5 / 5", "Rating: ⭐ Invalid Rating / 5", "Rating: ⭐ 3.9 / 5"],
+        'colors': ["3 Colors", "5 Colors", "1 Colors"],
+        'size': ["Size: M", "Size: L", "Size: XL"],
+        'gender': ["Gender: Men", "Gender: Women", "Gender: Unisex"],
+        'timestamp': ["2024-05-25 10:00:00"] * 3,
+    })
+
+def _blobs(cache_dir):
+    return sorted(os.listdir(os.path.join(cache_dir, BLOB_DIRNAME)))
+
+def test_store_and_load_round_trip(raw_df, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    digest = store_raw(raw_df, SOURCE, "2024-05-25", cache_dir=cache_dir)
+
+    assert digest == content_key(raw_df)
+    pd.testing.assert_frame_equal(load_raw(SOURCE, "2024-05-25", cache_dir=cache_dir), raw_df, check_dtype=False)
+    assert load_raw(SOURCE, "2024-05-26", cache_dir=cache_dir) is None
+    assert load_raw("https://lain.example/", cache_dir=cache_dir) is None
+
+def test_identical_content_stored_once(raw_df, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    store_raw(raw_df, SOURCE, "2024-05-25", cache_dir=cache_dir)
+    store_raw(raw_df.copy(), SOURCE, "2024-05-26", cache_dir=cache_dir)
+
+    assert len(_blobs(cache_dir)) == 1
+    assert [entry['date'] for entry in list_raw_entries(cache_dir, SOURCE)] == ["2024-05-25", "2024-05-26"]
+
+def test_content_key_changes_with_content(raw_df):
+    changed = raw_df.copy()
+    changed.loc[0, 'price'] = "$21.00"
+    assert content_key(changed) != content_key(raw_df)
+    assert content_key(raw_df.iloc[::-1]) != content_key(raw_df)
+
+def test_load_latest_date_by_default(raw_df, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    store_raw(raw_df.iloc[:1], SOURCE, "2024-05-26", cache_dir=cache_dir)
+    store_raw(raw_df, SOURCE, "2024-05-25", cache_dir=cache_dir)
+    assert len(load_raw(SOURCE, cache_dir=cache_dir)) == 1
+
+def test_rerun_same_day_replaces_entry(raw_df, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    store_raw(raw_df, SOURCE, "2024-05-25", cache_dir=cache_dir)
+    store_raw(raw_df.iloc[:2], SOURCE, "2024-05-25", cache_dir=cache_dir)
+
+    assert len(_blobs(cache_dir)) == 1, "Blob yang tidak lagi dirujuk seharusnya dihapus"
+    assert len(load_raw(SOURCE, "2024-05-25", cache_dir=cache_dir)) == 2
+
+def test_eviction_removes_least_recently_used(raw_df, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    frames = {date: raw_df.assign(timestamp=f"{date} 10:00:00") for date in ["2024-05-25", "2024-05-26", "2024-05-27"]}
+    store_raw(frames["2024-05-25"], SOURCE, "2024-05-25", cache_dir=cache_dir)
+    blob_size = os.path.getsize(os.path.join(cache_dir, BLOB_DIRNAME, _blobs(cache_dir)[0]))
+    max_bytes = int(blob_size * 2.5)
+    store_raw(frames["2024-05-26"], SOURCE, "2024-05-26", cache_dir=cache_dir, max_bytes=max_bytes)
+    # Entri 25 baru saja dipakai, jadi entri 26 yang dihapus saat entri ketiga masuk
+    load_raw(SOURCE, "2024-05-25", cache_dir=cache_dir)
+    store_raw(frames["2024-05-27"], SOURCE, "2024-05-27", cache_dir=cache_dir, max_bytes=max_bytes)
+
+    assert [entry['date'] for entry in list_raw_entries(cache_dir)] == ["2024-05-25", "2024-05-27"]
+    assert len(_blobs(cache_dir)) == 2
+
+def test_entry_larger_than_limit_is_kept(raw_df, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    assert store_raw(raw_df, SOURCE, "2024-05-25", cache_dir=cache_dir, max_bytes=1) is not None
+    assert load_raw(SOURCE, "2024-05-25", cache_dir=cache_dir) is not None
+
+def test_store_empty_dataframe(tmp_path):
+    cache_dir = tmp_path / "cache"
+    assert store_raw(pd.DataFrame(), SOURCE, cache_dir=str(cache_dir)) is None
+    assert not cache_dir.exists()
+
+def test_store_without_pyarrow_uses_pickle(raw_df, tmp_path, monkeypatch):
+    monkeypatch.setattr('utils.raw_cache.pyarrow', None)
+    cache_dir = str(tmp_path / "cache")
+    store_raw(raw_df, SOURCE, "2024-05-25", cache_dir=cache_dir)
+    assert _blobs(cache_dir)[0].endswith(".pkl")
+    pd.testing.assert_frame_equal(load_raw(SOURCE, "2024-05-25", cache_dir=cache_dir), raw_df)
@@ -0,0 +1,67 @@
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.rules import RuleError, WHITESPACE_CHARS, compile_rules, load_rules
+from utils.transform import DEFAULT_CLEANING_RULES, compile_cleaning_rules, transform_data
+
+def test_whitespace_chars_match_str_isspace():
+    assert set(WHITESPACE_CHARS) == {chr(c) for c in range(sys.maxunicode + 1) if chr(c).isspace()}
+
+def test_rules_for_new_site_without_python_functions():
+    # Situs lain: harga "€1.234,50", rating "8/10", warna sebagai teks
+    rules = compile_rules({
+        'price': ["strip", ["reject_equals", ["sold out"]], ["replace", {"€": "", ".": "", ",": "."}],
+                  "to_float", ["multiply", "eur_to_idr_rate"]],
+        'rating': [["extract", r"(\d+)/10"], "to_float", ["multiply", 0.5]],
+        'size': [["remove_pattern", r"(?i)^ukuran\s*"], "strip", "empty_to_null"],
+    }, {'eur_to_idr_rate': 17000})
+
+    prices = rules['price'](pd.Series(["€1.234,50", " Sold Out ", None, "€10,00"]))
+    assert prices.tolist()[0] == 1234.5 * 17000
+    assert np.isnan(prices[1]) and np.isnan(prices[2])
+    assert rules['rating'](pd.Series(["8/10", "-"])).tolist()[0] == 4.0
+    assert rules['size'](pd.Series(["UKURAN xl", "Ukuran ", "M"])).tolist() == ["xl", None, "M"]
+
+def test_lowercase_matches_python_for_non_ascii():
+    # "İ".lower() di Python menjadi dua karakter, berbeda dengan case mapping Arrow
+    rule = compile_rules({'title': [["reject_equals", ["pi"]]]})['title']
+    assert rule(pd.Series(["PI", "Pİ", "pi"])).tolist() == [None, "Pİ", None]
+
+def test_to_int_dtype_follows_nulls():
+    rule = compile_rules({'colors': [["extract", r"(\d+)"], "to_int"]})['colors']
+    assert rule(pd.Series(["3 Colors", "1 Color"])).dtype == 'int64'
+    assert rule(pd.Series(["3 Colors", "Many"])).dtype == 'float64'
+
+@pytest.mark.parametrize("rules", [
+    {'price': ["lowercase_everything"]},
+    {'price': [["multiply", 2]]},
+    {'price': ["to_float", ["multiply", "kurs_tidak_ada"]]},
+    {'price': ["to_float", "strip"]},
+    {'price': [["extract", r"\d+"]]},
+    {'price': [["remove_pattern", "("]]},
+    {'price': [["reject_equals", "bukan list"]]},
+    {'price': [["replace", "$"]]},
+    ["bukan dict"],
+])
+def test_invalid_rules_raise(rules):
+    with pytest.raises(RuleError):
+        compile_rules(rules)
+
+def test_load_rules_from_json(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(DEFAULT_CLEANING_RULES))
+    assert load_rules(str(path)) == json.loads(json.dumps(DEFAULT_CLEANING_RULES))
+    assert load_rules(str(tmp_path / "tidak_ada.json")) is None
+
+def test_transform_data_with_configured_rate():
+    raw = pd.DataFrame({
+        'title': ["Topi"], 'price': ["$2.00"], 'rating': ["4.0 / 5"], 'colors': ["1 Colors"],
+        'size': ["Size: M"], 'gender': ["Gender: Men"], 'timestamp': ["2024-05-25 10:00:00"],
+    })
+    result = transform_data(raw, rules=compile_cleaning_rules(usd_to_idr_rate=15000))
+    assert result['price'].tolist() == [30000.0]
+    assert result['size'].tolist() == ["M"]
@@ -10,7 +10,12 @@ from utils.transform import (
     clean_size,
     clean_gender,
     transform_data,
-    USD_TO_IDR_RATE
+    transform_batches,
+    COLUMN_CLEANERS,
+    USD_TO_IDR_RATE,
+    to_compact_schema,
+    to_output_schema,
+    memory_report
 )
 
 # --- Tes untuk Fungsi Pembersihan Individual ---
@@ -193,4 +198,121 @@ def test_transform_data_astype_exception_handling(sample_raw_df):
                 'colors': [3], 'size': ["M"], 'gender': ["Men"], 
                 'timestamp': ["ts"]
             })
-            pass
\ No newline at end of file
+            pass
+
+# --- Tes untuk jalur vektor (cleaner per kolom) ---
+
+DIRTY_VALUES = [
+    "   Awesome T-Shirt   ", "Unknown Product", "unknown product  ", "product.jpeg", "Image.PNG",
+    "$25.00", " $ 10.50 ", "$1,250.99", "Price Unavailable", "invalid price", "image.png", "$1_000",
+    "Rating: ⭐ 4.5 / 5", "Rating: ⭐ Invalid Rating / 5", "Not Rated", "Some text 2.5 another text", "rating.jpg",
+    "3 Colors", "  5 Colors available ", "Colors: Many", "٣ Colors",
+    "Size: L  ", "size:XXL", "M", "  ", "", "Gender: Men", "  Gender: Unisex  ", "GENDER: Women",
+    None, np.nan, 3, 2.5,
+]
+
+@pytest.mark.parametrize("column", list(COLUMN_CLEANERS))
+def test_column_cleaner_matches_scalar_cleaner(column):
+    scalar_cleaner, column_cleaner = COLUMN_CLEANERS[column]
+    series = pd.Series(DIRTY_VALUES * 3, dtype=object)
+
+    expected = series.apply(scalar_cleaner)
+    result = column_cleaner(series)
+
+    assert len(result) == len(expected)
+    for value, got, want in zip(series, result, expected):
+        if pd.isna(want):
+            assert pd.isna(got), f"{column}({value!r}) seharusnya null, didapat {got!r}"
+        else:
+            assert got == want and type(got) == type(want), f"{column}({value!r}): {got!r} != {want!r}"
+
+def test_column_cleaners_accept_string_dtype():
+    series = pd.Series(["Size: L", None, "Size: M"], dtype="string")
+    assert COLUMN_CLEANERS['size'][1](series).tolist() == ["L", None, "M"]
+
+def test_clean_colors_column_dtype_follows_nulls():
+    assert COLUMN_CLEANERS['colors'][1](pd.Series(["3 Colors", "1 Color"])).dtype == 'int64'
+    assert COLUMN_CLEANERS['colors'][1](pd.Series(["3 Colors", "Many"])).dtype == 'float64'
+
+def test_transform_data_vectorized_matches_scalar_path(sample_raw_df):
+    df_dirty = pd.concat([sample_raw_df, pd.DataFrame({
+        'title': ["Kemeja Polos", None, "Topi"],
+        'price': ["$15.50", "$9.00", "$1,000.25"],
+        'rating': ["invalid.png", "4.0 / 5", "Rating: 3.9 / 5"],
+        'colors': ["4 Colors", "2 Colors", "6 Colors"],
+        'size': ["Size: M", "Size: S", "size: XXL"],
+        'gender': ["Gender: Men", "Gender: Women", "Gender: Unisex"],
+        'timestamp': ["2024-05-25 10:00:00"] * 3,
+    })], ignore_index=True)
+
+    expected = transform_data(df_dirty.copy(), vectorized=False)
+    result = transform_data(df_dirty.copy(), vectorized=True)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+# --- Tes untuk mode streaming ---
+
+def test_transform_batches_matches_full_transform(sample_raw_df):
+    # Baris pertama muncul lagi di batch berikutnya dengan format mentah yang berbeda
+    extra = pd.DataFrame({
+        'title': ["  T-shirt Keren ", "Jaket Bagus", "Topi Baru"],
+        'price': ["$25.00", "$50.99", "$12.00"],
+        'rating': ["Rating: 4.5 / 5", "4.0 / 5", "Rating: 4.1 / 5"],
+        'colors': ["3 Colors", "5 Colors", "2 Colors"],
+        'size': ["L", "Size: XL", "Size: S"],
+        'gender': ["Men", "Gender: Women", "Gender: Women"],
+        'timestamp': ["2024-05-25 10:00:00"] * 3,
+    })
+    batches = [sample_raw_df.iloc[:3], sample_raw_df.iloc[3:], extra]
+
+    expected = transform_data(pd.concat(batches, ignore_index=True))
+    result = pd.concat(list(transform_batches(batches)), ignore_index=True)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result['title'].tolist().count("T-shirt Keren") == 1
+
+def test_transform_batches_skips_empty_batches():
+    batches = [pd.DataFrame({'title': ["Unknown Product"], 'timestamp': ["ts"]}), pd.DataFrame()]
+    assert list(transform_batches(batches)) == []
+
+
+# --- Tes untuk skema compact ---
+
+def test_transform_data_compact_dtypes(sample_raw_df):
+    df_compact = transform_data(sample_raw_df.copy(), compact=True)
+    assert isinstance(df_compact['size'].dtype, pd.CategoricalDtype)
+    assert isinstance(df_compact['gender'].dtype, pd.CategoricalDtype)
+    assert df_compact['timestamp'].dtype == 'datetime64[s]'
+    assert df_compact['colors'].dtype == 'int8'
+
+def test_compact_schema_round_trip_is_lossless(sample_raw_df):
+    standard = transform_data(sample_raw_df.copy())
+    compact = to_compact_schema(standard)
+    pd.testing.assert_frame_equal(to_output_schema(compact), standard)
+    assert memory_report(compact)['bytes_per_row'] < memory_report(standard)['bytes_per_row']
+
+def test_compact_float32_only_when_lossless():
+    exact = pd.DataFrame({'price': [400000.0, 816000.0], 'rating': [4.5, 3.0]})
+    inexact = pd.DataFrame({'price': [815840.0, 0.1], 'rating': [4.8, 3.9]})
+    assert (to_compact_schema(exact).dtypes == 'float32').all()
+    assert (to_compact_schema(inexact).dtypes == 'float64').all()
+
+def test_compact_keeps_unparsable_timestamp_as_text():
+    df = pd.DataFrame({'timestamp': ["2024-05-25 10:00:00", "kemarin"]})
+    compact = to_compact_schema(df)
+    assert isinstance(compact['timestamp'].dtype, pd.CategoricalDtype)
+    assert to_output_schema(compact)['timestamp'].tolist() == ["2024-05-25 10:00:00", "kemarin"]
+
+def test_memory_report_columns():
+    report = memory_report(pd.DataFrame({'colors': np.array([1, 2, 3], dtype=np.int8)}))
+    assert report == {"rows": 3, "bytes": 3, "bytes_per_row": 1.0, "columns": {"colors": 1.0}}
+
+def test_transform_data_keeps_same_product_from_different_sources():
+    raw = pd.DataFrame({
+        'title': ["Topi", "Topi", "Topi"], 'price': ["$2.00"] * 3, 'rating': ["4.0 / 5"] * 3,
+        'colors': ["1 Colors"] * 3, 'size': ["Size: M"] * 3, 'gender': ["Gender: Men"] * 3,
+        'timestamp': ["2024-05-25 10:00:00"] * 3, 'source': ["toko-a", "toko-b", "toko-a"],
+    })
+    result = transform_data(raw)
+    assert result['source'].tolist() == ["toko-a", "toko-b"]
@@ -0,0 +1,225 @@
+"""
+Change-data-capture antar run ETL.
+
+Setiap produk diidentifikasi dengan hash PRODUCT_KEY_COLUMNS dan isinya dengan hash
+PRODUCT_COLUMNS (timestamp tidak ikut, jadi run ulang tanpa perubahan tidak dianggap update).
+Hash run sebelumnya disimpan sebagai array .npy terurut (key, row, offset) 24 byte per
+produk yang dibuka dengan memory-map, ditambah file rows.jsonl berisi baris lengkap
+run sebelumnya agar produk yang hilang bisa dikeluarkan sebagai delete tanpa membaca
+seluruh snapshot lama.
+"""
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from utils.transform import OUTPUT_DTYPES, PRODUCT_COLUMNS, PRODUCT_KEY_COLUMNS, SOURCE_COLUMN, identity_columns, to_output_schema
+
+CDC_INDEX_DIR = ".cdc_index"
+INDEX_FILENAME = "hash_index.npy"
+ROWS_FILENAME = "rows.jsonl"
+META_FILENAME = "meta.json"
+# rows.jsonl ditulis ulang penuh jika jumlah barisnya melebihi COMPACT_RATIO x jumlah produk
+COMPACT_RATIO = 2
+# Kolom jenis perubahan pada output CDC: insert, update atau delete
+CHANGE_COLUMN = "change"
+INDEX_DTYPE = np.dtype([('key', '<u8'), ('row', '<u8'), ('offset', '<u8')])
+
+ChangeSet = namedtuple('ChangeSet', ['inserts', 'updates', 'deletes'])
+
+def _hash_column(series, col):
+    values = series.astype(OUTPUT_DTYPES.get(col, 'object')).to_numpy()
+    # categorize=False: tanpa factorize, lebih cepat untuk kolom dengan banyak nilai unik seperti title
+    return pd.util.hash_array(values, categorize=False)
+
+def _combine_hashes(column_hashes):
+    result = np.full(len(column_hashes[0]), 0x345678, dtype=np.uint64)
+    for i, column_hash in enumerate(column_hashes):
+        # Perkalian uint64 sengaja overflow (modulo 2**64)
+        result = (result ^ column_hash) * np.uint64(1000003 + 2 * i)
+    return result
+
+def _product_hashes(df):
+    """
+    Hash key (PRODUCT_KEY_COLUMNS) dan hash isi (PRODUCT_COLUMNS) dengan satu hash per kolom;
+    pada mode multi-sumber SOURCE_COLUMN ikut di keduanya.
+    """
+    row_columns = identity_columns(df, PRODUCT_COLUMNS)
+    column_hashes = {col: _hash_column(df[col], col) for col in row_columns}
+    key_hashes = _combine_hashes([column_hashes[col] for col in identity_columns(df, PRODUCT_KEY_COLUMNS)])
+    row_hashes = _combine_hashes([column_hashes[col] for col in row_columns])
+    return key_hashes, row_hashes
+
+def _index_paths(index_dir):
+    return os.path.join(index_dir, INDEX_FILENAME), os.path.join(index_dir, ROWS_FILENAME)
+
+def _unique_products(df):
+    """
+    Produk dengan key yang sama: yang terakhir dipakai, sama seperti upsert di utils.load.
+    Mengembalikan (df, key_hashes, row_hashes) tanpa key ganda.
+    """
+    df = df.reset_index(drop=True)
+    key_hashes, row_hashes = _product_hashes(df)
+    keep = ~pd.Series(key_hashes).duplicated(keep='last').to_numpy()
+    if not keep.all():
+        df = df[keep].reset_index(drop=True)
+        key_hashes, row_hashes = key_hashes[keep], row_hashes[keep]
+    return df, key_hashes, row_hashes
+
+def load_hash_index(index_dir=CDC_INDEX_DIR):
+    """Memuat hash index run sebelumnya (memory-mapped). Array kosong jika belum ada."""
+    index_path, _ = _index_paths(index_dir)
+    if not os.path.exists(index_path) or os.path.getsize(index_path) == 0:
+        return np.empty(0, dtype=INDEX_DTYPE)
+    index = np.load(index_path, mmap_mode='r')
+    if index.dtype != INDEX_DTYPE:
+        raise ValueError(f"Format hash index tidak dikenali di {index_path}: {index.dtype}")
+    return index
+
+def _read_rows(rows_path, offsets):
+    """Membaca baris lengkap run sebelumnya pada offset byte tertentu di rows.jsonl."""
+    columns = [col for col in OUTPUT_DTYPES] + [SOURCE_COLUMN]
+    if len(offsets) == 0:
+        return pd.DataFrame(columns=list(OUTPUT_DTYPES)).astype(OUTPUT_DTYPES)
+    records = []
+    with open(rows_path, 'rb') as f:
+        for offset in np.sort(offsets):
+            f.seek(int(offset))
+            records.append(json.loads(f.readline()))
+    df = pd.DataFrame.from_records(records)
+    columns = [col for col in columns if col in df.columns]
+    return df[columns].astype({col: OUTPUT_DTYPES[col] for col in columns if col in OUTPUT_DTYPES})
+
+def _lookup(sorted_keys, keys):
+    """
+    Mencari keys di sorted_keys (terurut). keys diurutkan dulu agar pencarian biner
+    berjalan berurutan di memori, lalu hasilnya dikembalikan ke urutan semula.
+    Mengembalikan (mask ditemukan, posisi di sorted_keys).
+    """
+    found = np.zeros(len(keys), dtype=bool)
+    positions = np.zeros(len(keys), dtype=np.intp)
+    if len(sorted_keys) == 0 or len(keys) == 0:
+        return found, positions
+    order = np.argsort(keys, kind='stable')
+    sorted_positions = np.minimum(np.searchsorted(sorted_keys, keys[order]), len(sorted_keys) - 1)
+    positions[order] = sorted_positions
+    found[order] = sorted_keys[sorted_positions] == keys[order]
+    return found, positions
+
+def compute_changes(df, index_dir=CDC_INDEX_DIR):
+    """
+    Membandingkan DataFrame hasil transform_data dengan hash index run sebelumnya.
+    Mengembalikan ChangeSet(inserts, updates, deletes) berupa DataFrame; index belum
+    diperbarui sampai commit_hash_index dipanggil.
+    """
+    df, key_hashes, row_hashes = _unique_products(df)
+
+    index = load_hash_index(index_dir)
+    # Salinan kontigu kolom key (8 byte per produk) jauh lebih cepat dicari daripada field bertingkat
+    old_keys = np.ascontiguousarray(index['key'])
+    found, positions = _lookup(old_keys, key_hashes)
+    changed = np.zeros(len(df), dtype=bool)
+    changed[found] = index['row'][positions[found]] != row_hashes[found]
+
+    present, _ = _lookup(np.sort(key_hashes), old_keys)
+    deleted_offsets = np.asarray(index['offset'][~present])
+    del index # tutup memory-map sebelum index ditulis ulang
+
+    _, rows_path = _index_paths(index_dir)
+    return ChangeSet(
+        inserts=df[~found].reset_index(drop=True),
+        updates=df[changed].reset_index(drop=True),
+        deletes=_read_rows(rows_path, deleted_offsets),
+    )
+
+def changes_to_dataframe(changes):
+    """Menggabungkan ChangeSet menjadi satu DataFrame dengan kolom CHANGE_COLUMN di depan."""
+    frames = []
+    for change_type, frame in [('insert', changes.inserts), ('update', changes.updates), ('delete', changes.deletes)]:
+        if not frame.empty:
+            frames.append(to_output_schema(frame).assign(**{CHANGE_COLUMN: change_type}))
+    if not frames:
+        return pd.DataFrame(columns=[CHANGE_COLUMN] + list(OUTPUT_DTYPES))
+    combined = pd.concat(frames, ignore_index=True)
+    return combined[[CHANGE_COLUMN] + [col for col in combined.columns if col != CHANGE_COLUMN]]
+
+def _read_meta(index_dir):
+    meta_path = os.path.join(index_dir, META_FILENAME)
+    if not os.path.exists(meta_path):
+        return {}
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _encode_rows(df):
+    """Baris JSON per produk (encoder C milik pandas). Mengembalikan (bytes, panjang tiap baris)."""
+    if df.empty:
+        return b"", np.empty(0, dtype=np.uint64)
+    columns = identity_columns(df, [col for col in OUTPUT_DTYPES if col in df.columns])
+    data = to_output_schema(df[columns]).to_json(orient='records', lines=True, force_ascii=False, double_precision=15).encode('utf-8')
+    if not data.endswith(b'\n'):
+        data += b'\n'
+    # String JSON tidak pernah berisi newline mentah, jadi setiap b"\n" adalah akhir baris
+    line_ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n')).astype(np.uint64)
+    return data, np.diff(line_ends + 1, prepend=np.uint64(0))
+
+def _replace_file(path, data):
+    with open(f"{path}.tmp", 'wb') as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+
+def commit_hash_index(df, index_dir=CDC_INDEX_DIR):
+    """
+    Menyimpan snapshot df sebagai hash index untuk run berikutnya. Dipanggil setelah
+    perubahan berhasil ditulis, agar run yang gagal bisa diulang dengan delta yang sama.
+    Hanya produk baru/berubah yang ditambahkan ke rows.jsonl; file ditulis ulang penuh
+    jika baris usangnya sudah melebihi COMPACT_RATIO kali jumlah produk.
+    """
+    try:
+        os.makedirs(index_dir, exist_ok=True)
+        index_path, rows_path = _index_paths(index_dir)
+        df, key_hashes, row_hashes = _unique_products(df)
+
+        # Produk yang tidak berubah tetap menunjuk ke baris lamanya di rows.jsonl
+        index = load_hash_index(index_dir)
+        found, positions = _lookup(np.ascontiguousarray(index['key']), key_hashes)
+        reuse = found.copy()
+        reuse[found] = index['row'][positions[found]] == row_hashes[found]
+        offsets = np.zeros(len(df), dtype=np.uint64)
+        offsets[reuse] = index['offset'][positions[reuse]]
+        del index # tutup memory-map sebelum index ditulis ulang
+
+        rows_written = _read_meta(index_dir).get('rows_written', 0)
+        compact = not os.path.exists(rows_path) or rows_written + int((~reuse).sum()) > COMPACT_RATIO * len(df)
+        if compact:
+            reuse[:] = False
+            rows_written = 0
+        to_write = np.flatnonzero(~reuse)
+        data, line_lengths = _encode_rows(df.iloc[to_write])
+        base = 0 if compact else os.path.getsize(rows_path)
+        offsets[to_write] = np.uint64(base) + np.cumsum(line_lengths) - line_lengths
+
+        if compact:
+            _replace_file(rows_path, data)
+        else:
+            # Append aman: index lama tetap menunjuk ke baris lama sampai index baru menggantikannya
+            with open(rows_path, 'ab') as f:
+                f.write(data)
+
+        order = np.argsort(key_hashes, kind='stable')
+        new_index = np.empty(len(df), dtype=INDEX_DTYPE)
+        new_index['key'] = key_hashes[order]
+        new_index['row'] = row_hashes[order]
+        new_index['offset'] = offsets[order]
+        with open(f"{index_path}.tmp", 'wb') as f:
+            np.save(f, new_index)
+        os.replace(f"{index_path}.tmp", index_path)
+        meta = {'rows_written': rows_written + len(to_write), 'products': len(new_index)}
+        _replace_file(os.path.join(index_dir, META_FILENAME), json.dumps(meta).encode('utf-8'))
+
+        print(f"Hash index CDC diperbarui: {len(new_index)} produk, {len(to_write)} baris ditulis di {index_dir}")
+        return True
+    except Exception as e:
+        print(f"Gagal menyimpan hash index CDC di {index_dir}: {e}")
+        return False
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""
+Runner DAG kecil untuk pipeline ETL.
+
+Setiap tahap dideklarasikan dengan nama, fungsi, dan daftar tahap yang menjadi inputnya;
+fungsi dipanggil dengan output tahap-tahap tersebut sesuai urutan deps. Tahap yang
+dependensinya sudah selesai langsung dijalankan di thread pool, sehingga sink yang saling
+independen (CSV, Parquet, database, ...) berjalan bersamaan.
+
+Tahap dianggap gagal jika melempar exception atau mengembalikan None, False, atau
+DataFrame kosong; tahap yang bergantung padanya dilewati. Output tahap dengan cache=True
+disimpan (pickle) di cache_dir agar satu tahap bisa dijalankan ulang sendiri lewat run_stage.
+
+Fungsi tahap boleh berupa coroutine function (async def). run_async menjalankannya di event
+loop pemanggil dan tahap biasa di thread pool lewat run_in_executor; run dan run_stage
+menjalankan tahap coroutine dengan event loop sendiri di thread tahap tersebut.
+"""
+import asyncio
+import inspect
+import os
+import pickle
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+
+import pandas as pd
+
+STAGE_CACHE_DIR = ".stage_cache"
+# Jumlah tahap yang boleh berjalan bersamaan
+DAG_MAX_WORKERS = 4
+
+Stage = namedtuple('Stage', ['name', 'func', 'deps', 'cache'])
+
+def _is_failure(output):
+    if output is None or output is False:
+        return True
+    return isinstance(output, pd.DataFrame) and output.empty
+
+def _count_rows(output, inputs):
+    """Jumlah baris untuk metrik: panjang DataFrame output, atau input pertama untuk sink."""
+    if isinstance(output, pd.DataFrame):
+        return len(output)
+    if isinstance(output, int) and not isinstance(output, bool):
+        return output
+    for value in inputs:
+        if isinstance(value, pd.DataFrame):
+            return len(value)
+    return None
+
+class Pipeline:
+    def __init__(self, cache_dir=STAGE_CACHE_DIR, max_workers=DAG_MAX_WORKERS, metrics=None):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.metrics = metrics
+        self.stages = {}
+
+    def add_stage(self, name, func, deps=(), cache=False):
+        if name in self.stages:
+            raise ValueError(f"Tahap '{name}' sudah terdaftar")
+        self.stages[name] = Stage(name, func, tuple(deps), cache)
+        return self
+
+    def topological_order(self):
+        """Urutan tahap sesuai dependensi (urutan pendaftaran dipertahankan bila memungkinkan)."""
+        order, visiting, done = [], set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name not in self.stages:
+                raise ValueError(f"Tahap '{path[-1]}' bergantung pada tahap yang tidak dikenal: '{name}'")
+            if name in visiting:
+                raise ValueError(f"Dependensi melingkar: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    # --- Cache output tahap ---
+
+    def _cache_path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+
+    def _store_cache(self, name, output):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._cache_path(name)
+            with open(f"{path}.tmp", 'wb') as f:
+                pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f"{path}.tmp", path)
+        except Exception as e:
+            print(f"Gagal menyimpan cache output tahap {name}: {e}")
+
+    def load_cached(self, name):
+        """Output tahap dari run sebelumnya, None jika belum ada di cache."""
+        path = self._cache_path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Gagal membaca cache output tahap {name}: {e}")
+            return None
+
+    # --- Eksekusi ---
+
+    def _start_stage(self, stage):
+        print(f"\n--- Tahap {stage.name} Dimulai ---")
+        return self.metrics.stage(stage.name) if self.metrics is not None else nullcontext()
+
+    def _execute(self, stage, inputs):
+        with self._start_stage(stage) as timer:
+            try:
+                output = stage.func(*inputs)
+                if inspect.iscoroutine(output):
+                    output = asyncio.run(output)
+            except Exception as e:
+                print(f"Tahap {stage.name} gagal: {e}")
+                output = None
+            if timer is not None:
+                timer.rows = _count_rows(output, inputs) if not _is_failure(output) else 0
+        if stage.cache and not _is_failure(output):
+            self._store_cache(stage.name, output)
+        return output
+
+    async def _execute_async(self, stage, inputs, executor):
+        loop = asyncio.get_running_loop()
+        if not inspect.iscoroutinefunction(stage.func):
+            return await loop.run_in_executor(executor, self._execute, stage, inputs)
+        with self._start_stage(stage) as timer:
+            try:
+                output = await stage.func(*inputs)
+            except Exception as e:
+                print(f"Tahap {stage.name} gagal: {e}")
+                output = None
+            if timer is not None:
+                timer.rows = _count_rows(output, inputs) if not _is_failure(output) else 0
+        if stage.cache and not _is_failure(output):
+            await loop.run_in_executor(executor, self._store_cache, stage.name, output)
+        return output
+
+    def _ready_stages(self, remaining, results, failed):
+        """Mengeluarkan dari remaining tahap yang siap dijalankan (beserta inputnya) dan yang harus dilewati."""
+        ready = []
+        for name in list(remaining):
+            stage = self.stages[name]
+            blocked = [dep for dep in stage.deps if dep in failed]
+            if blocked:
+                print(f"Tahap {name} dilewati karena tahap {', '.join(blocked)} gagal.")
+                failed.add(name)
+                remaining.remove(name)
+            elif all(dep in results for dep in stage.deps):
+                ready.append((stage, [results[dep] for dep in stage.deps]))
+                remaining.remove(name)
+        return ready
+
+    @staticmethod
+    def _collect(name, output, results, failed):
+        if _is_failure(output):
+            failed.add(name)
+            results[name] = None
+        else:
+            results[name] = output
+
+    def run(self):
+        """
+        Menjalankan semua tahap. Mengembalikan dict nama tahap -> output; tahap yang
+        gagal bernilai None dan tahap yang dilewati tidak ada di dict.
+        """
+        order = self.topological_order()
+        results = {}
+        failed = set()
+        remaining = list(order)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while remaining or running:
+                for stage, inputs in self._ready_stages(remaining, results, failed):
+                    running[pool.submit(self._execute, stage, inputs)] = stage.name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    self._collect(running.pop(future), future.result(), results, failed)
+        return results
+
+    async def run_async(self):
+        """
+        Versi asyncio dari run untuk dipanggil dari event loop yang sudah berjalan: tahap
+        coroutine di-await di loop ini, tahap biasa (mis. transform dan sink) dijalankan di
+        thread pool sehingga tidak menahan loop. Hasilnya sama seperti run.
+        """
+        order = self.topological_order()
+        results = {}
+        failed = set()
+        remaining = list(order)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while remaining or running:
+                for stage, inputs in self._ready_stages(remaining, results, failed):
+                    running[asyncio.ensure_future(self._execute_async(stage, inputs, pool))] = stage.name
+                if not running:
+                    break
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    self._collect(running.pop(task), task.result(), results, failed)
+        return results
+
+    def run_stage(self, name):
+        """
+        Menjalankan satu tahap saja dengan input dari cache output tahap-tahap dependensinya.
+        Mengembalikan output tahap, atau None jika input belum tersedia atau tahap gagal.
+        """
+        if name not in self.stages:
+            raise ValueError(f"Tahap tidak dikenal: '{name}'. Pilihan: {', '.join(self.stages)}")
+        stage = self.stages[name]
+        inputs = []
+        for dep in stage.deps:
+            output = self.load_cached(dep)
+            if output is None:
+                print(f"Output tahap {dep} belum ada di cache {self.cache_dir}. Jalankan pipeline lengkap terlebih dulu.")
+                return None
+            inputs.append(output)
+        output = self._execute(stage, inputs)
+        return None if _is_failure(output) else output
\ No newline at end of file
@@ -1,29 +1,555 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import pandas as pd
+from utils.parsing import has_next_page, parse_page, parse_page_with_selectors, resolve_backend, validate_selectors
+from utils.transform import SOURCE_COLUMN
+from utils.metrics import LatencyHistogram, PIPELINE_METRICS
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import deque, namedtuple
+from urllib.parse import urljoin, urlparse
+import asyncio
+import atexit
+import functools
+import multiprocessing
+import threading
+import hashlib
+import json
+import os
 import time
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 # BASE_URL
 BASE_URL = "https://fashion-studio.dicoding.dev/"
 MAX_PAGES = 50
 
-def scrape_page(url):
+# Konfigurasi mode konkuren. MAX_WORKERS = 1 berarti ekstraksi serial seperti semula.
+MAX_WORKERS = 1
+# Batas laju per host (request per detik), menggantikan jeda tetap time.sleep(0.5)
+REQUESTS_PER_SECOND = 2.0
+# Jumlah halaman kosong berturut-turut yang masih ditoleransi sebelum ekstraksi berhenti
+PAGINATION_LOOKAHEAD = 0
+# Jumlah proses parser HTML (0 = parse di thread fetcher) dan panjang antrean halaman
+# yang menunggu di-parse (None = 2 x jumlah proses)
+PARSE_PROCESSES = 0
+PARSE_QUEUE_SIZE = None
+
+# Mode asyncio: jumlah maksimal request yang sedang berjalan (in flight) dan jumlah
+# token yang boleh terkumpul per host untuk burst di atas REQUESTS_PER_SECOND
+ASYNC_MAX_CONCURRENCY = 100
+RATE_LIMIT_BURST = 1
+
+# Konfigurasi HTTP session (connection pooling, keep-alive, retry)
+REQUEST_TIMEOUT = 15
+POOL_SIZE = 10
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+# Konfigurasi cache HTTP di disk (dipakai jika enable_http_cache dipanggil)
+HTTP_CACHE_DIR = ".http_cache"
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+HTTP_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Checkpoint per halaman agar ekstraksi yang terputus bisa dilanjutkan (dipakai jika enable_checkpoints dipanggil)
+CHECKPOINT_DIR = ".extract_checkpoint"
+# Checkpoint yang lebih tua dari ini dianggap milik run lama dan dibuang
+CHECKPOINT_MAX_AGE = 6 * 60 * 60
+# Jumlah putaran ulang untuk halaman yang gagal, dijalankan setelah putaran utama selesai
+FAILED_PAGE_RETRY_PASSES = 1
+
+def _accepted_encodings():
+    # 'br' hanya diminta jika ada library brotli yang bisa men-decode respons
+    encodings = ['gzip', 'deflate']
+    for module_name in ('brotli', 'brotlicffi'):
+        try:
+            __import__(module_name)
+        except ImportError:
+            continue
+        encodings.append('br')
+        break
+    return ', '.join(encodings)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': _accepted_encodings(),
+    'Connection': 'keep-alive',
+}
+
+class RequestStats:
+    """Akumulator latensi dan jumlah byte per request, aman dipakai antar thread."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.failures = 0
+            self.not_modified = 0
+            self.bytes_downloaded = 0
+            self.total_latency = 0.0
+            self.latency_histogram = LatencyHistogram()
+
+    def record(self, latency, n_bytes, ok=True, not_modified=False):
+        with self._lock:
+            self.requests += 1
+            if not_modified:
+                self.not_modified += 1
+            self.total_latency += latency
+            self.latency_histogram.observe(latency)
+            self.bytes_downloaded += n_bytes
+            if not ok:
+                self.failures += 1
+
+    def snapshot(self):
+        with self._lock:
+            avg_latency = self.total_latency / self.requests if self.requests else 0.0
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "not_modified": self.not_modified,
+                "bytes_downloaded": self.bytes_downloaded,
+                "total_latency": self.total_latency,
+                "avg_latency": avg_latency,
+                "latency_histogram": self.latency_histogram.snapshot(),
+            }
+
+REQUEST_STATS = RequestStats()
+
+def create_session(pool_size=POOL_SIZE, max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR):
+    """
+    Membuat requests.Session dengan connection pool dan retry + exponential backoff
+    untuk status 5xx, error koneksi, dan timeout.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Session bersama milik modul extract, dibuat sekali saat pertama dipakai."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+def configure_session(pool_size=POOL_SIZE, max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR):
+    """Mengganti session bersama, misalnya untuk memperbesar pool saat max_workers tinggi."""
+    global _session
+    new_session = create_session(pool_size, max_retries, backoff_factor)
+    with _session_lock:
+        old_session, _session = _session, new_session
+    if old_session is not None:
+        old_session.close()
+    return new_session
+
+def _wire_bytes(response):
+    # Jumlah byte yang benar-benar ditransfer (sebelum dekompresi gzip/br) jika tersedia
+    try:
+        n_bytes = response.raw.tell()
+    except Exception:
+        n_bytes = None
+    if isinstance(n_bytes, int) and n_bytes > 0:
+        return n_bytes
+    return len(response.content or b"")
+
+class HttpCache:
+    """
+    Cache respons HTTP di disk untuk conditional GET. Body disimpan bersama validator
+    (ETag / Last-Modified) sehingga request berikutnya cukup dijawab 304 oleh server.
+    Entry kedaluwarsa setelah `ttl` detik sejak body diunduh, dan entry yang paling lama
+    tidak dipakai dibuang (LRU) jika total ukuran melebihi `max_bytes`.
+    Hasil parsing halaman juga bisa disimpan per entry agar halaman yang tidak berubah
+    tidak perlu di-parse ulang. Urutan pemakaian (LRU) dari cache hit hanya dicatat di
+    memori dan ditulis ke index.json saat store, flush() atau proses selesai.
+    """
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES, ttl=HTTP_CACHE_TTL):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._dirty = False
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, f"{key}.{suffix}")
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILENAME), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILENAME)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, index_path)
+        self._dirty = False
+
+    def flush(self):
+        """Menulis index.json jika ada perubahan urutan LRU yang belum disimpan."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _remove(self, key):
+        self._index.pop(key, None)
+        for suffix in ('body', 'parsed.json'):
+            try:
+                os.remove(self._path(key, suffix))
+            except OSError:
+                pass
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self._index.values())
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= entry['size']
+            self._remove(key)
+
+    def conditional_headers(self, url):
+        """Header If-None-Match / If-Modified-Since untuk URL yang ada di cache."""
+        with self._lock:
+            key = self._key(url)
+            entry = self._index.get(key)
+            if entry is None:
+                return {}
+            if time.time() - entry['stored_at'] > self.ttl:
+                self._remove(key)
+                self._save_index()
+                return {}
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            return headers
+
+    def get_body(self, url):
+        """Body tersimpan untuk URL (dipakai saat server menjawab 304), None jika tidak ada."""
+        with self._lock:
+            key = self._key(url)
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            try:
+                with open(self._path(key, 'body'), 'rb') as f:
+                    content = f.read()
+            except OSError:
+                self._remove(key)
+                self._save_index()
+                return None
+            # Cukup di memori; menulis ulang index.json per cache hit berarti O(n) per halaman
+            entry['last_access'] = time.time()
+            self._dirty = True
+            return content
+
+    def store(self, url, content, response_headers):
+        """Menyimpan body beserta validatornya. Respons tanpa validator tidak disimpan."""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return False
+        with self._lock:
+            key = self._key(url)
+            self._remove(key)
+            with open(self._path(key, 'body'), 'wb') as f:
+                f.write(content)
+            now = time.time()
+            self._index[key] = {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'digest': hashlib.sha256(content).hexdigest(),
+                'size': len(content),
+                'stored_at': now,
+                'last_access': now,
+            }
+            self._evict()
+            self._save_index()
+        return True
+
+    def get_parsed(self, url, content):
+        """Hasil parsing tersimpan, hanya jika body yang diberikan identik dengan body di cache."""
+        with self._lock:
+            key = self._key(url)
+            entry = self._index.get(key)
+            if entry is None or not entry.get('has_parsed'):
+                return None
+            if entry['digest'] != hashlib.sha256(content).hexdigest():
+                return None
+            try:
+                with open(self._path(key, 'parsed.json'), encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return None
+
+    def store_parsed(self, url, content, parsed):
+        with self._lock:
+            key = self._key(url)
+            entry = self._index.get(key)
+            if entry is None or entry['digest'] != hashlib.sha256(content).hexdigest():
+                return False
+            payload = json.dumps(parsed)
+            with open(self._path(key, 'parsed.json'), 'w', encoding='utf-8') as f:
+                f.write(payload)
+            entry['has_parsed'] = True
+            entry['size'] += len(payload)
+            self._evict()
+            self._save_index()
+        return True
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry['size'] for entry in self._index.values())
+
+_http_cache = None
+
+def enable_http_cache(cache_dir=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES, ttl=HTTP_CACHE_TTL):
+    """
+    Mengaktifkan cache HTTP di disk untuk semua fetch_page berikutnya. Cache yang sudah
+    aktif di-flush dan dilepas dari atexit lebih dulu (lihat disable_http_cache).
+    """
+    global _http_cache
+    disable_http_cache()
+    _http_cache = HttpCache(cache_dir, max_bytes, ttl)
+    atexit.register(_http_cache.flush)
+    return _http_cache
+
+def disable_http_cache():
+    global _http_cache
+    if _http_cache is not None:
+        atexit.unregister(_http_cache.flush)
+        _http_cache.flush()
+    _http_cache = None
+
+def _flush_http_cache():
+    cache = _http_cache
+    if cache is not None:
+        cache.flush()
+
+class PageCheckpoint:
+    """
+    Menyimpan hasil parse setiap halaman ke disk begitu tersedia (satu file JSON per
+    halaman, ditulis atomik), sehingga run yang terputus bisa dilanjutkan tanpa
+    mengambil ulang halaman yang sudah berhasil.
+    """
+    def __init__(self, checkpoint_dir=CHECKPOINT_DIR, max_age=CHECKPOINT_MAX_AGE):
+        self.checkpoint_dir = checkpoint_dir
+        self.max_age = max_age
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self._run_path = os.path.join(checkpoint_dir, 'run.json')
+
+    def _page_path(self, page_num):
+        return os.path.join(self.checkpoint_dir, f'page_{page_num}.json')
+
+    def _write_json(self, path, payload):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    def start_run(self, timestamp):
+        """
+        Melanjutkan checkpoint yang masih berlaku untuk BASE_URL yang sama dan mengembalikan
+        timestamp run aslinya; jika tidak ada, memulai checkpoint baru dengan timestamp ini.
+        """
+        try:
+            with open(self._run_path, encoding='utf-8') as f:
+                run = json.load(f)
+        except (OSError, ValueError):
+            run = None
+        if run and run.get('base_url') == BASE_URL and time.time() - run.get('created', 0) <= self.max_age:
+            print(f"Melanjutkan ekstraksi dari checkpoint: {len(self.saved_pages())} halaman sudah tersimpan.")
+            return run['timestamp']
+        self.clear()
+        self._write_json(self._run_path, {'base_url': BASE_URL, 'timestamp': timestamp, 'created': time.time()})
+        return timestamp
+
+    def saved_pages(self):
+        pages = []
+        for name in os.listdir(self.checkpoint_dir):
+            if name.startswith('page_') and name.endswith('.json'):
+                pages.append(int(name[len('page_'):-len('.json')]))
+        return sorted(pages)
+
+    def load(self, page_num):
+        """PageResult tersimpan untuk halaman ini, None jika belum ada."""
+        try:
+            with open(self._page_path(page_num), encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return PageResult(page_num, saved['products'], saved['card_count'], saved['has_next'])
+
+    def save(self, result):
+        self._write_json(self._page_path(result.page_num), {
+            'products': result.products,
+            'card_count': result.card_count,
+            'has_next': result.has_next,
+        })
+
+    def clear(self):
+        for name in os.listdir(self.checkpoint_dir):
+            if name == 'run.json' or (name.startswith('page_') and name.endswith('.json')):
+                os.remove(os.path.join(self.checkpoint_dir, name))
+
+_checkpoint = None
+
+def enable_checkpoints(checkpoint_dir=CHECKPOINT_DIR, max_age=CHECKPOINT_MAX_AGE):
+    """Mengaktifkan checkpoint per halaman untuk ekstraksi berikutnya."""
+    global _checkpoint
+    _checkpoint = PageCheckpoint(checkpoint_dir, max_age)
+    return _checkpoint
+
+def disable_checkpoints():
+    global _checkpoint
+    _checkpoint = None
+
+class HostRateLimiter:
+    """
+    Membatasi laju request per host. Setiap request ke host yang sama mendapat
+    slot waktu berjarak minimal 1 / requests_per_second, aman dipakai antar thread.
+    """
+    def __init__(self, requests_per_second=REQUESTS_PER_SECOND):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if self.min_interval <= 0:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+def build_page_url(page_num, base_url=None):
+    base_url = base_url or BASE_URL
+    if page_num == 1:
+        return base_url
+    return f"{base_url}page{page_num}"
+
+_NO_ITEM = object()
+
+def _ordered_map(func, items, max_workers):
+    """
+    Menjalankan func untuk setiap item dengan maksimal max_workers yang berjalan
+    bersamaan. Hasil di-yield sesuai urutan item (bukan urutan selesai).
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    items = iter(items)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_workers:
+                break
+        while pending:
+            yield pending.popleft().result()
+            # Item berikutnya baru dikirim setelah konsumen menerima hasil, sehingga
+            # tidak ada request baru jika konsumen sudah berhenti
+            next_item = next(items, _NO_ITEM)
+            if next_item is not _NO_ITEM:
+                pending.append(executor.submit(func, next_item))
+    finally:
+        # Jika konsumen berhenti lebih awal, batalkan request yang belum berjalan
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def fetch_page(url):
+    """
+    Mengambil isi mentah (bytes) sebuah URL lewat session bersama. None jika gagal.
+    Jika cache HTTP aktif, request dikirim sebagai conditional GET dan body diambil
+    dari disk ketika server menjawab 304 Not Modified.
+    """
+    cache = _http_cache
+    request_kwargs = {'timeout': REQUEST_TIMEOUT}
+    conditional_headers = cache.conditional_headers(url) if cache is not None else {}
+    if conditional_headers:
+        request_kwargs['headers'] = conditional_headers
+
+    start = time.perf_counter()
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        return soup
+        response = get_session().get(url, **request_kwargs)
+        not_modified = bool(conditional_headers) and response.status_code == 304
+        content = cache.get_body(url) if not_modified else None
+        if content is None:
+            if not_modified:
+                # Body di cache hilang, ulangi sebagai request biasa
+                not_modified = False
+                response = get_session().get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            content = response.content
+            if cache is not None:
+                cache.store(url, content, response.headers)
     except requests.exceptions.Timeout:
+        REQUEST_STATS.record(time.perf_counter() - start, 0, ok=False)
         print(f"Timeout saat mengakses URL {url}")
         return None
     except requests.exceptions.RequestException as e:
+        REQUEST_STATS.record(time.perf_counter() - start, 0, ok=False)
         print(f"Error fetching URL {url}: {e}")
         return None
 
+    latency = time.perf_counter() - start
+    n_bytes = 0 if not_modified else _wire_bytes(response)
+    REQUEST_STATS.record(latency, n_bytes, not_modified=not_modified)
+    if not_modified:
+        print(f"Halaman {url} tidak berubah (304), diambil dari cache dalam {latency * 1000:.0f} ms")
+    else:
+        print(f"Halaman {url} diambil dalam {latency * 1000:.0f} ms ({n_bytes} bytes)")
+    return content
+
+def scrape_page(url):
+    content = fetch_page(url)
+    if content is None:
+        return None
+    soup = BeautifulSoup(content, 'html.parser')
+    return soup
+
 def extract_product_details(product_card_soup):
     """
     Mengekstrak detail dari satu kartu produk (soup dari elemen <div class="collection-card">).
@@ -77,47 +603,228 @@ def extract_product_details(product_card_soup):
 
     return details
 
-def extract_data_from_website():
-    all_products_data = []
+# Hasil ekstraksi satu halaman. products bernilai None jika halaman gagal diambil,
+# has_next bernilai None jika halaman tidak memiliki navigasi pagination.
+PageResult = namedtuple('PageResult', ['page_num', 'products', 'card_count', 'has_next'])
+
+def _products_from_soup(soup, page_num):
+    """Mengembalikan (list detail produk, jumlah kartu, has_next) dari soup satu halaman."""
+    # Container utama produk adalah <div class="collection-card">
+    product_cards = soup.find_all('div', class_='collection-card')
+
+    if not product_cards and page_num > 1 :
+        print(f"Tidak ada produk ditemukan di halaman {page_num}. Mungkin sudah mencapai halaman terakhir atau ada perubahan struktur.")
+
+    products = []
+    for card_soup in product_cards:
+        product_info = extract_product_details(card_soup)
+        if product_info and product_info.get('title'):
+            products.append(product_info)
+    return products, len(product_cards), has_next_page(soup)
+
+# Hasil tahap fetch: result sudah final (checkpoint, gagal, dihentikan, atau hasil parse
+# dari cache), atau document berisi soup (jalur lama) / bytes HTML yang masih harus di-parse
+_PageFetch = namedtuple('_PageFetch', ['page_num', 'url', 'result', 'document', 'started'])
+
+def _fetch_page_stage(page_num, rate_limiter, stop_event=None, use_soup=False):
+    checkpoint = _checkpoint
+    if checkpoint is not None:
+        saved = checkpoint.load(page_num)
+        if saved is not None:
+            return _PageFetch(page_num, None, saved, None, None)
+
+    page_url = build_page_url(page_num)
+    rate_limiter.wait(page_url)
+    if stop_event is not None and stop_event.is_set():
+        # Halaman terakhir sudah ditemukan oleh worker lain, request tidak perlu dikirim
+        return _PageFetch(page_num, page_url, PageResult(page_num, None, 0, False), None, None)
+
+    print(f"Scraping halaman: {page_url}")
+    start = time.perf_counter()
+    document = scrape_page(page_url) if use_soup else fetch_page(page_url)
+    if not document:
+        return _PageFetch(page_num, page_url, PageResult(page_num, None, 0, None), None, None)
+
+    cache = _http_cache
+    if not use_soup and cache is not None:
+        # Halaman yang tidak berubah sejak run sebelumnya tidak perlu di-parse ulang
+        parsed = cache.get_parsed(page_url, document)
+        if parsed is not None:
+            fetched = _PageFetch(page_num, page_url, None, document, start)
+            return fetched._replace(result=_finish_page(fetched, parsed, store_parsed=False))
+    return _PageFetch(page_num, page_url, None, document, start)
+
+def _finish_page(fetched, parsed, store_parsed=True, use_checkpoint=True):
+    """Menyimpan hasil parse ke cache dan checkpoint, mencatat metrik, lalu mengembalikan PageResult."""
+    products, card_count, has_next = parsed
+    cache = _http_cache
+    if store_parsed and cache is not None and isinstance(fetched.document, bytes):
+        cache.store_parsed(fetched.url, fetched.document, parsed)
+    PIPELINE_METRICS.record_page(fetched.page_num, time.perf_counter() - fetched.started, len(products), card_count)
+    result = PageResult(fetched.page_num, products, card_count, has_next)
+    checkpoint = _checkpoint
+    if use_checkpoint and checkpoint is not None:
+        checkpoint.save(result)
+    return result
+
+def _scrape_products_on_page(page_num, rate_limiter, stop_event=None, parser_backend=None):
+    """
+    Mengambil satu halaman katalog dan mengekstrak semua kartu produknya.
+    Tanpa parser_backend dan cache, halaman diproses lewat scrape_page dan
+    extract_product_details; selain itu HTML mentah di-parse oleh utils.parsing.
+    Halaman yang sudah ada di checkpoint tidak diambil ulang.
+    Mengembalikan PageResult; products bernilai None jika halaman gagal diambil.
+    """
+    use_soup = _http_cache is None and parser_backend is None
+    fetched = _fetch_page_stage(page_num, rate_limiter, stop_event, use_soup)
+    if fetched.result is not None:
+        return fetched.result
+    if use_soup:
+        parsed = _products_from_soup(fetched.document, page_num)
+    else:
+        parsed = parse_page(fetched.document, parser_backend)
+    return _finish_page(fetched, parsed)
+
+def _parse_pages_in_processes(page_nums, rate_limiter, stop_event, max_workers, parser_backend,
+                              parse_processes, parse_queue_size=None):
+    """
+    Producer/consumer untuk mode multi-proses: thread fetcher mengambil bytes HTML,
+    lalu antrean terbatas (parse_queue_size halaman) mengirimnya ke process pool yang
+    menjalankan parse_page di luar GIL. Jika antrean penuh, halaman berikutnya tidak
+    diambil sampai parse halaman terlama selesai (backpressure).
+    Menghasilkan PageResult berurutan sesuai nomor halaman.
+    """
+    parser_backend = resolve_backend(parser_backend)
+    parse_queue_size = parse_queue_size or PARSE_QUEUE_SIZE or 2 * parse_processes
+    # spawn, bukan fork: proses parser dibuat saat thread fetcher sudah berjalan
+    pool = ProcessPoolExecutor(parse_processes, mp_context=multiprocessing.get_context('spawn'))
+    fetches = _ordered_map(
+        lambda page_num: _fetch_page_stage(page_num, rate_limiter, stop_event),
+        page_nums,
+        max_workers,
+    )
+    queue = deque()
+
+    def finish_oldest():
+        fetched, future = queue.popleft()
+        if future is None:
+            return fetched.result
+        return _finish_page(fetched, future.result())
+
+    try:
+        for fetched in fetches:
+            if fetched.result is not None:
+                queue.append((fetched, None))
+            else:
+                queue.append((fetched, pool.submit(parse_page, fetched.document, parser_backend)))
+            while len(queue) >= parse_queue_size:
+                yield finish_oldest()
+        while queue:
+            yield finish_oldest()
+    finally:
+        fetches.close()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def _iter_page_products(max_workers=None, requests_per_second=None, lookahead=None, parser_backend=None,
+                        parse_processes=None):
+    """
+    Generator inti ekstraksi: menghasilkan (nomor halaman, list detail produk yang sudah
+    diberi timestamp) per halaman yang berhasil diambil, berurutan sesuai nomor halaman,
+    sampai halaman terakhir terdeteksi (tidak ada link "Next" atau lebih dari `lookahead`
+    halaman kosong berturut-turut), maksimal MAX_PAGES. Halaman yang gagal dicoba lagi
+    dalam putaran terpisah setelah putaran utama, dan hasilnya menyusul di akhir.
+    """
+    max_workers = max_workers or MAX_WORKERS
+    if requests_per_second is None:
+        requests_per_second = REQUESTS_PER_SECOND
+    if lookahead is None:
+        lookahead = PAGINATION_LOOKAHEAD
+    if parse_processes is None:
+        parse_processes = PARSE_PROCESSES
+    if parser_backend is not None:
+        parser_backend = resolve_backend(parser_backend)
+    rate_limiter = HostRateLimiter(requests_per_second)
+    stop_event = threading.Event()
+    REQUEST_STATS.reset()
+
     # Tambah kolom timestamp untuk skor "Skilled"
     current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S") 
+    checkpoint = _checkpoint
+    if checkpoint is not None:
+        # Run yang dilanjutkan memakai timestamp run aslinya agar datanya tetap satu snapshot
+        current_timestamp = checkpoint.start_run(current_timestamp)
 
-    print(f"Memulai ekstraksi data pada: {current_timestamp}")
+    print(f"Memulai ekstraksi data pada: {current_timestamp} (workers: {max_workers})")
 
-    for page_num in range(1, MAX_PAGES + 1):
-        if page_num == 1:
-            page_url = BASE_URL
-        else:
-            page_url = f"{BASE_URL}page{page_num}"
-        
-        print(f"Scraping halaman: {page_url}")
-        soup = scrape_page(page_url)
+    if parse_processes:
+        page_results = _parse_pages_in_processes(
+            range(1, MAX_PAGES + 1), rate_limiter, stop_event, max_workers, parser_backend, parse_processes
+        )
+    else:
+        page_results = _ordered_map(
+            lambda page_num: _scrape_products_on_page(page_num, rate_limiter, stop_event, parser_backend),
+            range(1, MAX_PAGES + 1),
+            max_workers,
+        )
 
-        if soup:
-            # Container utama produk adalah <div class="collection-card">
-            product_cards = soup.find_all('div', class_='collection-card') 
+    empty_streak = 0
+    failed_pages = []
+    try:
+        for result in page_results:
+            if result.products is None:
+                print(f"Gagal mengambil data dari halaman {result.page_num}. Melanjutkan ke halaman berikutnya jika ada.")
+                failed_pages.append(result.page_num)
+                continue
 
-            if not product_cards and page_num > 1 :
-                print(f"Tidak ada produk ditemukan di halaman {page_num}. Mungkin sudah mencapai halaman terakhir atau ada perubahan struktur.")
+            for product_info in result.products:
+                product_info['timestamp'] = current_timestamp
+            yield result.page_num, result.products
 
-            for card_soup in product_cards:
-                product_info = extract_product_details(card_soup)
-                if product_info and product_info.get('title'):
-                    product_info['timestamp'] = current_timestamp
-                    all_products_data.append(product_info)
-            
-            time.sleep(0.5)
+            if result.has_next is False:
+                print(f"Halaman {result.page_num} adalah halaman terakhir. Ekstraksi dihentikan.")
+                break
 
-        else:
-            print(f"Gagal mengambil data dari halaman {page_num}. Melanjutkan ke halaman berikutnya jika ada.")
+            empty_streak = empty_streak + 1 if result.card_count == 0 else 0
+            if empty_streak > lookahead:
+                print(f"{empty_streak} halaman kosong berturut-turut hingga halaman {result.page_num}. Ekstraksi dihentikan.")
+                break
+    finally:
+        stop_event.set()
+        page_results.close()
 
-    if not all_products_data:
-        print("Tidak ada data produk yang berhasil diekstrak.")
-        return pd.DataFrame()
+    for retry_pass in range(1, FAILED_PAGE_RETRY_PASSES + 1):
+        if not failed_pages:
+            break
+        print(f"Putaran ulang {retry_pass}: mencoba lagi {len(failed_pages)} halaman yang gagal {failed_pages}")
+        still_failed = []
+        for page_num in failed_pages:
+            result = _scrape_products_on_page(page_num, rate_limiter, parser_backend=parser_backend)
+            if result.products is None:
+                still_failed.append(page_num)
+                continue
+            for product_info in result.products:
+                product_info['timestamp'] = current_timestamp
+            yield result.page_num, result.products
+        failed_pages = still_failed
+
+    if failed_pages:
+        print(f"Halaman yang tetap gagal: {failed_pages}.")
+        if checkpoint is not None:
+            print("Checkpoint disimpan, run berikutnya hanya mengambil halaman yang belum berhasil.")
+    elif checkpoint is not None:
+        # Ekstraksi lengkap: run berikutnya harus mengambil data baru, bukan melanjutkan
+        checkpoint.clear()
+
+    _flush_http_cache()
+    stats = REQUEST_STATS.snapshot()
+    print(
+        f"Total request: {stats['requests']} (gagal: {stats['failures']}, 304: {stats['not_modified']}), "
+        f"{stats['bytes_downloaded']} bytes, rata-rata latensi {stats['avg_latency'] * 1000:.0f} ms"
+    )
+
+def _products_to_dataframe(products):
+    df_products = pd.DataFrame(products)
 
-    df_products = pd.DataFrame(all_products_data)
-    print(f"Ekstraksi selesai. Total {len(df_products)} produk berhasil diambil.")
-    
     expected_columns = ['title', 'price', 'rating', 'colors', 'size', 'gender', 'timestamp']
     
     final_df_columns = []
@@ -125,10 +832,465 @@ def extract_data_from_website():
         if col in df_products.columns:
             final_df_columns.append(col)
     
+    # Mode multi-sumber: kolom source ikut di akhir
+    if SOURCE_COLUMN in df_products.columns:
+        final_df_columns.append(SOURCE_COLUMN)
+
     df_products = df_products[final_df_columns]
     
     for col in expected_columns:
         if col not in df_products.columns:
             df_products[col] = None
 
-    return df_products
\ No newline at end of file
+    return df_products
+
+def _in_page_order(pages):
+    """Menggabungkan produk dari pasangan (nomor halaman, produk) sesuai urutan nomor halaman."""
+    products_by_page = dict(pages)
+    all_products_data = []
+    for page_num in sorted(products_by_page):
+        all_products_data.extend(products_by_page[page_num])
+    return all_products_data
+
+def iter_product_batches(max_workers=None, requests_per_second=None, lookahead=None, parser_backend=None,
+                         parse_processes=None):
+    """
+    Mode streaming: menghasilkan satu DataFrame mentah per halaman katalog, dengan kolom
+    yang sama seperti extract_data_from_website. Halaman tanpa produk dilewati. Urutannya
+    mengikuti nomor halaman, kecuali halaman yang baru berhasil di putaran ulang: batch
+    halaman tersebut menyusul setelah halaman terakhir karena batch sebelumnya sudah dikirim.
+    """
+    for _, products in _iter_page_products(max_workers, requests_per_second, lookahead, parser_backend, parse_processes):
+        if products:
+            yield _products_to_dataframe(products)
+
+def extract_data_from_website(max_workers=None, requests_per_second=None, lookahead=None, parser_backend=None,
+                              parse_processes=None):
+    """
+    Mengekstrak semua halaman katalog menjadi satu DataFrame (lihat _iter_page_products).
+    Dengan max_workers > 1 halaman diambil secara konkuren, namun urutan baris pada
+    DataFrame tetap mengikuti urutan halaman, termasuk halaman yang baru berhasil di
+    putaran ulang. parser_backend memilih backend
+    utils.parsing ("bs4", "lxml", "selectolax"). Dengan parse_processes > 0, parsing
+    dijalankan di process pool terpisah dari thread fetcher (lihat _parse_pages_in_processes).
+    """
+    all_products_data = _in_page_order(
+        _iter_page_products(max_workers, requests_per_second, lookahead, parser_backend, parse_processes))
+
+    if not all_products_data:
+        print("Tidak ada data produk yang berhasil diekstrak.")
+        return pd.DataFrame()
+
+    df_products = _products_to_dataframe(all_products_data)
+    print(f"Ekstraksi selesai. Total {len(df_products)} produk berhasil diambil.")
+    return df_products
+
+# --- Mode asyncio (aiohttp) ---
+
+class AsyncTokenBucket:
+    """
+    Token bucket per host untuk mode asyncio: token bertambah `rate` per detik sampai
+    maksimal `burst`, dan setiap request memakai satu token. Dengan burst = 1 jarak antar
+    request sama dengan HostRateLimiter. rate 0/None berarti tanpa batas.
+    """
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=RATE_LIMIT_BURST):
+        self.rate = rate or 0.0
+        self.burst = max(1, burst)
+        self._buckets = {}
+        self._locks = {}
+
+    async def acquire(self, url):
+        if self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        # Lock dipegang selama menunggu agar request ke host yang sama dilayani berurutan
+        async with lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                await asyncio.sleep((1 - tokens) / self.rate)
+                now = time.monotonic()
+                tokens = 1.0
+            self._buckets[host] = (tokens - 1, now)
+
+async def fetch_page_async(session, url, semaphore, rate_limiter, max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR):
+    """
+    Versi asyncio dari fetch_page: mengambil bytes sebuah URL dengan aiohttp, maksimal
+    sebanyak kapasitas semaphore yang berjalan bersamaan. Status 5xx, error koneksi dan
+    timeout dicoba ulang dengan exponential backoff seperti create_session. None jika gagal.
+    """
+    start = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        if attempt:
+            await asyncio.sleep(backoff_factor * 2 ** (attempt - 1))
+        await rate_limiter.acquire(url)
+        last_attempt = attempt == max_retries
+        try:
+            async with semaphore:
+                async with session.get(url) as response:
+                    if response.status in RETRY_STATUS_CODES and not last_attempt:
+                        continue
+                    response.raise_for_status()
+                    content = await response.read()
+                    n_bytes = response.content_length or len(content)
+        except asyncio.TimeoutError:
+            if not last_attempt:
+                continue
+            REQUEST_STATS.record(time.perf_counter() - start, 0, ok=False)
+            print(f"Timeout saat mengakses URL {url}")
+            return None
+        except aiohttp.ClientResponseError as e:
+            REQUEST_STATS.record(time.perf_counter() - start, 0, ok=False)
+            print(f"Error fetching URL {url}: {e.status} {e.message}")
+            return None
+        except aiohttp.ClientError as e:
+            if not last_attempt:
+                continue
+            REQUEST_STATS.record(time.perf_counter() - start, 0, ok=False)
+            print(f"Error fetching URL {url}: {e}")
+            return None
+
+        latency = time.perf_counter() - start
+        REQUEST_STATS.record(latency, n_bytes)
+        print(f"Halaman {url} diambil dalam {latency * 1000:.0f} ms ({n_bytes} bytes)")
+        return content
+
+class _SemaphoreGroup:
+    """
+    Beberapa semaphore yang diambil berurutan sebagai satu async context manager, mis.
+    batas per host lalu batas global: request yang masih menunggu giliran host-nya tidak
+    menahan slot global yang bisa dipakai situs lain.
+    """
+    def __init__(self, *semaphores):
+        self.semaphores = semaphores
+
+    async def __aenter__(self):
+        acquired = []
+        try:
+            for semaphore in self.semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+        except BaseException:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        for semaphore in reversed(self.semaphores):
+            semaphore.release()
+
+async def _ordered_map_async(func, items, max_in_flight):
+    """
+    Versi asyncio dari _ordered_map: maksimal max_in_flight coroutine func(item) berjalan
+    bersamaan, hasil di-yield sesuai urutan item. Task yang belum selesai dibatalkan jika
+    konsumen berhenti lebih awal (aclose).
+    """
+    items = iter(items)
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(asyncio.ensure_future(func(item)))
+            if len(pending) >= max_in_flight:
+                break
+        while pending:
+            yield await pending.popleft()
+            # Seperti _ordered_map, item berikutnya baru dijadwalkan setelah konsumen menerima hasil
+            next_item = next(items, _NO_ITEM)
+            if next_item is not _NO_ITEM:
+                pending.append(asyncio.ensure_future(func(next_item)))
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+class _AsyncSiteScraper:
+    """
+    Ekstraksi asyncio satu situs katalog: page_url(page_num) membentuk URL halaman dan
+    parse(content) mengembalikan (produk, jumlah kartu, has_next). Setiap produk diberi
+    timestamp run, dan kolom source jika diberikan (mode multi-sumber).
+    """
+    def __init__(self, page_url, max_pages, parse, session, limits, rate_limiter, max_in_flight, timestamp,
+                 checkpoint=None, source=None):
+        self.page_url = page_url
+        self.max_pages = max_pages
+        self.parse = parse
+        self.session = session
+        self.limits = limits
+        self.rate_limiter = rate_limiter
+        self.max_in_flight = max_in_flight
+        self.timestamp = timestamp
+        self.checkpoint = checkpoint
+        self.source = source
+        self.failed_pages = []
+
+    async def scrape(self, page_num, stop_event=None):
+        """
+        Versi asyncio dari _scrape_products_on_page. Parsing HTML dijalankan di executor
+        agar tidak menahan event loop selama request lain berjalan.
+        """
+        if self.checkpoint is not None:
+            saved = self.checkpoint.load(page_num)
+            if saved is not None:
+                return saved
+
+        page_url = self.page_url(page_num)
+        if stop_event is not None and stop_event.is_set():
+            return PageResult(page_num, None, 0, False)
+        print(f"Scraping halaman: {page_url}")
+        start = time.perf_counter()
+        content = await fetch_page_async(self.session, page_url, self.limits, self.rate_limiter)
+        if not content:
+            return PageResult(page_num, None, 0, None)
+        parsed = await asyncio.get_running_loop().run_in_executor(None, self.parse, content)
+        return _finish_page(_PageFetch(page_num, page_url, None, content, start), parsed,
+                            use_checkpoint=self.checkpoint is not None)
+
+    def _tag(self, products):
+        for product_info in products:
+            product_info['timestamp'] = self.timestamp
+            if self.source is not None:
+                product_info[SOURCE_COLUMN] = self.source
+        return products
+
+    async def iter_products(self, lookahead):
+        """
+        Versi asyncio dari _iter_page_products untuk satu situs, dengan aturan berhenti,
+        putaran ulang halaman gagal dan pasangan (nomor halaman, produk) yang sama. Halaman
+        yang tetap gagal ada di failed_pages.
+        """
+        stop_event = asyncio.Event()
+        page_results = _ordered_map_async(
+            lambda page_num: self.scrape(page_num, stop_event), range(1, self.max_pages + 1), self.max_in_flight
+        )
+        empty_streak = 0
+        failed_pages = []
+        try:
+            async for result in page_results:
+                if result.products is None:
+                    print(f"Gagal mengambil data dari halaman {self.page_url(result.page_num)}. Melanjutkan ke halaman berikutnya jika ada.")
+                    failed_pages.append(result.page_num)
+                    continue
+
+                yield result.page_num, self._tag(result.products)
+
+                if result.has_next is False:
+                    print(f"Halaman {self.page_url(result.page_num)} adalah halaman terakhir. Ekstraksi dihentikan.")
+                    break
+
+                empty_streak = empty_streak + 1 if result.card_count == 0 else 0
+                if empty_streak > lookahead:
+                    print(f"{empty_streak} halaman kosong berturut-turut hingga halaman {self.page_url(result.page_num)}. Ekstraksi dihentikan.")
+                    break
+        finally:
+            stop_event.set()
+            await page_results.aclose()
+
+        for retry_pass in range(1, FAILED_PAGE_RETRY_PASSES + 1):
+            if not failed_pages:
+                break
+            print(f"Putaran ulang {retry_pass}: mencoba lagi {len(failed_pages)} halaman yang gagal {failed_pages}")
+            still_failed = []
+            for page_num in failed_pages:
+                result = await self.scrape(page_num)
+                if result.products is None:
+                    still_failed.append(page_num)
+                    continue
+                yield result.page_num, self._tag(result.products)
+            failed_pages = still_failed
+        self.failed_pages = failed_pages
+
+def _client_session(max_concurrency):
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    return aiohttp.ClientSession(headers=DEFAULT_HEADERS, connector=connector, timeout=timeout)
+
+def _print_request_stats():
+    stats = REQUEST_STATS.snapshot()
+    print(
+        f"Total request: {stats['requests']} (gagal: {stats['failures']}), "
+        f"{stats['bytes_downloaded']} bytes, rata-rata latensi {stats['avg_latency'] * 1000:.0f} ms"
+    )
+
+async def _aiter_page_products(max_concurrency=None, requests_per_second=None, lookahead=None, parser_backend=None,
+                               burst=None):
+    """
+    Versi asyncio dari _iter_page_products untuk BASE_URL, termasuk checkpoint per halaman.
+    Cache HTTP (enable_http_cache) tidak dipakai di mode ini.
+    """
+    max_concurrency = max_concurrency or ASYNC_MAX_CONCURRENCY
+    if requests_per_second is None:
+        requests_per_second = REQUESTS_PER_SECOND
+    if lookahead is None:
+        lookahead = PAGINATION_LOOKAHEAD
+    parser_backend = resolve_backend(parser_backend)
+    REQUEST_STATS.reset()
+
+    current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    checkpoint = _checkpoint
+    if checkpoint is not None:
+        current_timestamp = checkpoint.start_run(current_timestamp)
+
+    print(f"Memulai ekstraksi data (asyncio) pada: {current_timestamp} (maks. request bersamaan: {max_concurrency})")
+
+    async with _client_session(max_concurrency) as session:
+        scraper = _AsyncSiteScraper(
+            build_page_url, MAX_PAGES, functools.partial(parse_page, backend=parser_backend), session,
+            asyncio.Semaphore(max_concurrency),
+            AsyncTokenBucket(requests_per_second, RATE_LIMIT_BURST if burst is None else burst),
+            max_concurrency, current_timestamp, checkpoint,
+        )
+        async for page in scraper.iter_products(lookahead):
+            yield page
+
+    if scraper.failed_pages:
+        print(f"Halaman yang tetap gagal: {scraper.failed_pages}.")
+        if checkpoint is not None:
+            print("Checkpoint disimpan, run berikutnya hanya mengambil halaman yang belum berhasil.")
+    elif checkpoint is not None:
+        checkpoint.clear()
+    _print_request_stats()
+
+async def extract_data_from_website_async(max_concurrency=None, requests_per_second=None, lookahead=None,
+                                          parser_backend=None, burst=None):
+    """
+    Versi asyncio dari extract_data_from_website dengan DataFrame hasil yang sama: halaman
+    diambil lewat aiohttp dengan maksimal max_concurrency request bersamaan dan dibatasi
+    token bucket per host (requests_per_second, burst). Jika aiohttp tidak terpasang,
+    ekstraksi berbasis thread dijalankan di executor agar event loop tidak tertahan.
+    """
+    if aiohttp is None:
+        print("Library aiohttp tidak terpasang, menggunakan ekstraksi berbasis thread di executor.")
+        max_workers = min(max_concurrency or ASYNC_MAX_CONCURRENCY, POOL_SIZE)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, extract_data_from_website, max_workers, requests_per_second, lookahead, parser_backend)
+
+    all_products_data = _in_page_order(
+        [page async for page in _aiter_page_products(max_concurrency, requests_per_second, lookahead, parser_backend, burst)])
+
+    if not all_products_data:
+        print("Tidak ada data produk yang berhasil diekstrak.")
+        return pd.DataFrame()
+
+    df_products = _products_to_dataframe(all_products_data)
+    print(f"Ekstraksi selesai. Total {len(df_products)} produk berhasil diambil.")
+    return df_products
+
+# --- Mode multi-sumber: beberapa situs katalog dalam satu run ---
+
+# Konfigurasi satu situs. name menjadi nilai kolom source (default base_url). page_pattern
+# adalah path halaman relatif terhadap base_url dengan placeholder {page}; None berarti pola
+# fashion-studio (halaman 1 = base_url, berikutnya "page{N}"). selectors adalah dict selector
+# CSS (lihat utils.parsing.parse_page_with_selectors); None berarti parser bawaan. max_pages,
+# max_concurrency dan requests_per_second bernilai None memakai MAX_PAGES,
+# SITE_MAX_CONCURRENCY dan REQUESTS_PER_SECOND; dua batas terakhir berlaku per host.
+SiteConfig = namedtuple(
+    'SiteConfig',
+    ['base_url', 'name', 'page_pattern', 'max_pages', 'selectors', 'max_concurrency', 'requests_per_second'],
+    defaults=(None, None, None, None, None, None),
+)
+
+# Batas request bersamaan per host jika tidak diatur di SiteConfig
+SITE_MAX_CONCURRENCY = 4
+
+def site_source(site):
+    """Nilai kolom source untuk produk dari situs ini."""
+    return site.name or site.base_url
+
+def site_page_url(site, page_num):
+    if site.page_pattern is None:
+        return build_page_url(page_num, site.base_url)
+    return urljoin(site.base_url, site.page_pattern.format(page=page_num))
+
+def load_site_configs(path):
+    """
+    Membaca daftar konfigurasi situs dari file JSON (list of dict dengan field SiteConfig).
+    Mengembalikan list SiteConfig, atau None jika file tidak bisa dibaca atau tidak valid.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw_sites = json.load(f)
+        if not isinstance(raw_sites, list) or not raw_sites:
+            raise ValueError("isi file harus berupa list konfigurasi situs yang tidak kosong")
+        sites = []
+        for raw_site in raw_sites:
+            unknown = sorted(set(raw_site) - set(SiteConfig._fields))
+            if unknown:
+                raise ValueError(f"field tidak dikenal: {', '.join(unknown)}")
+            site = SiteConfig(**raw_site)
+            if site.selectors is not None:
+                validate_selectors(site.selectors)
+            sites.append(site)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Gagal membaca konfigurasi situs dari {path}: {e}")
+        return None
+    return sites
+
+async def extract_sites_async(sites, max_concurrency=None, lookahead=None, parser_backend=None):
+    """
+    Mengekstrak beberapa situs katalog bersamaan menjadi satu DataFrame dengan kolom
+    SOURCE_COLUMN. Semua situs berbagi satu session aiohttp dan batas global max_concurrency
+    request, sedangkan concurrency dan jeda (token bucket) dibatasi per host sesuai
+    SiteConfig, sehingga total waktu mengikuti situs paling lambat, bukan jumlah semuanya.
+    Baris diurutkan per situs (sesuai urutan sites) lalu per halaman. Checkpoint per
+    halaman dan cache HTTP tidak dipakai di mode ini.
+    """
+    if aiohttp is None:
+        print("Mode multi-sumber membutuhkan library aiohttp (pip install aiohttp).")
+        return pd.DataFrame()
+    if not sites:
+        print("Tidak ada situs yang dikonfigurasi.")
+        return pd.DataFrame()
+    max_concurrency = max_concurrency or ASYNC_MAX_CONCURRENCY
+    if lookahead is None:
+        lookahead = PAGINATION_LOOKAHEAD
+    default_parse = functools.partial(parse_page, backend=resolve_backend(parser_backend))
+    if _checkpoint is not None:
+        print("Checkpoint per halaman tidak dipakai di mode multi-sumber.")
+    REQUEST_STATS.reset()
+    current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"Memulai ekstraksi {len(sites)} situs (asyncio) pada: {current_timestamp} "
+          f"(maks. request bersamaan: {max_concurrency})")
+
+    # Beberapa situs bisa berada di host yang sama; batas host diambil dari situs pertama di host tersebut
+    host_limits = {}
+    for site in sites:
+        host = urlparse(site.base_url).netloc
+        if host not in host_limits:
+            rate = REQUESTS_PER_SECOND if site.requests_per_second is None else site.requests_per_second
+            host_limits[host] = (asyncio.Semaphore(site.max_concurrency or SITE_MAX_CONCURRENCY), AsyncTokenBucket(rate))
+    global_limit = asyncio.Semaphore(max_concurrency)
+
+    async def extract_site(scraper):
+        products = _in_page_order([page async for page in scraper.iter_products(lookahead)])
+        status = f", halaman gagal: {scraper.failed_pages}" if scraper.failed_pages else ""
+        print(f"Situs {scraper.source}: {len(products)} produk{status}")
+        return products
+
+    async with _client_session(max_concurrency) as session:
+        scrapers = []
+        for site in sites:
+            host_limit, rate_limiter = host_limits[urlparse(site.base_url).netloc]
+            parse = default_parse if site.selectors is None else functools.partial(
+                parse_page_with_selectors, selectors=site.selectors)
+            scrapers.append(_AsyncSiteScraper(
+                functools.partial(site_page_url, site), site.max_pages or MAX_PAGES, parse, session,
+                _SemaphoreGroup(host_limit, global_limit), rate_limiter,
+                site.max_concurrency or SITE_MAX_CONCURRENCY, current_timestamp, source=site_source(site),
+            ))
+        results = await asyncio.gather(*(extract_site(scraper) for scraper in scrapers))
+    _print_request_stats()
+
+    all_products_data = [product for products in results for product in products]
+    if not all_products_data:
+        print("Tidak ada data produk yang berhasil diekstrak.")
+        return pd.DataFrame()
+    df_products = _products_to_dataframe(all_products_data)
+    print(f"Ekstraksi selesai. Total {len(df_products)} produk dari {len(sites)} situs berhasil diambil.")
+    return df_products
+
+def extract_sites(sites, max_concurrency=None, lookahead=None, parser_backend=None):
+    """Versi sinkron extract_sites_async untuk pipeline berbasis thread."""
+    return asyncio.run(extract_sites_async(sites, max_concurrency, lookahead, parser_backend))
@@ -1,21 +1,305 @@
 import pandas as pd
 import os
+import re
+import sqlite3
+
+from utils.transform import OUTPUT_DTYPES, PRODUCT_COLUMNS, PRODUCT_KEY_COLUMNS, identity_columns, to_compact_schema, to_output_schema
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Format output yang dikenali dari ekstensi file (dicek dari yang terpanjang).
+# Kompresi CSV (.gz/.zst) disimpulkan otomatis oleh pandas dari ekstensinya.
+FORMAT_EXTENSIONS = {
+    '.csv': 'csv',
+    '.csv.gz': 'csv',
+    '.csv.zst': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.db': 'sqlite',
+    '.sqlite': 'sqlite',
+}
+# Kompresi bawaan format kolumnar: snappy cepat untuk Parquet, zstd untuk Feather/Arrow IPC
+PARQUET_COMPRESSION = 'snappy'
+FEATHER_COMPRESSION = 'zstd'
+
+# Tabel tujuan default dan jumlah baris per panggilan executemany saat upsert
+SQLITE_TABLE_NAME = "products"
+UPSERT_BATCH_SIZE = 1000
+# Kolom tambahan berisi hash isi produk untuk mendeteksi baris yang berubah
+ROW_HASH_COLUMN = "row_hash"
+
+# Tipe SQL per dtype; nama tipe ini valid di SQLite maupun PostgreSQL
+_SQL_TYPES = {'object': 'TEXT', 'float64': 'DOUBLE PRECISION', 'int64': 'BIGINT'}
+_IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+def _ensure_directory(output_path):
+    # Dapatkan path direktori dari output_path
+    directory = os.path.dirname(output_path)
+
+    if directory and not os.path.exists(directory): #
+        os.makedirs(directory) #
+        print(f"Direktori dibuat: {directory}")
+
+def available_formats():
+    formats = ["csv", "sqlite"]
+    if pyarrow is not None:
+        formats.extend(["parquet", "feather"])
+    return formats
+
+def detect_format(output_path):
+    """Menentukan format output dari ekstensi file, None jika tidak dikenali."""
+    name = str(output_path).lower()
+    for extension in sorted(FORMAT_EXTENSIONS, key=len, reverse=True):
+        if name.endswith(extension):
+            return FORMAT_EXTENSIONS[extension]
+    return None
 
 def load_to_csv(df, output_path, **kwargs):
     if df is None or df.empty:
         print("DataFrame kosong, tidak ada data untuk disimpan ke CSV.")
         return False
     try:
-        # Dapatkan path direktori dari output_path
-        directory = os.path.dirname(output_path)
-
-        if directory and not os.path.exists(directory): #
-            os.makedirs(directory) #
-            print(f"Direktori dibuat: {directory}")
+        _ensure_directory(output_path)
 
         df.to_csv(output_path, index=False, **kwargs)
         print(f"Data berhasil disimpan ke CSV: {output_path}")
         return True
     except Exception as e:
         print(f"Gagal menyimpan data ke CSV di {output_path}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def load_batches_to_csv(batches, output_path, **kwargs):
+    """
+    Menulis DataFrame per batch secara bertahap ke satu file CSV, sehingga memori
+    tidak bergantung pada total jumlah data. Data ditulis ke file sementara lalu
+    dipindahkan ke output_path setelah semua batch selesai.
+    Mengembalikan jumlah baris yang ditulis (0 jika tidak ada data atau gagal).
+    """
+    tmp_path = f"{output_path}.tmp"
+    rows_written = 0
+    try:
+        _ensure_directory(output_path)
+
+        for df in batches:
+            if df is None or df.empty:
+                continue
+            df.to_csv(tmp_path, mode='w' if rows_written == 0 else 'a', header=rows_written == 0, index=False, **kwargs)
+            rows_written += len(df)
+
+        if rows_written == 0:
+            print("Tidak ada batch berisi data, tidak ada data untuk disimpan ke CSV.")
+            return 0
+        os.replace(tmp_path, output_path)
+        print(f"Data berhasil disimpan ke CSV: {output_path} ({rows_written} baris)")
+        return rows_written
+    except Exception as e:
+        print(f"Gagal menyimpan data ke CSV di {output_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return 0
+
+def load_to_parquet(df, output_path, compression=PARQUET_COMPRESSION, **kwargs):
+    """Menyimpan DataFrame ke Parquet (kolumnar, tipe data ikut tersimpan). compression: snappy, zstd, gzip atau None."""
+    if df is None or df.empty:
+        print("DataFrame kosong, tidak ada data untuk disimpan ke Parquet.")
+        return False
+    if pyarrow is None:
+        print("pyarrow belum terpasang, tidak bisa menyimpan ke Parquet (pip install pyarrow).")
+        return False
+    try:
+        _ensure_directory(output_path)
+
+        df.to_parquet(output_path, engine='pyarrow', compression=compression, index=False, **kwargs)
+        print(f"Data berhasil disimpan ke Parquet: {output_path}")
+        return True
+    except Exception as e:
+        print(f"Gagal menyimpan data ke Parquet di {output_path}: {e}")
+        return False
+
+def load_to_feather(df, output_path, compression=FEATHER_COMPRESSION, **kwargs):
+    """Menyimpan DataFrame ke Feather v2 / Arrow IPC. compression: zstd, lz4 atau uncompressed."""
+    if df is None or df.empty:
+        print("DataFrame kosong, tidak ada data untuk disimpan ke Feather.")
+        return False
+    if pyarrow is None:
+        print("pyarrow belum terpasang, tidak bisa menyimpan ke Feather (pip install pyarrow).")
+        return False
+    try:
+        _ensure_directory(output_path)
+
+        # Feather hanya menerima index bawaan, jadi index dibuang seperti pada CSV
+        df.reset_index(drop=True).to_feather(output_path, compression=compression, **kwargs)
+        print(f"Data berhasil disimpan ke Feather: {output_path}")
+        return True
+    except Exception as e:
+        print(f"Gagal menyimpan data ke Feather di {output_path}: {e}")
+        return False
+
+def _quote_identifier(name):
+    if not _IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Nama tabel/kolom tidak valid: {name}")
+    return f'"{name}"'
+
+def _placeholder(paramstyle, position):
+    if paramstyle == 'qmark':
+        return '?'
+    if paramstyle in ('format', 'pyformat'):
+        return '%s'
+    if paramstyle == 'numeric':
+        return f':{position}'
+    raise ValueError(f"paramstyle DB-API tidak didukung: {paramstyle}")
+
+def _row_hashes(df):
+    """Hash isi produk per baris (tanpa timestamp) sebagai int64 bertanda agar muat di kolom BIGINT."""
+    product_df = df[identity_columns(df, PRODUCT_COLUMNS)].astype({col: OUTPUT_DTYPES[col] for col in PRODUCT_COLUMNS})
+    return pd.util.hash_pandas_object(product_df, index=False).to_numpy().view('int64').tolist()
+
+def _create_table_sql(table_name, columns, key_columns):
+    column_defs = [f"{_quote_identifier(col)} {_SQL_TYPES.get(OUTPUT_DTYPES.get(col), 'TEXT')}" for col in columns]
+    column_defs.append(f"{_quote_identifier(ROW_HASH_COLUMN)} BIGINT NOT NULL")
+    primary_key = ", ".join(_quote_identifier(col) for col in key_columns)
+    return (f"CREATE TABLE IF NOT EXISTS {_quote_identifier(table_name)} "
+            f"({', '.join(column_defs)}, PRIMARY KEY ({primary_key}))")
+
+def _upsert_sql(table_name, columns, key_columns, paramstyle):
+    all_columns = columns + [ROW_HASH_COLUMN]
+    placeholders = ", ".join(_placeholder(paramstyle, i + 1) for i in range(len(all_columns)))
+    updates = ", ".join(
+        f"{_quote_identifier(col)} = excluded.{_quote_identifier(col)}"
+        for col in all_columns if col not in key_columns
+    )
+    return (f"INSERT INTO {_quote_identifier(table_name)} ({', '.join(_quote_identifier(col) for col in all_columns)}) "
+            f"VALUES ({placeholders}) "
+            f"ON CONFLICT ({', '.join(_quote_identifier(col) for col in key_columns)}) DO UPDATE SET {updates}")
+
+def _existing_hashes(cursor, table_name, key_columns):
+    key_sql = ", ".join(_quote_identifier(col) for col in key_columns)
+    cursor.execute(f"SELECT {key_sql}, {_quote_identifier(ROW_HASH_COLUMN)} FROM {_quote_identifier(table_name)}")
+    return {tuple(row[:-1]): row[-1] for row in cursor.fetchall()}
+
+def upsert_to_database(df, connection, table_name=SQLITE_TABLE_NAME, key_columns=None,
+                       paramstyle='qmark', batch_size=UPSERT_BATCH_SIZE):
+    """
+    Upsert DataFrame ke tabel database melalui koneksi DB-API (SQLite, PostgreSQL, ...).
+    Hanya baris baru atau yang isinya berubah (dibandingkan lewat row_hash) yang ditulis,
+    memakai executemany per batch_size baris dalam satu transaksi.
+    Mengembalikan jumlah baris yang ditulis, atau None jika gagal.
+    """
+    if df is None or df.empty:
+        print("DataFrame kosong, tidak ada data untuk disimpan ke database.")
+        return None
+    # Mode multi-sumber: kolom source ikut disimpan dan menjadi bagian key
+    key_columns = list(key_columns or identity_columns(df, PRODUCT_KEY_COLUMNS))
+    columns = identity_columns(df, [col for col in OUTPUT_DTYPES if col in df.columns])
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        cursor.execute(_create_table_sql(table_name, columns, key_columns))
+
+        # Baris dengan key yang sama di satu load: yang terakhir dipakai, seperti upsert berurutan
+        df = df.drop_duplicates(subset=key_columns, keep='last')
+        # Skema compact (category/datetime64) dikembalikan ke tipe dasar yang bisa di-bind driver DB-API
+        df = to_output_schema(df[columns])
+        values = [df[col].tolist() for col in columns]
+        keys = list(zip(*(df[col].tolist() for col in key_columns)))
+        hashes = _row_hashes(df)
+
+        existing = _existing_hashes(cursor, table_name, key_columns)
+        changed = [i for i, (key, row_hash) in enumerate(zip(keys, hashes)) if existing.get(key) != row_hash]
+        inserted = sum(1 for i in changed if keys[i] not in existing)
+
+        sql = _upsert_sql(table_name, columns, key_columns, paramstyle)
+        for start in range(0, len(changed), batch_size):
+            batch = changed[start:start + batch_size]
+            cursor.executemany(sql, [tuple(column[i] for column in values) + (hashes[i],) for i in batch])
+        connection.commit()
+        print(f"Upsert ke tabel {table_name} selesai: {inserted} baru, {len(changed) - inserted} berubah, "
+              f"{len(df) - len(changed)} tidak berubah.")
+        return len(changed)
+    except Exception as e:
+        print(f"Gagal upsert data ke tabel {table_name}: {e}")
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        return None
+    finally:
+        if cursor is not None:
+            cursor.close()
+
+def load_to_sqlite(df, db_path, table_name=SQLITE_TABLE_NAME, **kwargs):
+    """Upsert DataFrame ke file SQLite lokal. Mengembalikan jumlah baris yang ditulis, atau None jika gagal."""
+    if df is None or df.empty:
+        print("DataFrame kosong, tidak ada data untuk disimpan ke SQLite.")
+        return None
+    try:
+        _ensure_directory(db_path)
+        connection = sqlite3.connect(db_path)
+    except Exception as e:
+        print(f"Gagal membuka database SQLite di {db_path}: {e}")
+        return None
+    try:
+        return upsert_to_database(df, connection, table_name, paramstyle=sqlite3.paramstyle, **kwargs)
+    finally:
+        connection.close()
+
+def _load_to_sqlite_sink(df, output_path, **kwargs):
+    return load_to_sqlite(df, output_path, **kwargs) is not None
+
+# Loader yang bisa dipilih berdasarkan format; semua memakai signature (df, output_path, **kwargs)
+SINKS = {
+    'csv': load_to_csv,
+    'parquet': load_to_parquet,
+    'feather': load_to_feather,
+    'sqlite': _load_to_sqlite_sink,
+}
+
+def load_data(df, output_path, fmt=None, **kwargs):
+    """
+    Menyimpan DataFrame memakai loader dari SINKS. Jika fmt tidak diberikan,
+    format ditentukan dari ekstensi output_path (mis. products.parquet, products.csv.zst).
+    """
+    fmt = fmt or detect_format(output_path)
+    if fmt not in SINKS:
+        print(f"Format output tidak dikenali untuk {output_path}. Pilihan: {', '.join(SINKS)}")
+        return False
+    return SINKS[fmt](df, output_path, **kwargs)
+
+def read_output(input_path, fmt=None, compact=False):
+    """
+    Membaca kembali file hasil load dengan skema OUTPUT_DTYPES
+    (price/rating float64, colors int64), atau skema compact jika compact=True.
+    Mengembalikan None jika gagal.
+    """
+    fmt = fmt or detect_format(input_path)
+    try:
+        if fmt == 'csv':
+            # Kolom teks dibaca sebagai str agar nilai seperti timestamp tidak ditebak menjadi angka
+            csv_dtypes = {col: str if dtype == 'object' else dtype for col, dtype in OUTPUT_DTYPES.items()}
+            df = pd.read_csv(input_path, dtype=csv_dtypes)
+        elif fmt == 'parquet':
+            df = pd.read_parquet(input_path, engine='pyarrow')
+        elif fmt == 'feather':
+            df = pd.read_feather(input_path)
+        elif fmt == 'sqlite':
+            if not os.path.exists(input_path):
+                raise FileNotFoundError(input_path)
+            connection = sqlite3.connect(input_path)
+            try:
+                df = pd.read_sql_query(f"SELECT * FROM {_quote_identifier(SQLITE_TABLE_NAME)}", connection)
+            finally:
+                connection.close()
+            df = df.drop(columns=[ROW_HASH_COLUMN])
+        else:
+            print(f"Format input tidak dikenali untuk {input_path}.")
+            return None
+        # File yang ditulis dari skema compact (mis. timestamp datetime64) ikut dinormalkan
+        df = to_output_schema(df)
+        return to_compact_schema(df) if compact else df
+    except Exception as e:
+        print(f"Gagal membaca data dari {input_path}: {e}")
+        return None
\ No newline at end of file
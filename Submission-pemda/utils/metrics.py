@@ -0,0 +1,189 @@
+"""
+Instrumentasi ringan untuk pipeline ETL: waktu per tahap dan per halaman, histogram
+latensi, baris per detik, dan peak memory. Biayanya hanya beberapa perf_counter dan
+penambahan counter per halaman/request, jadi aman dibiarkan aktif di produksi.
+
+Laporan bisa ditulis sebagai JSON terstruktur dan/atau file teks format Prometheus
+(untuk textfile collector node_exporter).
+"""
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+# Batas atas bucket histogram latensi (detik), kumulatif seperti histogram Prometheus
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = "etl"
+
+def peak_rss_bytes():
+    """Peak resident memory proses ini dalam byte, None jika tidak tersedia di platform ini."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan kilobyte, macOS melaporkan byte
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class LatencyHistogram:
+    """Histogram dengan bucket tetap. Tidak memakai lock sendiri; pemanggil yang menjaga akses antar thread."""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        cumulative = 0
+        buckets = {}
+        for upper, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            buckets["+Inf" if upper == float('inf') else str(upper)] = cumulative
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+class StageTimer:
+    """Diisi di dalam blok PipelineMetrics.stage(); set atribut rows agar baris per detik ikut dihitung."""
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+
+class PipelineMetrics:
+    """Akumulator metrik per tahap dan per halaman, aman dipakai antar thread."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now().isoformat(timespec='seconds')
+            self.stages = []
+            self.pages = []
+            self.page_histogram = LatencyHistogram()
+
+    @contextmanager
+    def stage(self, name):
+        timer = StageTimer(name)
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            seconds = time.perf_counter() - start
+            record = {
+                "stage": name,
+                "seconds": seconds,
+                "rows": timer.rows,
+                "rows_per_second": timer.rows / seconds if timer.rows is not None and seconds > 0 else None,
+                "peak_rss_bytes": peak_rss_bytes(),
+            }
+            with self._lock:
+                self.stages.append(record)
+
+    def record_page(self, page_num, seconds, products, card_count):
+        with self._lock:
+            self.pages.append({"page": page_num, "seconds": seconds, "products": products, "cards": card_count})
+            self.page_histogram.observe(seconds)
+
+    def report(self, request_stats=None):
+        """Menyusun laporan dict; request_stats adalah RequestStats.snapshot() dari utils.extract."""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "stages": [dict(stage) for stage in self.stages],
+                "pages": {
+                    "count": len(self.pages),
+                    "wall_time": self.page_histogram.snapshot(),
+                    "records": sorted((dict(page) for page in self.pages), key=lambda page: page["page"]),
+                },
+                "requests": request_stats,
+                "peak_rss_bytes": peak_rss_bytes(),
+            }
+
+PIPELINE_METRICS = PipelineMetrics()
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def write_metrics_json(report, path):
+    try:
+        _write_atomic(path, json.dumps(report, indent=2))
+        print(f"Metrik pipeline disimpan ke: {path}")
+        return True
+    except Exception as e:
+        print(f"Gagal menyimpan metrik ke {path}: {e}")
+        return False
+
+def _prometheus_histogram(lines, name, help_text, histogram):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for upper, count in histogram["buckets"].items():
+        lines.append(f'{name}_bucket{{le="{upper}"}} {count}')
+    lines.append(f"{name}_sum {histogram['sum']}")
+    lines.append(f"{name}_count {histogram['count']}")
+
+def _prometheus_gauge(lines, name, help_text, samples):
+    samples = [(labels, value) for labels, value in samples if value is not None]
+    if not samples:
+        return
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    for labels, value in samples:
+        lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+
+def format_prometheus(report, prefix=METRIC_PREFIX):
+    """Mengubah laporan menjadi teks format eksposisi Prometheus."""
+    lines = []
+    stages = report["stages"]
+    for field, help_text in [
+        ("seconds", "Wall time per tahap pipeline"),
+        ("rows", "Jumlah baris keluaran per tahap"),
+        ("rows_per_second", "Baris per detik per tahap"),
+        ("peak_rss_bytes", "Peak RSS proses setelah tahap selesai"),
+    ]:
+        _prometheus_gauge(lines, f"{prefix}_stage_{field}", help_text,
+                          [(f'stage="{stage["stage"]}"', stage[field]) for stage in stages])
+
+    _prometheus_histogram(lines, f"{prefix}_page_duration_seconds",
+                          "Wall time fetch dan parse per halaman", report["pages"]["wall_time"])
+
+    requests_stats = report.get("requests")
+    if requests_stats:
+        if "latency_histogram" in requests_stats:
+            _prometheus_histogram(lines, f"{prefix}_request_latency_seconds",
+                                  "Latensi request HTTP", requests_stats["latency_histogram"])
+        for key, help_text in [
+            ("requests", "Jumlah request HTTP"),
+            ("failures", "Jumlah request HTTP yang gagal"),
+            ("not_modified", "Jumlah respons 304 Not Modified"),
+            ("bytes_downloaded", "Byte yang diunduh"),
+        ]:
+            _prometheus_gauge(lines, f"{prefix}_{key}", help_text, [("", requests_stats.get(key))])
+
+    _prometheus_gauge(lines, f"{prefix}_peak_rss_bytes", "Peak RSS proses", [("", report.get("peak_rss_bytes"))])
+    return "\n".join(lines) + "\n"
+
+def write_metrics_prometheus(report, path, prefix=METRIC_PREFIX):
+    try:
+        _write_atomic(path, format_prometheus(report, prefix))
+        print(f"Metrik Prometheus disimpan ke: {path}")
+        return True
+    except Exception as e:
+        print(f"Gagal menyimpan metrik Prometheus ke {path}: {e}")
+        return False
\ No newline at end of file
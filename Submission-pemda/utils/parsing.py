@@ -0,0 +1,361 @@
+"""
+Backend parsing HTML untuk halaman katalog fashion-studio.
+
+Setiap backend mengekstrak semua field kartu produk dalam satu lintasan per kartu
+(lxml dan selectolax memakai selector yang dikompilasi sekali saat modul dimuat),
+dan menghasilkan record yang identik dengan extract_product_details.
+
+Backend yang tersedia:
+- "bs4"        : BeautifulSoup + html.parser, satu find_all per kartu
+- "lxml"       : lxml.html dengan XPath terkompilasi (opsional, pip install lxml)
+- "selectolax" : parser Lexbor dari selectolax (opsional, pip install selectolax)
+
+Untuk situs katalog lain, parse_page_with_selectors mengekstrak field yang sama
+berdasarkan selector CSS dari konfigurasi situs.
+"""
+import re
+
+import soupsieve
+from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+
+try:
+    from lxml import etree
+    import lxml.html as lxml_html
+except ImportError:
+    etree = None
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+DEFAULT_BACKEND = "bs4"
+PRICE_UNAVAILABLE = "Price Unavailable"
+
+_NEXT_LINK_TEXT = re.compile(r'^\s*next\b', re.IGNORECASE)
+
+def available_backends():
+    backends = ["bs4"]
+    if lxml_html is not None:
+        backends.append("lxml")
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    return backends
+
+def resolve_backend(backend):
+    """Mengembalikan nama backend yang bisa dipakai, kembali ke "bs4" jika library-nya tidak terpasang."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in _PARSERS:
+        raise ValueError(f"Backend parsing tidak dikenal: {backend}. Pilihan: {', '.join(_PARSERS)}")
+    if backend not in available_backends():
+        print(f"Library untuk backend '{backend}' tidak terpasang, menggunakan '{DEFAULT_BACKEND}'.")
+        return DEFAULT_BACKEND
+    return backend
+
+def _decode(content):
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return UnicodeDammit(content).unicode_markup
+
+def _classes(value):
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return value.split()
+    return value
+
+def _build_record(title, has_price_container, price_text, price_p_text, has_unavailable_string, p_texts):
+    """
+    Menyusun record dengan aturan yang sama seperti extract_product_details.
+    has_unavailable_string adalah callable agar pencarian teks penuh hanya dilakukan bila perlu.
+    """
+    if title is None:
+        return None
+    details = {
+        "title": title,
+        "price": None,
+        "rating": None,
+        "colors": None,
+        "size": None,
+        "gender": None
+    }
+
+    if has_price_container:
+        details['price'] = price_text
+    elif price_p_text is not None and PRICE_UNAVAILABLE in price_p_text:
+        details['price'] = PRICE_UNAVAILABLE
+    elif has_unavailable_string():
+        details['price'] = PRICE_UNAVAILABLE
+
+    for text in p_texts:
+        if "Rating:" in text:
+            details['rating'] = text
+        elif "Colors" in text and "Size:" not in text and "Gender:" not in text:
+            details['colors'] = text
+        elif "Size:" in text:
+            details['size'] = text
+        elif "Gender:" in text:
+            details['gender'] = text
+    return details
+
+def _collect_products(records):
+    return [record for record in records if record and record.get('title')]
+
+# --- Backend bs4 ---
+# soupsieve lebih lambat dari pencarian bawaan bs4, jadi backend ini memakai satu
+# find_all berdasarkan nama tag per kartu lalu mengklasifikasikan hasilnya.
+
+_BS4_FIELD_TAGS = ['h3', 'div', 'p']
+
+def has_next_page(soup):
+    """
+    Membaca navigasi pagination: True jika ada link "Next" yang aktif, False jika
+    pagination ada tapi tanpa link berikutnya (halaman terakhir), None jika tidak ada pagination.
+    """
+    pagination = soup.find(class_='pagination')
+    if not pagination:
+        return None
+    next_item = (
+        pagination.find('li', class_='next')
+        or pagination.find('a', rel='next')
+        or pagination.find('a', string=_NEXT_LINK_TEXT)
+    )
+    if not next_item:
+        return False
+    if 'disabled' in (next_item.get('class') or []):
+        return False
+    return True
+
+def _bs4_card_record(card):
+    details_div = card.find('div', class_='product-details')
+    if details_div is None:
+        return None
+    title_tag = price_container = price_p = None
+    p_texts = []
+    for element in details_div.find_all(_BS4_FIELD_TAGS):
+        classes = element.get('class') or ()
+        if element.name == 'p':
+            if price_p is None and 'price' in classes:
+                price_p = element
+            p_texts.append(element.get_text().strip())
+        elif element.name == 'h3':
+            if title_tag is None and 'product-title' in classes:
+                title_tag = element
+        elif price_container is None and 'price-container' in classes:
+            price_container = element
+
+    price_text = None
+    if price_container is not None:
+        price_tag = price_container.find('span', class_='price')
+        price_text = price_tag.get_text().strip() if price_tag is not None else None
+
+    return _build_record(
+        title_tag.get_text().strip() if title_tag is not None else None,
+        price_container is not None,
+        price_text,
+        price_p.get_text() if price_p is not None else None,
+        lambda: details_div.find(string=PRICE_UNAVAILABLE) is not None,
+        p_texts,
+    )
+
+def _parse_bs4(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    cards = soup.find_all('div', class_='collection-card')
+    products = _collect_products(_bs4_card_record(card) for card in cards)
+    return products, len(cards), has_next_page(soup)
+
+# --- Backend lxml (XPath terkompilasi) ---
+
+def _xp_class(tag, class_name):
+    return f'{tag}[contains(concat(" ", normalize-space(@class), " "), " {class_name} ")]'
+
+if etree is not None:
+    _XP_CARDS = etree.XPath('//' + _xp_class('div', 'collection-card'))
+    _XP_DETAILS = etree.XPath('(.//' + _xp_class('div', 'product-details') + ')[1]')
+    _XP_FIELDS = etree.XPath(
+        './/' + _xp_class('h3', 'product-title')
+        + ' | .//' + _xp_class('div', 'price-container')
+        + ' | .//p'
+    )
+    _XP_PRICE = etree.XPath('(.//' + _xp_class('span', 'price') + ')[1]')
+    _XP_UNAVAILABLE = etree.XPath('.//text()[. = $text]')
+    _XP_PAGINATION = etree.XPath('(//*[contains(concat(" ", normalize-space(@class), " "), " pagination ")])[1]')
+    _XP_NEXT_ITEM = etree.XPath('(.//' + _xp_class('li', 'next') + ')[1]')
+    _XP_NEXT_REL = etree.XPath('(.//a[contains(concat(" ", normalize-space(@rel), " "), " next ")])[1]')
+    _XP_LINKS = etree.XPath('.//a')
+
+def _lxml_has_next_page(tree):
+    found = _XP_PAGINATION(tree)
+    if not found:
+        return None
+    pagination = found[0]
+    next_item = _XP_NEXT_ITEM(pagination) or _XP_NEXT_REL(pagination)
+    if not next_item:
+        next_item = [
+            link for link in _XP_LINKS(pagination)
+            if len(link) == 0 and link.text and _NEXT_LINK_TEXT.match(link.text)
+        ][:1]
+    if not next_item:
+        return False
+    return 'disabled' not in _classes(next_item[0].get('class'))
+
+def _lxml_card_record(card):
+    found = _XP_DETAILS(card)
+    if not found:
+        return None
+    details_div = found[0]
+    title_tag = price_container = price_p = None
+    p_texts = []
+    for element in _XP_FIELDS(details_div):
+        if element.tag == 'p':
+            if price_p is None and 'price' in _classes(element.get('class')):
+                price_p = element
+            p_texts.append(element.text_content().strip())
+        elif element.tag == 'h3':
+            title_tag = title_tag if title_tag is not None else element
+        elif price_container is None:
+            price_container = element
+
+    price_text = None
+    if price_container is not None:
+        price_tag = _XP_PRICE(price_container)
+        price_text = price_tag[0].text_content().strip() if price_tag else None
+
+    return _build_record(
+        title_tag.text_content().strip() if title_tag is not None else None,
+        price_container is not None,
+        price_text,
+        price_p.text_content() if price_p is not None else None,
+        lambda: bool(_XP_UNAVAILABLE(details_div, text=PRICE_UNAVAILABLE)),
+        p_texts,
+    )
+
+def _parse_lxml(content):
+    text = _decode(content)
+    if not text.strip():
+        return [], 0, None
+    tree = lxml_html.document_fromstring(text)
+    cards = _XP_CARDS(tree)
+    products = _collect_products(_lxml_card_record(card) for card in cards)
+    return products, len(cards), _lxml_has_next_page(tree)
+
+# --- Backend selectolax (Lexbor) ---
+
+_CSS_CARD = 'div.collection-card'
+_CSS_DETAILS = 'div.product-details'
+_CSS_FIELDS = 'h3.product-title, div.price-container, p'
+_CSS_PRICE = 'span.price'
+
+def _selectolax_has_next_page(tree):
+    pagination = tree.css_first('.pagination')
+    if pagination is None:
+        return None
+    next_item = pagination.css_first('li.next') or pagination.css_first('a[rel~="next"]')
+    if next_item is None:
+        for link in pagination.css('a'):
+            child = link.child
+            if child is not None and child.is_text_node and child.next is None and _NEXT_LINK_TEXT.match(child.text_content or ""):
+                next_item = link
+                break
+    if next_item is None:
+        return False
+    return 'disabled' not in _classes(next_item.attributes.get('class'))
+
+def _selectolax_has_unavailable_string(details_div):
+    for node in details_div.traverse(include_text=True):
+        if node.is_text_node and node.text_content == PRICE_UNAVAILABLE:
+            return True
+    return False
+
+def _selectolax_card_record(card):
+    details_div = card.css_first(_CSS_DETAILS)
+    if details_div is None:
+        return None
+    title_tag = price_container = price_p = None
+    p_texts = []
+    for element in details_div.css(_CSS_FIELDS):
+        if element.tag == 'p':
+            if price_p is None and 'price' in _classes(element.attributes.get('class')):
+                price_p = element
+            p_texts.append(element.text().strip())
+        elif element.tag == 'h3':
+            title_tag = title_tag if title_tag is not None else element
+        elif price_container is None:
+            price_container = element
+
+    price_text = None
+    if price_container is not None:
+        price_tag = price_container.css_first(_CSS_PRICE)
+        price_text = price_tag.text().strip() if price_tag is not None else None
+
+    return _build_record(
+        title_tag.text().strip() if title_tag is not None else None,
+        price_container is not None,
+        price_text,
+        price_p.text() if price_p is not None else None,
+        lambda: _selectolax_has_unavailable_string(details_div),
+        p_texts,
+    )
+
+def _parse_selectolax(content):
+    tree = LexborHTMLParser(_decode(content))
+    cards = tree.css(_CSS_CARD)
+    products = _collect_products(_selectolax_card_record(card) for card in cards)
+    return products, len(cards), _selectolax_has_next_page(tree)
+
+_PARSERS = {
+    "bs4": _parse_bs4,
+    "lxml": _parse_lxml,
+    "selectolax": _parse_selectolax,
+}
+
+def parse_page(content, backend=DEFAULT_BACKEND):
+    """
+    Mem-parse HTML satu halaman katalog.
+    Mengembalikan (list detail produk, jumlah kartu, has_next).
+    """
+    return _PARSERS[resolve_backend(backend)](content)
+
+# --- Parser generik berbasis selector CSS (situs lain) ---
+
+SELECTOR_FIELDS = ('title', 'price', 'rating', 'colors', 'size', 'gender')
+SELECTOR_KEYS = ('card', 'next') + SELECTOR_FIELDS
+
+def validate_selectors(selectors):
+    """Memastikan selectors punya 'card', hanya memakai key yang dikenal, dan semua selector valid."""
+    if not isinstance(selectors, dict) or not selectors.get('card'):
+        raise ValueError("Selector situs harus berupa dict dengan key 'card'")
+    unknown = sorted(set(selectors) - set(SELECTOR_KEYS))
+    if unknown:
+        raise ValueError(f"Key selector tidak dikenal: {', '.join(unknown)}. Pilihan: {', '.join(SELECTOR_KEYS)}")
+    for key, selector in selectors.items():
+        try:
+            soupsieve.compile(selector)
+        except Exception as e:
+            raise ValueError(f"Selector '{key}' tidak valid ({selector!r}): {e}") from e
+    return selectors
+
+def parse_page_with_selectors(content, selectors):
+    """
+    Mem-parse halaman katalog situs lain: selectors['card'] memilih kartu produk, dan
+    selectors[field] memilih elemen di dalam kartu yang teksnya (di-strip) menjadi nilai
+    field tersebut (None jika tidak ada). selectors['next'] opsional memilih link halaman
+    berikutnya; tanpa itu has_next bernilai None. Kartu tanpa title dilewati.
+    Mengembalikan (list detail produk, jumlah kartu, has_next) seperti parse_page.
+    """
+    soup = BeautifulSoup(_decode(content), 'html.parser')
+    cards = soup.select(selectors['card'])
+    records = []
+    for card in cards:
+        record = {}
+        for field in SELECTOR_FIELDS:
+            element = card.select_one(selectors[field]) if selectors.get(field) else None
+            record[field] = element.get_text().strip() if element is not None else None
+        records.append(record)
+    has_next = soup.select_one(selectors['next']) is not None if selectors.get('next') else None
+    return _collect_products(records), len(cards), has_next
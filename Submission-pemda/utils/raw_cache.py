@@ -0,0 +1,211 @@
+"""
+Cache data mentah hasil ekstraksi untuk replay transform/load tanpa scraping ulang.
+
+Isi DataFrame disimpan sekali per hash kontennya (content-addressed) di folder blobs/
+sebagai Feather (Arrow IPC, zstd) atau pickle jika pyarrow tidak terpasang. manifest.json
+memetakan (source, date) ke hash tersebut, sehingga run ulang di hari yang sama dengan
+hasil identik tidak menambah ukuran cache. Jika total ukuran blob melebihi batas, entri
+yang paling lama tidak dipakai dihapus lebih dulu.
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import date as date_type
+
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.feather
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+RAW_CACHE_DIR = ".raw_cache"
+# Batas total ukuran blob di cache (byte)
+RAW_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MANIFEST_FILENAME = "manifest.json"
+BLOB_DIRNAME = "blobs"
+RAW_CACHE_COMPRESSION = "zstd"
+
+class _HashWriter:
+    """File-like tujuan tulis yang hanya meng-update hash SHA-256."""
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.closed = False
+
+    def write(self, data):
+        self.digest.update(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+def _arrow_table(df):
+    # combine_chunks: isi yang sama selalu diserialisasi sama, berapa pun pembagian chunk-nya
+    return pyarrow.Table.from_pandas(df, preserve_index=False).combine_chunks()
+
+def _table_key(table):
+    writer = _HashWriter()
+    with pyarrow.ipc.new_stream(pyarrow.PythonFile(writer, mode='w'), table.schema) as stream:
+        stream.write_table(table)
+    return writer.digest.hexdigest()
+
+def content_key(df):
+    """
+    Hash SHA-256 dari nama kolom dan isi DataFrame (urutan baris ikut dihitung, index tidak).
+    Dengan pyarrow yang di-hash adalah stream Arrow IPC-nya, jauh lebih cepat daripada
+    hash per baris untuk kolom string.
+    """
+    if pyarrow is not None:
+        return _table_key(_arrow_table(df))
+    digest = hashlib.sha256("\x1f".join(map(str, df.columns)).encode('utf-8'))
+    digest.update(str(len(df)).encode('ascii'))
+    if len(df.columns):
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _entry_key(source, date):
+    return f"{source}|{date}"
+
+def _manifest_path(cache_dir):
+    return os.path.join(cache_dir, MANIFEST_FILENAME)
+
+def _read_manifest(cache_dir):
+    path = _manifest_path(cache_dir)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Manifest cache data mentah tidak bisa dibaca ({e}), cache dianggap kosong.")
+        return {}
+
+def _write_manifest(cache_dir, manifest):
+    path = _manifest_path(cache_dir)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+def _blob_path(cache_dir, filename):
+    return os.path.join(cache_dir, BLOB_DIRNAME, filename)
+
+def _write_blob(data, path):
+    """data berupa pyarrow.Table untuk blob .feather, atau DataFrame untuk blob .pkl."""
+    tmp_path = f"{path}.tmp"
+    if path.endswith(".feather"):
+        pyarrow.feather.write_feather(data, tmp_path, compression=RAW_CACHE_COMPRESSION)
+    else:
+        data.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+def _read_blob(path):
+    if path.endswith(".feather"):
+        return pd.read_feather(path)
+    return pd.read_pickle(path)
+
+def _remove_unreferenced_blobs(cache_dir, manifest):
+    referenced = {entry['file'] for entry in manifest.values()}
+    blob_dir = os.path.join(cache_dir, BLOB_DIRNAME)
+    if not os.path.isdir(blob_dir):
+        return
+    for filename in os.listdir(blob_dir):
+        if filename not in referenced:
+            os.remove(os.path.join(blob_dir, filename))
+
+def _evict(cache_dir, manifest, max_bytes, keep_key=None):
+    """Menghapus entri yang paling lama tidak dipakai sampai total ukuran blob <= max_bytes."""
+    def total_bytes():
+        return sum({entry['file']: entry['bytes'] for entry in manifest.values()}.values())
+
+    evicted = []
+    for key, _ in sorted(manifest.items(), key=lambda item: item[1]['last_used']):
+        if total_bytes() <= max_bytes:
+            break
+        if key == keep_key:
+            continue
+        del manifest[key]
+        evicted.append(key)
+    if evicted:
+        print(f"Cache data mentah melebihi {max_bytes} byte, {len(evicted)} entri lama dihapus.")
+    return evicted
+
+def store_raw(df, source, date=None, cache_dir=RAW_CACHE_DIR, max_bytes=RAW_CACHE_MAX_BYTES):
+    """
+    Menyimpan data mentah untuk (source, date), date default hari ini (YYYY-MM-DD).
+    Mengembalikan hash konten, atau None jika gagal.
+    """
+    if df is None or df.empty:
+        print("Tidak ada data mentah untuk disimpan ke cache.")
+        return None
+    date = date or date_type.today().isoformat()
+    try:
+        if pyarrow is not None:
+            data = _arrow_table(df)
+            digest = _table_key(data)
+            filename = f"{digest}.feather"
+        else:
+            data = df
+            digest = content_key(df)
+            filename = f"{digest}.pkl"
+        path = _blob_path(cache_dir, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.exists(path):
+            _write_blob(data, path)
+
+        manifest = _read_manifest(cache_dir)
+        now = time.time()
+        key = _entry_key(source, date)
+        manifest[key] = {
+            'source': source, 'date': date, 'file': filename, 'rows': len(df),
+            'bytes': os.path.getsize(path), 'created': now, 'last_used': now,
+        }
+        _evict(cache_dir, manifest, max_bytes, keep_key=key)
+        _write_manifest(cache_dir, manifest)
+        _remove_unreferenced_blobs(cache_dir, manifest)
+        print(f"Data mentah ({len(df)} baris) disimpan ke cache {cache_dir} untuk {source} tanggal {date}.")
+        return digest
+    except Exception as e:
+        print(f"Gagal menyimpan data mentah ke cache {cache_dir}: {e}")
+        return None
+
+def list_raw_entries(cache_dir=RAW_CACHE_DIR, source=None):
+    """Entri manifest (dict) terurut berdasarkan tanggal, opsional hanya untuk satu source."""
+    entries = [entry for entry in _read_manifest(cache_dir).values() if source is None or entry['source'] == source]
+    return sorted(entries, key=lambda entry: (entry['date'], entry['created']))
+
+def load_raw(source, date=None, cache_dir=RAW_CACHE_DIR):
+    """
+    Memuat data mentah untuk (source, date); tanpa date dipakai tanggal terbaru dari source
+    tersebut. Mengembalikan DataFrame, atau None jika tidak ada di cache.
+    """
+    manifest = _read_manifest(cache_dir)
+    if date is None:
+        entries = list_raw_entries(cache_dir, source)
+        if not entries:
+            print(f"Tidak ada data mentah di cache {cache_dir} untuk {source}.")
+            return None
+        date = entries[-1]['date']
+    key = _entry_key(source, date)
+    entry = manifest.get(key)
+    if entry is None:
+        print(f"Tidak ada data mentah di cache {cache_dir} untuk {source} tanggal {date}.")
+        return None
+    path = _blob_path(cache_dir, entry['file'])
+    try:
+        df = _read_blob(path)
+    except Exception as e:
+        print(f"Gagal membaca data mentah dari cache {path}: {e}")
+        return None
+    entry['last_used'] = time.time()
+    try:
+        _write_manifest(cache_dir, manifest)
+    except OSError:
+        pass # urutan eviction kurang akurat, data tetap bisa dipakai
+    print(f"Data mentah ({len(df)} baris) dimuat dari cache untuk {source} tanggal {date}.")
+    return df
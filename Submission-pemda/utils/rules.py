@@ -0,0 +1,295 @@
+"""
+Engine aturan pembersihan kolom yang deklaratif.
+
+Aturan satu kolom adalah list langkah, masing-masing nama operasi atau [operasi, argumen],
+sehingga aturan untuk situs baru bisa ditulis sebagai data (mis. file JSON) tanpa fungsi
+Python baru:
+
+    ["strip", ["reject_equals", ["unknown product"]], ["replace", {"$": ""}], "to_float",
+     ["multiply", "usd_to_idr_rate"]]
+
+compile_rules mengompilasi semua regex dan parameter sekali. Saat dijalankan, setiap kolom
+di-factorize sekali lalu seluruh langkah berjalan berurutan dalam satu pass atas nilai
+uniknya (string array pandas, berbasis Arrow jika pyarrow terpasang), dan hasilnya
+dipetakan kembali ke tiap baris. Operasi literal memakai kernel string pandas; regex dan
+konversi angka memakai re/float Python agar hasilnya sama persis dengan cleaner skalar.
+
+Operasi yang tersedia:
+    strip                     menghapus whitespace di awal/akhir (definisi str.isspace)
+    empty_to_null             string kosong menjadi null
+    reject_equals [teks]      null jika nilai (lowercase) sama dengan salah satu teks
+    reject_contains [teks]    null jika nilai (lowercase) mengandung salah satu teks
+    reject_suffix [teks]      null jika nilai (lowercase) berakhiran salah satu teks
+    reject_pattern regex      null jika regex ditemukan di nilai
+    replace {lama: baru}      penggantian teks literal
+    remove_pattern regex      menghapus semua kecocokan regex (pakai (?i) untuk case-insensitive)
+    extract regex             grup pertama kecocokan pertama, null jika tidak cocok
+    to_float / to_int         konversi seperti float()/int(), null jika gagal
+    multiply angka|parameter  mengalikan hasil angka, parameter diambil dari params compile_rules
+"""
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.compute
+except ImportError:
+    pyarrow = None
+
+# Semua karakter yang dianggap whitespace oleh str.isspace()/str.strip() Python
+WHITESPACE_CHARS = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+    "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+
+_TEXT_OPERATIONS = {'strip', 'empty_to_null', 'reject_equals', 'reject_contains', 'reject_suffix',
+                    'reject_pattern', 'replace', 'remove_pattern', 'extract'}
+_NUMBER_OPERATIONS = {'multiply'}
+_CONVERSIONS = {'to_float': float, 'to_int': int}
+
+class RuleError(ValueError):
+    """Aturan pembersihan tidak valid (operasi tidak dikenal, argumen salah, parameter hilang)."""
+
+# --- Helper factorize: setiap nilai unik dibersihkan sekali ---
+
+def _factorize_as_str(series):
+    """
+    Kode per baris (-1 untuk NaN) dan nilai unik sebagai Series dtype str, dengan nilai
+    non-string diubah seperti str(x) pada cleaner skalar.
+    """
+    if isinstance(series.dtype, pd.StringDtype):
+        codes, uniques = pd.factorize(series)
+    else:
+        values = series.astype(object)
+        if pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+            notna = values.notna()
+            values = values.copy()
+            values[notna] = values[notna].map(str)
+        codes, uniques = pd.factorize(values)
+    return codes, pd.Series(uniques, dtype='str')
+
+def _map_unique(series, clean_uniques):
+    """Menjalankan clean_uniques sekali per nilai unik lalu menyusun ulang hasilnya per baris."""
+    codes, uniques = _factorize_as_str(series)
+    cleaned = np.asarray(clean_uniques(uniques))
+    # Kode -1 (NaN) mengambil elemen terakhir, yaitu NaN/None
+    na_value = np.nan if cleaned.dtype.kind == 'f' else None
+    lookup = np.append(cleaned, np.array([na_value], dtype=cleaned.dtype))
+    return pd.Series(lookup[codes], index=series.index, dtype=lookup.dtype)
+
+def _strings_to_numbers(strings, convert):
+    """Konversi array str ke angka dengan semantik convert (float/int); gagal -> None."""
+    result = np.full(len(strings), None, dtype=object)
+    present = pd.notna(strings)
+    target = np.float64 if convert is float else np.int64
+    try:
+        # Cast object -> numpy memanggil float()/int() di level C, hasilnya identik dengan Python
+        result[present] = strings[present].astype(target).astype(object)
+    except (ValueError, OverflowError):
+        for i in np.flatnonzero(present):
+            try:
+                result[i] = convert(strings[i])
+            except (ValueError, OverflowError):
+                result[i] = None
+    return result
+
+# --- Operasi atas string array nilai unik ---
+
+def _to_python(values):
+    return values.astype(object)
+
+def _from_python(values):
+    return values.astype('str')
+
+def _non_ascii(values):
+    is_ascii = pyarrow.compute.string_is_ascii(pyarrow.array(values.array)).fill_null(True)
+    return pd.Series(~is_ascii.to_numpy(zero_copy_only=False), index=values.index)
+
+def _lower(values):
+    lowered = values.str.lower()
+    if pyarrow is not None and getattr(values.dtype, 'storage', None) == 'pyarrow':
+        # Kernel Arrow memakai case mapping sederhana (mis. "İ"), jadi nilai non-ASCII
+        # di-lowercase dengan str.lower() Python agar sama dengan cleaner skalar
+        non_ascii = _non_ascii(values)
+        if non_ascii.any():
+            lowered = lowered.astype(object)
+            lowered[non_ascii] = [value.lower() for value in values[non_ascii]]
+            lowered = _from_python(lowered)
+    return lowered
+
+def _reject(values, mask):
+    return values.where(~mask.fillna(False).astype(bool))
+
+class _Pass:
+    """State satu pass: nilai saat ini dan cache lowercase-nya (dihitung sekali per perubahan nilai)."""
+    def __init__(self, values):
+        self.values = values
+        self._lowered = None
+
+    def set(self, values):
+        self.values = values
+        self._lowered = None
+
+    @property
+    def lowered(self):
+        if self._lowered is None:
+            self._lowered = _lower(self.values)
+        return self._lowered
+
+def _parse_step(step):
+    if isinstance(step, str):
+        return step, None
+    if isinstance(step, (list, tuple)) and len(step) == 2 and isinstance(step[0], str):
+        return step[0], step[1]
+    raise RuleError(f"Langkah aturan tidak valid: {step!r}")
+
+def _compile_text_step(operation, argument):
+    if operation == 'strip':
+        return lambda state: state.set(state.values.str.strip(WHITESPACE_CHARS))
+    if operation == 'empty_to_null':
+        return lambda state: state.set(_reject(state.values, state.values == ''))
+    if operation in ('reject_equals', 'reject_contains', 'reject_suffix'):
+        if not isinstance(argument, (list, tuple)) or not argument:
+            raise RuleError(f"{operation} membutuhkan list teks, didapat {argument!r}")
+        targets = [str(target).lower() for target in argument]
+        if operation == 'reject_equals':
+            return lambda state: state.set(_reject(state.values, state.lowered.isin(targets)))
+        if operation == 'reject_suffix':
+            suffixes = tuple(targets)
+            return lambda state: state.set(_reject(state.values, state.lowered.str.endswith(suffixes)))
+
+        def reject_contains(state):
+            mask = pd.Series(False, index=state.values.index)
+            for target in targets:
+                mask |= state.lowered.str.contains(target, regex=False).fillna(False).astype(bool)
+            state.set(_reject(state.values, mask))
+        return reject_contains
+    if operation == 'replace':
+        if not isinstance(argument, dict) or not argument:
+            raise RuleError(f"replace membutuhkan dict {{lama: baru}}, didapat {argument!r}")
+        replacements = list(argument.items())
+
+        def replace(state):
+            values = state.values
+            for old, new in replacements:
+                values = values.str.replace(old, new, regex=False)
+            state.set(values)
+        return replace
+    # Operasi regex: re Python atas nilai unik (object) agar semantik \d, \s, dst. sama dengan cleaner skalar
+    try:
+        pattern = re.compile(argument)
+    except (TypeError, re.error) as e:
+        raise RuleError(f"Regex tidak valid untuk {operation}: {argument!r} ({e})")
+    if operation == 'reject_pattern':
+        return lambda state: state.set(_reject(state.values, _to_python(state.values).str.contains(pattern)))
+    if operation == 'remove_pattern':
+        return lambda state: state.set(_from_python(_to_python(state.values).str.replace(pattern, '', regex=True)))
+    if operation == 'extract':
+        if pattern.groups < 1:
+            raise RuleError(f"Regex extract membutuhkan minimal satu grup: {argument!r}")
+        return lambda state: state.set(_from_python(_to_python(state.values).str.extract(pattern, expand=True)[0]))
+    raise RuleError(f"Operasi teks tidak dikenal: {operation}")
+
+class ColumnRule:
+    """Aturan satu kolom yang sudah dikompilasi: langkah teks, konversi angka opsional, langkah angka."""
+    def __init__(self, column, steps, params=None):
+        self.column = column
+        self.steps = list(steps)
+        params = params or {}
+        self._text_steps = []
+        self._convert = None
+        self._number_steps = []
+        for step in self.steps:
+            operation, argument = _parse_step(step)
+            if operation in _CONVERSIONS:
+                if self._convert is not None:
+                    raise RuleError(f"Kolom {column}: hanya boleh ada satu konversi angka")
+                self._convert = _CONVERSIONS[operation]
+            elif operation in _NUMBER_OPERATIONS:
+                if self._convert is None:
+                    raise RuleError(f"Kolom {column}: {operation} harus setelah to_float/to_int")
+                factor = params.get(argument, argument) if isinstance(argument, str) else argument
+                if isinstance(factor, str) or not isinstance(factor, (int, float)):
+                    raise RuleError(f"Kolom {column}: parameter multiply tidak ditemukan: {argument!r}")
+                self._number_steps.append(factor)
+            elif operation in _TEXT_OPERATIONS:
+                if self._convert is not None:
+                    raise RuleError(f"Kolom {column}: {operation} tidak bisa dipakai setelah konversi angka")
+                self._text_steps.append(_compile_text_step(operation, argument))
+            else:
+                raise RuleError(f"Kolom {column}: operasi tidak dikenal: {operation}")
+
+    def clean_uniques(self, uniques):
+        """Menjalankan semua langkah atas nilai unik (Series dtype str) dalam satu pass."""
+        state = _Pass(uniques if uniques.dtype == 'str' else _from_python(uniques))
+        for step in self._text_steps:
+            step(state)
+        values = state.values.to_numpy(dtype=object, na_value=None)
+        if self._convert is None:
+            return values
+        numbers = _strings_to_numbers(values, self._convert)
+        if self._convert is float:
+            numbers = numbers.astype(np.float64)
+            for factor in self._number_steps:
+                numbers = numbers * factor
+            return numbers
+        for factor in self._number_steps:
+            numbers = np.array([None if number is None else number * factor for number in numbers], dtype=object)
+        if all(abs(number) < 2 ** 53 for number in numbers if number is not None):
+            # Semua nilai bisa disimpan tepat sebagai float64
+            return numbers.astype(np.float64)
+        return numbers
+
+    def __call__(self, series):
+        cleaned = _map_unique(series, self.clean_uniques)
+        if self._convert is int:
+            # int64 jika semua baris punya angka, float64 jika ada NaN (sama seperti Series.apply)
+            if cleaned.dtype == np.float64:
+                return cleaned if cleaned.isna().any() else cleaned.astype(np.int64)
+            return cleaned.infer_objects()
+        return cleaned
+
+class RuleSet:
+    """Kumpulan ColumnRule per kolom hasil compile_rules."""
+    def __init__(self, column_rules):
+        self.column_rules = dict(column_rules)
+
+    def __contains__(self, column):
+        return column in self.column_rules
+
+    def __getitem__(self, column):
+        return self.column_rules[column]
+
+    @property
+    def columns(self):
+        return list(self.column_rules)
+
+    def clean(self, df):
+        """Membersihkan semua kolom yang punya aturan; kolom lain dibiarkan."""
+        df = df.copy()
+        for column, rule in self.column_rules.items():
+            if column in df.columns:
+                df[column] = rule(df[column])
+        return df
+
+def compile_rules(rules, params=None):
+    """
+    Mengompilasi aturan deklaratif {kolom: [langkah, ...]} menjadi RuleSet.
+    params berisi nilai bernama untuk langkah seperti ["multiply", "usd_to_idr_rate"].
+    Melempar RuleError jika aturan tidak valid.
+    """
+    if not isinstance(rules, dict):
+        raise RuleError("Aturan harus berupa dict {kolom: [langkah, ...]}")
+    return RuleSet({column: ColumnRule(column, steps, params) for column, steps in rules.items()})
+
+def load_rules(path):
+    """Membaca aturan deklaratif dari file JSON. Mengembalikan dict, atau None jika gagal."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Gagal membaca aturan pembersihan dari {path}: {e}")
+        return None
@@ -2,9 +2,52 @@ import pandas as pd
 import numpy as np
 import re
 
+from utils.rules import compile_rules
+
 # Asumsi nilai tukar
 USD_TO_IDR_RATE = 16000
 
+# Kolom yang menentukan identitas baris saat menghapus duplikat dan nilai kosong
+PRODUCT_COLUMNS = ['title', 'price', 'rating', 'colors', 'size', 'gender']
+# Kolom yang mengidentifikasi satu produk antar run (dipakai sebagai key upsert di database)
+PRODUCT_KEY_COLUMNS = ['title', 'size', 'gender']
+# Kolom asal situs pada mode multi-sumber (utils.extract.extract_sites). Jika ada, kolom ini
+# ikut menentukan identitas produk agar produk yang sama dari situs berbeda tidak digabung.
+SOURCE_COLUMN = 'source'
+
+# Skema tipe data hasil transform_data (juga dipakai loader untuk membaca kembali file output)
+OUTPUT_DTYPES = {
+    'title': 'object',
+    'price': 'float64',
+    'rating': 'float64',
+    'colors': 'int64',
+    'size': 'object',
+    'gender': 'object',
+    'timestamp': 'object'
+}
+
+# Skema hemat memori (opsional, transform_data(compact=True)): size/gender dan timestamp
+# yang nilainya hanya sedikit disimpan sebagai category/datetime64. price/rating hanya
+# menjadi float32 dan colors hanya menjadi int8 jika semua nilainya muat tanpa berubah.
+COMPACT_OUTPUT_DTYPES = {
+    'title': 'str',
+    'price': 'float32',
+    'rating': 'float32',
+    'colors': 'int8',
+    'size': 'category',
+    'gender': 'category',
+    'timestamp': 'datetime64[s]'
+}
+# Format kolom timestamp dari extract (dipakai juga untuk mengubah datetime64 kembali ke teks)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Pola regex dikompilasi sekali dan dipakai bersama oleh cleaner skalar maupun versi kolom
+_IMAGE_EXTENSION_PATTERN = re.compile(r'\.(?:jpeg|jpg|png|gif)$')
+_DECIMAL_PATTERN = re.compile(r'(\d+(?:\.\d+)?)')
+_INTEGER_PATTERN = re.compile(r'(\d+)')
+_SIZE_PREFIX_PATTERN = re.compile(r'Size:\s*', re.IGNORECASE)
+_GENDER_PREFIX_PATTERN = re.compile(r'Gender:\s*', re.IGNORECASE)
+
 def clean_title(title):
     """Membersihkan judul."""
     if pd.isna(title):
@@ -14,7 +57,7 @@ def clean_title(title):
     if title_stripped.lower() == "unknown product":
         return None
     # Cek apakah title mengandung ekstensi file gambar
-    if re.search(r'\.(jpeg|jpg|png|gif)$', title_stripped.lower()):
+    if _IMAGE_EXTENSION_PATTERN.search(title_stripped.lower()):
         return None
     return title_stripped
 
@@ -29,9 +72,6 @@ def convert_price_to_idr(price_str):
         price_usd = float(cleaned_price)
         return price_usd * USD_TO_IDR_RATE
     except ValueError:
-
-        if re.search(r'\.(jpeg|jpg|png|gif)$', cleaned_price.lower()):
-            return None
         return None
 
 def clean_rating(rating_str):
@@ -40,26 +80,24 @@ def clean_rating(rating_str):
         return None
     
     rating_text = str(rating_str).strip()
+    rating_lower = rating_text.lower()
     # Menangani "Invalid Rating" atau "Not Rated"
-    if "invalid rating" in rating_text.lower() or "not rated" in rating_text.lower():
+    if "invalid rating" in rating_lower or "not rated" in rating_lower:
         return None
     
-    match = re.search(r'(\d+(\.\d+)?)', rating_text)
+    match = _DECIMAL_PATTERN.search(rating_text)
     if match:
         try:
             return float(match.group(1))
         except ValueError:
             return None
-
-    if re.search(r'\.(jpeg|jpg|png|gif)$', rating_text.lower()):
-        return None
     return None
 
 def clean_colors(colors_str):
     
     if pd.isna(colors_str):
         return None
-    match = re.search(r'\d+', str(colors_str))
+    match = _INTEGER_PATTERN.search(str(colors_str))
     if match:
         try:
             return int(match.group(0))
@@ -71,17 +109,134 @@ def clean_size(size_str):
     
     if pd.isna(size_str):
         return None
-    cleaned_size = re.sub(r'Size:\s*', '', str(size_str), flags=re.IGNORECASE).strip()
+    cleaned_size = _SIZE_PREFIX_PATTERN.sub('', str(size_str)).strip()
     return cleaned_size if cleaned_size else None
 
 def clean_gender(gender_str):
     
     if pd.isna(gender_str):
         return None
-    cleaned_gender = re.sub(r'Gender:\s*', '', str(gender_str), flags=re.IGNORECASE).strip()
+    cleaned_gender = _GENDER_PREFIX_PATTERN.sub('', str(gender_str)).strip()
     return cleaned_gender if cleaned_gender else None
 
-def transform_data(df_raw):
+# --- Versi kolom (vektor): aturan deklaratif untuk utils.rules ---
+# Setara dengan cleaner skalar di atas. Kolom di-factorize sekali, seluruh langkah
+# dijalankan atas nilai uniknya dalam satu pass, lalu dipetakan kembali ke tiap baris.
+# Aturan situs lain cukup ditulis sebagai data dan dikompilasi dengan compile_rules.
+DEFAULT_CLEANING_RULES = {
+    'title': ["strip", ["reject_equals", ["unknown product"]], ["reject_suffix", [".jpeg", ".jpg", ".png", ".gif"]]],
+    'price': ["strip", ["reject_equals", ["price unavailable"]], ["replace", {"$": "", ",": ""}], "strip",
+              "to_float", ["multiply", "usd_to_idr_rate"]],
+    'rating': ["strip", ["reject_contains", ["invalid rating", "not rated"]], ["extract", _DECIMAL_PATTERN.pattern],
+               "to_float"],
+    'colors': [["extract", _INTEGER_PATTERN.pattern], "to_int"],
+    'size': [["remove_pattern", r"(?i)Size:\s*"], "strip", "empty_to_null"],
+    'gender': [["remove_pattern", r"(?i)Gender:\s*"], "strip", "empty_to_null"],
+}
+
+def compile_cleaning_rules(rules=None, usd_to_idr_rate=None):
+    """Mengompilasi aturan pembersihan (default DEFAULT_CLEANING_RULES) dengan kurs USD->IDR tertentu."""
+    rate = USD_TO_IDR_RATE if usd_to_idr_rate is None else usd_to_idr_rate
+    return compile_rules(DEFAULT_CLEANING_RULES if rules is None else rules, {'usd_to_idr_rate': rate})
+
+DEFAULT_RULESET = compile_cleaning_rules()
+
+def clean_title_column(titles):
+    return DEFAULT_RULESET['title'](titles)
+
+def convert_price_column_to_idr(prices):
+    return DEFAULT_RULESET['price'](prices)
+
+def clean_rating_column(ratings):
+    return DEFAULT_RULESET['rating'](ratings)
+
+def clean_colors_column(colors):
+    return DEFAULT_RULESET['colors'](colors)
+
+def clean_size_column(sizes):
+    return DEFAULT_RULESET['size'](sizes)
+
+def clean_gender_column(genders):
+    return DEFAULT_RULESET['gender'](genders)
+
+# Pasangan (cleaner skalar, cleaner kolom) per kolom
+COLUMN_CLEANERS = {
+    'title': (clean_title, clean_title_column),
+    'price': (convert_price_to_idr, convert_price_column_to_idr),
+    'rating': (clean_rating, clean_rating_column),
+    'colors': (clean_colors, clean_colors_column),
+    'size': (clean_size, clean_size_column),
+    'gender': (clean_gender, clean_gender_column),
+}
+
+def _clean_column(series, column, vectorized, rules=None):
+    if rules is not None:
+        return rules[column](series)
+    scalar_cleaner, column_cleaner = COLUMN_CLEANERS[column]
+    if vectorized:
+        return column_cleaner(series)
+    return series.apply(scalar_cleaner)
+
+def _compact_column(series, dtype):
+    if dtype == 'datetime64[s]':
+        parsed = pd.to_datetime(series, format=TIMESTAMP_FORMAT, errors='coerce')
+        if (parsed.isna() & series.notna()).any():
+            # Ada timestamp dengan format lain: tetap teks, tapi sebagai category
+            return series.astype('category')
+        return parsed.astype(dtype)
+    if dtype == 'float32':
+        values = series.to_numpy(dtype=np.float64)
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            return pd.Series(narrowed, index=series.index, name=series.name)
+        return series
+    if dtype == 'int8':
+        # Tipe integer terkecil yang memuat semua nilai (int8 untuk jumlah warna biasa)
+        return pd.to_numeric(series, downcast='integer') if series.notna().all() else series
+    return series.astype(dtype)
+
+def identity_columns(df, columns):
+    """columns ditambah SOURCE_COLUMN jika df berasal dari mode multi-sumber."""
+    columns = list(columns)
+    return columns + [SOURCE_COLUMN] if SOURCE_COLUMN in df.columns else columns
+
+def to_compact_schema(df):
+    """Mengubah DataFrame berskema OUTPUT_DTYPES ke COMPACT_OUTPUT_DTYPES (tanpa kehilangan nilai)."""
+    compact_df = df.copy()
+    for col, dtype in COMPACT_OUTPUT_DTYPES.items():
+        if col in compact_df.columns:
+            compact_df[col] = _compact_column(compact_df[col], dtype)
+    return compact_df
+
+def to_output_schema(df):
+    """Kebalikan to_compact_schema: kembali ke OUTPUT_DTYPES dengan timestamp sebagai teks."""
+    df = df.copy()
+    if 'timestamp' in df.columns and pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+        df['timestamp'] = df['timestamp'].dt.strftime(TIMESTAMP_FORMAT)
+    return df.astype({col: dtype for col, dtype in OUTPUT_DTYPES.items() if col in df.columns})
+
+def memory_report(df):
+    """Pemakaian memori DataFrame (termasuk isi string) dalam byte, total dan per baris per kolom."""
+    usage = df.memory_usage(deep=True, index=False)
+    rows = len(df)
+    return {
+        "rows": rows,
+        "bytes": int(usage.sum()),
+        "bytes_per_row": usage.sum() / rows if rows else 0.0,
+        "columns": {col: (usage[col] / rows if rows else 0.0) for col in df.columns},
+    }
+
+def transform_data(df_raw, vectorized=True, compact=False, rules=None):
+    """
+    Membersihkan data mentah hasil ekstraksi. vectorized=False memakai cleaner
+    skalar per baris (Series.apply) sebagai jalur referensi. compact=True menghasilkan
+    skema COMPACT_OUTPUT_DTYPES yang jauh lebih hemat memori untuk katalog besar.
+    rules: RuleSet dari compile_cleaning_rules untuk aturan/kurs lain (mis. situs lain);
+    kolom yang tidak punya aturan di RuleSet tersebut memakai cleaner default.
+    """
+    if rules is not None:
+        # Kolom tanpa aturan khusus tetap memakai aturan default
+        rules = {col: rules[col] if col in rules else DEFAULT_RULESET[col] for col in COLUMN_CLEANERS}
     if df_raw is None or df_raw.empty:
         print("DataFrame mentah kosong atau None, tidak ada data untuk ditransformasi.")
         return pd.DataFrame()
@@ -95,24 +250,22 @@ def transform_data(df_raw):
             df[col] = None
 
     # 1. Bersihkan Title
-    df['title'] = df['title'].apply(clean_title)
+    df['title'] = _clean_column(df['title'], 'title', vectorized, rules)
     # Hapus baris jika judul menjadi None setelah dibersihkan
     df.dropna(subset=['title'], inplace=True)
     print(f"Data setelah membersihkan title 'Unknown Product' dan invalid: {len(df)}")
     if df.empty: return pd.DataFrame() # Jika semua data invalid
 
     # 2. Konversi Harga ke IDR
-    df['price'] = df['price'].apply(convert_price_to_idr)
+    df['price'] = _clean_column(df['price'], 'price', vectorized, rules)
 
     # 3. Bersihkan kolom Rating, Colors, Size, Gender
-    df['rating'] = df['rating'].apply(clean_rating)
-    df['colors'] = df['colors'].apply(clean_colors)
-    df['size'] = df['size'].apply(clean_size)
-    df['gender'] = df['gender'].apply(clean_gender)
+    for col in ['rating', 'colors', 'size', 'gender']:
+        df[col] = _clean_column(df[col], col, vectorized, rules)
     
     # 4. Penanganan Duplikat
-    product_cols = ['title', 'price', 'rating', 'colors', 'size', 'gender']
-    df.drop_duplicates(subset=product_cols, keep='first', inplace=True)
+    product_cols = PRODUCT_COLUMNS
+    df.drop_duplicates(subset=identity_columns(df, product_cols), keep='first', inplace=True)
     print(f"Data setelah menghapus duplikat: {len(df)}")
     if df.empty: return pd.DataFrame()
 
@@ -123,20 +276,41 @@ def transform_data(df_raw):
     
     # 6. Konversi Tipe Data Final
     try:
-        df = df.astype({
-            'title': 'object',
-            'price': 'float64',
-            'rating': 'float64',
-            'colors': 'int64',
-            'size': 'object',
-            'gender': 'object',
-            'timestamp': 'object'
-        })
+        df = df.astype(OUTPUT_DTYPES)
     except Exception as e:
         print(f"Error saat konversi tipe data final: {e}")
 
     # Reset index setelah dropna dan drop_duplicates
     df.reset_index(drop=True, inplace=True)
 
+    if compact:
+        try:
+            df = to_compact_schema(df)
+        except Exception as e:
+            print(f"Error saat konversi ke skema compact: {e}")
+
     print(f"Transformasi selesai. Jumlah data bersih: {len(df)}")
-    return df
\ No newline at end of file
+    return df
+
+def transform_batches(raw_batches, vectorized=True, compact=False, rules=None):
+    """
+    Mode streaming: mentransformasi DataFrame mentah per batch dan menghasilkan batch bersih.
+    Duplikat antar batch dibuang dengan hash baris PRODUCT_COLUMNS dari batch sebelumnya,
+    sehingga hasil gabungannya sama dengan transform_data atas seluruh data sekaligus.
+    """
+    seen_row_hashes = set()
+    for df_raw in raw_batches:
+        df = transform_data(df_raw, vectorized=vectorized, compact=compact, rules=rules)
+        if df.empty:
+            continue
+
+        # Hash dengan skema OUTPUT_DTYPES: tipe compact (float32/int8) bisa berbeda antar batch
+        product_df = df[identity_columns(df, PRODUCT_COLUMNS)].astype({col: OUTPUT_DTYPES[col] for col in PRODUCT_COLUMNS})
+        row_hashes = pd.util.hash_pandas_object(product_df, index=False).tolist()
+        is_new = np.fromiter((h not in seen_row_hashes for h in row_hashes), dtype=bool, count=len(row_hashes))
+        seen_row_hashes.update(row_hashes)
+        if not is_new.all():
+            df = df[is_new].reset_index(drop=True)
+            print(f"Data setelah menghapus duplikat antar batch: {len(df)}")
+        if not df.empty:
+            yield df
\ No newline at end of file